@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks for MomMom's Kitchen (Standalone Collection)
+
+Times the data pipeline's hot paths on the real shards with stdlib timeit
+and writes the results as JSON, so a change that slows the pipeline shows
+up as a number before it ships:
+
+    nutrition               add_nutrition.calculate_recipe_nutrition over the corpus
+    nutrition_unnormalized  the same with the stored ingredient fields stripped
+    find_ingredient_match   estimate_nutrition.find_ingredient_match, every ingredient line
+    normalize_ingredient    add_nutrition.normalize_ingredient, every ingredient line
+    create_shards           full rebuild (create_shards.create_shards)
+    create_shards_noop      incremental rebuild with nothing changed
+    validate_all            RecipeValidator.validate_all over the corpus
+    resize_image            ImageProcessor.resize_image on a fixed sample of scans
+    pdf_extract_text        PDFManifest.extract_text on "Foxfire 6 PDF.pdf"
+
+Each benchmark runs --repeat times (setup and cache resets excluded from
+the timing); the best run is the number compared. Nothing under data/ is
+modified: create_shards, resize_image and pdf_extract_text work on copies
+in a temporary directory. Benchmarks whose optional dependency is missing
+(Pillow, PyMuPDF/pypdf) are recorded as skipped.
+
+Baselines are machine-specific, so they are not committed: save one on the
+commit you trust, then compare your branch against it. --compare exits 1
+if any benchmark's best time is more than --threshold slower.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # Run all -> benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py nutrition validate_all
+    python benchmarks/run_benchmarks.py --save-baseline      # Also write benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --compare            # Run, then compare with the baseline
+    python benchmarks/run_benchmarks.py --compare --threshold 0.25
+    python benchmarks/run_benchmarks.py --report results/latest.json   # Compare saved results only
+    python benchmarks/run_benchmarks.py --list
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_DIR / 'scripts'
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+LATEST_FILE = RESULTS_DIR / 'latest.json'
+BASELINE_FILE = RESULTS_DIR / 'baseline.json'
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import create_shards  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.15     # Flag a benchmark more than 15% slower than the baseline
+IMAGE_SAMPLE_SIZE = 8        # First N scans (sorted by name) in data/
+BENCHMARK_PDF = "Foxfire 6 PDF.pdf"
+
+# Checked without importing: the benchmarks import Pillow via process_images
+PIL_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
+
+class Benchmark(NamedTuple):
+    name: str
+    items: int                          # Units of work per run (recipes, lines, files...)
+    unit: str
+    run: Callable[[], object]
+    reset: Callable[[], None]           # Runs before every repeat, untimed
+
+
+class Skipped(Exception):
+    """A benchmark that can't run here (missing optional dependency or input)."""
+
+
+def quiet(fn: Callable) -> Callable:
+    """fn with its stdout discarded (the pipeline functions print progress)."""
+    def wrapped():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapped
+
+
+def nothing():
+    pass
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+class Corpus:
+    """The recipes in a data directory, loaded once and shared by the benchmarks."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        use_data_dir(data_dir)
+        self.recipes, _, _ = create_shards.load_collection()
+        self.items = [str(ing.get('item', '')) for recipe in self.recipes
+                      for ing in recipe.get('ingredients') or [] if isinstance(ing, dict)]
+
+
+def use_data_dir(data_dir: Path):
+    """Point create_shards (and so RecipeStore/load_collection) at another data directory."""
+    data_dir = str(data_dir)
+    create_shards.DATA_DIR = data_dir
+    create_shards.RECIPES_FILE = os.path.join(data_dir, 'recipes.json')
+    create_shards.INDEX_FILE = os.path.join(data_dir, 'recipes-index.json')
+    create_shards.LEDGER_FILE = os.path.join(data_dir, 'shard_ledger.json')
+    create_shards.SEARCH_INDEX_FILE = os.path.join(data_dir, 'search-index.json')
+
+
+def copy_collection(data_dir: Path, target: Path):
+    """Copy the index, search index and shards (not images or books) into target."""
+    target.mkdir(parents=True, exist_ok=True)
+    for name in os.listdir(data_dir):
+        if name.endswith('.json') and (name.startswith('recipes') or name == 'search-index.json'):
+            shutil.copy2(data_dir / name, target / name)
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def bench_nutrition(corpus: Corpus, work: Path) -> Benchmark:
+    import add_nutrition
+    return Benchmark('nutrition', len(corpus.recipes), 'recipes',
+                     lambda: [add_nutrition.calculate_recipe_nutrition(r) for r in corpus.recipes],
+                     reset_nutrition_caches)
+
+
+def bench_nutrition_unnormalized(corpus: Corpus, work: Path) -> Benchmark:
+    import add_nutrition
+    from normalize_ingredients import strip_recipe
+    recipes = [strip_recipe(r) for r in corpus.recipes]
+    return Benchmark('nutrition_unnormalized', len(recipes), 'recipes',
+                     lambda: [add_nutrition.calculate_recipe_nutrition(r) for r in recipes],
+                     reset_nutrition_caches)
+
+
+def reset_nutrition_caches():
+    """Empty add_nutrition's memo tables so every repeat is a cold run."""
+    import add_nutrition
+    add_nutrition._normalized_cache.clear()
+    add_nutrition._nutrition_cache.clear()
+    add_nutrition._resolution_cache.clear()
+
+
+def bench_find_ingredient_match(corpus: Corpus, work: Path) -> Benchmark:
+    from estimate_nutrition import find_ingredient_match
+    return Benchmark('find_ingredient_match', len(corpus.items), 'lines',
+                     lambda: [find_ingredient_match(item) for item in corpus.items], nothing)
+
+
+def bench_normalize_ingredient(corpus: Corpus, work: Path) -> Benchmark:
+    from add_nutrition import normalize_ingredient
+    return Benchmark('normalize_ingredient', len(corpus.items), 'lines',
+                     lambda: [normalize_ingredient(item) for item in corpus.items], nothing)
+
+
+def bench_create_shards(corpus: Corpus, work: Path) -> Benchmark:
+    target = work / 'shards'
+    copy_collection(corpus.data_dir, target)
+
+    def run():
+        use_data_dir(target)
+        try:
+            create_shards.create_shards()
+        finally:
+            use_data_dir(corpus.data_dir)
+
+    return Benchmark('create_shards', len(corpus.recipes), 'recipes', quiet(run), nothing)
+
+
+def bench_create_shards_noop(corpus: Corpus, work: Path) -> Benchmark:
+    target = work / 'shards-incremental'
+    copy_collection(corpus.data_dir, target)
+    use_data_dir(target)
+    try:
+        quiet(create_shards.create_shards)()     # Writes the ledger the incremental path needs
+    finally:
+        use_data_dir(corpus.data_dir)
+
+    def run():
+        use_data_dir(target)
+        try:
+            create_shards.create_shards_incremental()
+        finally:
+            use_data_dir(corpus.data_dir)
+
+    return Benchmark('create_shards_noop', len(corpus.recipes), 'recipes', quiet(run), nothing)
+
+
+def bench_validate_all(corpus: Corpus, work: Path) -> Benchmark:
+    spec = importlib.util.spec_from_file_location('validate_recipes', SCRIPTS_DIR / 'validate-recipes.py')
+    validate_recipes = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(validate_recipes)
+    data = {'recipes': corpus.recipes}
+
+    def run():
+        validator = validate_recipes.RecipeValidator(data_dir=corpus.data_dir)
+        validator.validate_all(data)
+        return validator
+
+    return Benchmark('validate_all', len(corpus.recipes), 'recipes', run, nothing)
+
+
+def bench_resize_image(corpus: Corpus, work: Path) -> Benchmark:
+    if not PIL_AVAILABLE:
+        raise Skipped("Pillow not installed")
+    from process_images import ImageProcessor
+
+    scans = sorted(corpus.data_dir.glob('*.jpeg'))[:IMAGE_SAMPLE_SIZE]
+    if not scans:
+        raise Skipped(f"no *.jpeg scans in {corpus.data_dir}")
+    output = work / 'resized'
+    processor = ImageProcessor(work)
+
+    def run():
+        for scan in scans:
+            result = processor.resize_image(scan, output / scan.name)
+            if not result['success']:
+                raise RuntimeError(f"{scan.name}: {result['error']}")
+
+    return Benchmark('resize_image', len(scans), 'images', run,
+                     lambda: shutil.rmtree(output, ignore_errors=True))
+
+
+def bench_pdf_extract_text(corpus: Corpus, work: Path) -> Benchmark:
+    import pdf_safeguards
+    if not (pdf_safeguards.PYMUPDF_AVAILABLE or pdf_safeguards.PYPDF_AVAILABLE):
+        raise Skipped("no PDF library (pymupdf or pypdf)")
+    source = corpus.data_dir / BENCHMARK_PDF
+    if not source.exists():
+        raise Skipped(f"{BENCHMARK_PDF} not found in {corpus.data_dir}")
+
+    pdf_dir = work / 'pdf'
+    pdf_dir.mkdir()
+    shutil.copy2(source, pdf_dir / BENCHMARK_PDF)
+    manifest = pdf_safeguards.PDFManifest(pdf_dir)
+    page_count = pdf_safeguards.count_pages(pdf_dir / BENCHMARK_PDF,
+                                            'pymupdf' if pdf_safeguards.PYMUPDF_AVAILABLE else 'pypdf')
+
+    def run():
+        if not manifest.extract_text(BENCHMARK_PDF):
+            raise RuntimeError(f"extract_text failed for {BENCHMARK_PDF}")
+
+    def reset():
+        # A leftover .txt/checkpoint would make extract_text resume instead of extracting
+        for path in pdf_dir.iterdir():
+            if path.name != BENCHMARK_PDF:
+                path.unlink()
+
+    return Benchmark('pdf_extract_text', page_count, 'pages', quiet(run), reset)
+
+
+BENCHMARKS = {
+    'nutrition': bench_nutrition,
+    'nutrition_unnormalized': bench_nutrition_unnormalized,
+    'find_ingredient_match': bench_find_ingredient_match,
+    'normalize_ingredient': bench_normalize_ingredient,
+    'create_shards': bench_create_shards,
+    'create_shards_noop': bench_create_shards_noop,
+    'validate_all': bench_validate_all,
+    'resize_image': bench_resize_image,
+    'pdf_extract_text': bench_pdf_extract_text,
+}
+
+
+# =============================================================================
+# Running and comparing
+# =============================================================================
+
+def time_benchmark(bench: Benchmark, repeat: int) -> Dict:
+    runs = timeit.Timer(bench.run, setup=bench.reset).repeat(repeat=repeat, number=1)
+    best = min(runs)
+    return {
+        'best_s': round(best, 6),
+        'median_s': round(statistics.median(runs), 6),
+        'runs_s': [round(r, 6) for r in runs],
+        'items': bench.items,
+        'unit': bench.unit,
+        'us_per_item': round(best / max(bench.items, 1) * 1e6, 3),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names: List[str], data_dir: Path, repeat: int) -> Dict:
+    print(f"Loading corpus from {data_dir}...")
+    corpus = Corpus(data_dir)
+    print(f"  {len(corpus.recipes)} recipes, {len(corpus.items)} ingredient lines\n")
+
+    results = {
+        'meta': {
+            'version': RESULTS_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'data_dir': str(data_dir),
+            'recipes': len(corpus.recipes),
+            'repeat': repeat,
+        },
+        'benchmarks': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='recipe-bench-') as tmp:
+        for name in names:
+            work = Path(tmp) / name
+            work.mkdir()
+            try:
+                bench = BENCHMARKS[name](corpus, work)
+            except Skipped as e:
+                results['benchmarks'][name] = {'skipped': str(e)}
+                print(f"  {name:<24} skipped ({e})")
+                continue
+            result = results['benchmarks'][name] = time_benchmark(bench, repeat)
+            print(f"  {name:<24} {result['best_s']:9.3f}s  (median {result['median_s']:.3f}s, "
+                  f"{bench.items:,} {bench.unit}, {result['us_per_item']:,.1f} us each)")
+    return results
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print current vs baseline best times; returns the names that regressed."""
+    base_meta = baseline.get('meta', {})
+    print(f"\nCompared with baseline {base_meta.get('commit') or '?'} "
+          f"({base_meta.get('created', '?')}, {base_meta.get('recipes', '?')} recipes), "
+          f"threshold +{threshold:.0%}:")
+    if base_meta.get('recipes') != current['meta'].get('recipes'):
+        print("  NOTE: corpus size differs from the baseline; per-item times are the fairer comparison")
+
+    regressions = []
+    for name, result in current['benchmarks'].items():
+        before = baseline.get('benchmarks', {}).get(name)
+        if 'skipped' in result or not before or 'skipped' in before:
+            print(f"  {name:<24} {'-':>9}   (no comparison)")
+            continue
+        ratio = result['best_s'] / before['best_s'] if before['best_s'] else float('inf')
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        print(f"  {name:<24} {before['best_s']:9.3f}s -> {result['best_s']:9.3f}s  "
+              f"{(ratio - 1):+7.1%}  {flag}")
+    return regressions
+
+
+def load_results(path: Path) -> Dict:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('meta', {}).get('version') != RESULTS_VERSION:
+        print(f"ERROR: {path} is not a version {RESULTS_VERSION} results file")
+        sys.exit(1)
+    return data
+
+
+def save_results(results: Dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, path)
+    print(f"Saved results to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the data pipeline hot paths")
+    parser.add_argument('benchmarks', nargs='*', help="Benchmarks to run (default: all)")
+    parser.add_argument('--list', action='store_true', help="List the benchmarks and exit")
+    parser.add_argument('--repeat', '-r', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per benchmark (default {DEFAULT_REPEAT})")
+    parser.add_argument('--data-dir', type=Path, default=Path(create_shards.DATA_DIR),
+                        help="Corpus to benchmark (default: data/)")
+    parser.add_argument('--output', '-o', type=Path, default=LATEST_FILE,
+                        help="Results file (default: benchmarks/results/latest.json)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Also save the results as the baseline")
+    parser.add_argument('--compare', action='store_true',
+                        help="Compare with the baseline; exit 1 on a regression")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE,
+                        help="Baseline file (default: benchmarks/results/baseline.json)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown that counts as a regression (default {DEFAULT_THRESHOLD})")
+    parser.add_argument('--report', type=Path,
+                        help="Compare an existing results file with the baseline instead of running")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(f"  {name}")
+        return
+
+    if args.report:
+        results = load_results(args.report)
+    else:
+        unknown = [n for n in args.benchmarks if n not in BENCHMARKS]
+        if unknown:
+            print(f"ERROR: Unknown benchmark(s): {', '.join(unknown)} (see --list)")
+            sys.exit(1)
+        results = run_benchmarks(args.benchmarks or list(BENCHMARKS), args.data_dir.resolve(),
+                                 max(1, args.repeat))
+        print()
+        save_results(results, args.output)
+        if args.save_baseline:
+            save_results(results, args.baseline)
+
+    if args.compare or args.report:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            sys.exit(1)
+        regressions = compare_results(results, load_results(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+
+if __name__ == '__main__':
+    main()
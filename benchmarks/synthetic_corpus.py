@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator for MomMom's Kitchen (Standalone Collection)
+
+With 2,553 real recipes, anything quadratic in the collection size stays
+fast enough to hide: match_recipe's partial-match loop, ingredient key
+scans, the full-index scans in script.js. This writes a seeded, reproducible
+corpus at N times the size of the real one, in the same sharded layout
+create_shards.py produces, so every pipeline stage can be scaling-tested
+offline:
+
+    <output>/recipes-index.json       objects-format index (meta, shards, recipes)
+    <output>/search-index.json        inverted index over the index rows
+    <output>/recipes-{category}.json  one shard per category, as create_shards writes them
+    <output>/SYN_0000001_1.jpeg ...   stub scans for every image_refs entry (Pillow)
+    <output>/synthetic-book-001.txt   stub book texts with "PAGE N" markers
+    <output>/synthetic.json           seed, scale and counts
+
+Everything is sampled from the current shards, category by category: the
+category sizes (times the scale), donor recipes for the scalar fields and
+tags, titles spliced from two real titles, and ingredient lines and
+instruction steps drawn from the category's real vocabulary (so frequent
+ingredients stay frequent). Ingredient objects are copied whole, including
+their stored normalized fields, so a generated recipe is normalized exactly
+when its sampled lines are. Nutrition is left off for add_nutrition to fill in.
+
+The same seed and scale give byte-identical output. Recipes, images and
+texts use separate random streams, so --no-images/--no-text don't change
+the recipes.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --scale 10 --output /tmp/corpus-10x
+    python benchmarks/synthetic_corpus.py --scale 100 --output /tmp/corpus-100x --no-images
+    python benchmarks/synthetic_corpus.py --scale 1000 --output /tmp/corpus-1000x --no-images --no-text
+    python benchmarks/synthetic_corpus.py --scale 0.5 --seed 7 --output /tmp/corpus-half
+
+    python benchmarks/run_benchmarks.py --data-dir /tmp/corpus-10x
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import sys
+import textwrap
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_DIR / 'scripts'
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import create_shards  # noqa: E402
+from ingredient_line import NORMALIZER_VERSION, SOURCE_HASH_FIELD, ingredients_hash  # noqa: E402
+from normalize_ingredients import VERSION_FIELD, strip_recipe  # noqa: E402
+from search_index import SEARCH_FIELDS, SEARCH_INDEX_VERSION, entry_terms  # noqa: E402
+from text_pages import book_files  # noqa: E402
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+DEFAULT_SEED = 1
+SYNTHETIC_VERSION = 1
+
+# Fields that describe one specific real recipe and would be wrong on a synthetic one
+DROPPED_FIELDS = ('nutrition', 'conversions', 'variant_of', 'variant_notes', 'canonical_id',
+                  'page_continuation')
+
+IMAGE_POOL_SIZE = 8          # Distinct stub images; each file gets a unique JPEG comment
+DEFAULT_IMAGE_SIZE = 64      # Pixels on the long side (use >2000 to exercise resizing)
+PAGES_PER_BOOK = 480         # The real Foxfire texts average ~480 pages
+PAGE_BYTES = 1900            # ... and ~1,900 bytes per page
+RECIPE_PAGE_SHARE = 0.3      # Fraction of book pages that carry a recipe
+PAGE_RULE = "=" * 60         # pdf_safeguards.ExtractionWriter's page marker rule
+
+SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+
+
+def slug(text: str) -> str:
+    return SLUG_PATTERN.sub('-', text.lower()).strip('-') or 'recipe'
+
+
+# =============================================================================
+# Vocabulary from the real shards
+# =============================================================================
+
+class Vocabulary:
+    """Per-category samples of the real corpus."""
+
+    def __init__(self, recipes: List[Dict]):
+        self.recipes = {}          # category -> recipes (donors and title sources)
+        self.ingredients = {}      # category -> every ingredient object
+        self.steps = {}            # category -> every instruction text
+        self.prose = []            # descriptions, notes and steps, for book pages
+        all_ingredients = []
+
+        for recipe in recipes:
+            category = create_shards.sanitize_category(recipe.get('category', 'uncategorized'))
+            self.recipes.setdefault(category, []).append(recipe)
+            for ing in recipe.get('ingredients') or []:
+                if isinstance(ing, dict) and ing.get('item'):
+                    self.ingredients.setdefault(category, []).append(ing)
+                    all_ingredients.append(ing)
+            for step in recipe.get('instructions') or []:
+                text = step.get('text') if isinstance(step, dict) else None
+                if text:
+                    self.steps.setdefault(category, []).append(text)
+                    self.prose.append(text)
+            if recipe.get('description'):
+                self.prose.append(recipe['description'])
+            self.prose.extend(n for n in recipe.get('notes') or [] if isinstance(n, str) and n)
+
+        self.all_ingredients = all_ingredients
+        self.all_steps = [s for steps in self.steps.values() for s in steps]
+        self.categories = sorted(self.recipes)
+
+
+def category_counts(vocab: Vocabulary, scale: float) -> Dict[str, int]:
+    """Synthetic recipes per category: the real count times the scale (at least one)."""
+    return {cat: max(1, round(len(vocab.recipes[cat]) * scale)) for cat in vocab.categories}
+
+
+# =============================================================================
+# Recipes
+# =============================================================================
+
+def spliced_title(rng: random.Random, sources: List[Dict]) -> str:
+    """The head of one real title joined to the tail of another from the same category."""
+    first = str(rng.choice(sources).get('title') or 'Recipe').split()
+    second = str(rng.choice(sources).get('title') or 'Recipe').split()
+    if len(first) < 2 or len(second) < 2:
+        return ' '.join(first or second)
+    return ' '.join(first[:rng.randint(1, len(first) - 1)] + second[rng.randint(1, len(second) - 1):])
+
+
+def synthetic_recipe(rng: random.Random, vocab: Vocabulary, category: str, number: int,
+                     images: bool) -> Dict:
+    """Recipe number `number` of the corpus (1-based), sampled from `category`."""
+    sources = vocab.recipes[category]
+    donor = rng.choice(sources)
+    title = spliced_title(rng, sources)
+
+    recipe = {k: v for k, v in donor.items() if k not in DROPPED_FIELDS}
+    recipe['id'] = f"{slug(title)}-syn{number}"
+    recipe['title'] = title
+
+    if isinstance(donor.get('ingredients'), list):
+        pool = vocab.ingredients.get(category) or vocab.all_ingredients
+        recipe['ingredients'] = [rng.choice(pool) for _ in donor['ingredients']]
+        normalized = (donor.get(VERSION_FIELD) == NORMALIZER_VERSION
+                      and all('item_canonical' in ing for ing in recipe['ingredients']))
+        if normalized:
+            recipe[VERSION_FIELD] = NORMALIZER_VERSION
+            recipe[SOURCE_HASH_FIELD] = ingredients_hash(recipe['ingredients'])
+        else:
+            recipe = strip_recipe(recipe)
+
+    if isinstance(donor.get('instructions'), list):
+        pool = vocab.steps.get(category) or vocab.all_steps
+        recipe['instructions'] = [{'step': i, 'text': rng.choice(pool)}
+                                  for i in range(1, len(donor['instructions']) + 1)]
+
+    if 'image_refs' in donor:
+        count = len(donor['image_refs']) if isinstance(donor['image_refs'], list) else 0
+        recipe['image_refs'] = [image_name(number, k) for k in range(1, count + 1)] if images else []
+    return recipe
+
+
+def image_name(number: int, k: int) -> str:
+    return f"SYN_{number:07d}_{k}.jpeg"
+
+
+# =============================================================================
+# Streaming writers (same bytes as create_shards.write_json, one recipe at a time)
+# =============================================================================
+
+def indented(value, depth: int) -> str:
+    """json.dumps(value, indent=2) as it appears nested `depth` levels deep."""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * depth)
+
+
+class ArrayWriter:
+    """Writes {"key": value, ..., "<array key>": [items...]} with indent=2, streaming the items."""
+
+    def __init__(self, path: Path, head: Dict, array_key: str):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + '.tmp')
+        self.file: TextIO = open(self.tmp_path, 'w')
+        self.file.write('{\n')
+        for key, value in head.items():
+            self.file.write(f'  {json.dumps(key)}: {indented(value, 1)},\n')
+        self.file.write(f'  {json.dumps(array_key)}: [')
+        self.count = 0
+
+    def write(self, item):
+        self.file.write(',\n    ' if self.count else '\n    ')
+        self.file.write(indented(item, 2))
+        self.count += 1
+
+    def close(self):
+        self.file.write('\n  ]\n}' if self.count else ']\n}')
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class SearchPostings:
+    """search_index.build_search_index, fed one index entry at a time (compact row arrays)."""
+
+    def __init__(self):
+        self.postings = {}
+        self.rows = 0
+
+    def add(self, entry: Dict):
+        for term in entry_terms(entry):
+            rows = self.postings.get(term)
+            if rows is None:
+                rows = self.postings[term] = array('I')
+            rows.append(self.rows)
+        self.rows += 1
+
+    def write(self, path: Path):
+        terms = sorted(self.postings)
+        encoded = []
+        for term in terms:
+            rows = self.postings[term]
+            encoded.append([rows[0]] + [b - a for a, b in zip(rows, rows[1:])])
+        create_shards.write_json(str(path), {
+            'version': SEARCH_INDEX_VERSION,
+            'doc_count': self.rows,
+            'fields': SEARCH_FIELDS,
+            'terms': terms,
+            'df': [len(self.postings[t]) for t in terms],
+            'postings': encoded,
+        }, compact=True)
+
+
+# =============================================================================
+# Stub images and book texts
+# =============================================================================
+
+def image_pool(seed: int, size: int) -> List[bytes]:
+    """IMAGE_POOL_SIZE small JPEGs of seeded blocky noise (4:3, portrait like the scans)."""
+    rng = random.Random(f"{seed}:images")
+    width, height = max(1, size * 3 // 4), max(1, size)
+    pool = []
+    for _ in range(IMAGE_POOL_SIZE):
+        cells = Image.new('L', (8, 8))
+        cells.putdata([rng.randint(96, 255) for _ in range(64)])
+        out = io.BytesIO()
+        cells.resize((width, height), Image.Resampling.NEAREST).convert('RGB').save(
+            out, 'JPEG', quality=85)
+        pool.append(out.getvalue())
+    return pool
+
+
+def stub_jpeg(pool: List[bytes], name: str, index: int) -> bytes:
+    """A pool image with a COM segment naming the file, so every stub hashes differently."""
+    comment = f"synthetic stub {name}".encode('ascii')
+    base = pool[index % len(pool)]
+    return base[:2] + b'\xff\xfe' + (len(comment) + 2).to_bytes(2, 'big') + comment + base[2:]
+
+
+def ingredient_text(ing: Dict) -> str:
+    parts = [str(ing.get(k) or '').strip() for k in ('quantity', 'unit', 'item')]
+    line = ' '.join(p for p in parts if p)
+    return f"{line}, {ing['prep_note']}" if ing.get('prep_note') else line
+
+
+def recipe_page(rng: random.Random, vocab: Vocabulary) -> str:
+    """A cookbook-style page: uppercase title, ingredient lines, then the method."""
+    category = rng.choice(vocab.categories)
+    pool = vocab.ingredients.get(category) or vocab.all_ingredients
+    steps = vocab.steps.get(category) or vocab.all_steps
+    lines = [spliced_title(rng, vocab.recipes[category]).upper(), '']
+    lines.extend(ingredient_text(rng.choice(pool)) for _ in range(rng.randint(3, 10)))
+    lines.append('')
+    lines.extend(textwrap.wrap(' '.join(rng.choice(steps) for _ in range(rng.randint(2, 5))), 70))
+    return '\n'.join(lines) + '\n'
+
+
+def prose_page(rng: random.Random, vocab: Vocabulary) -> str:
+    paragraphs = []
+    size = 0
+    while size < PAGE_BYTES:
+        paragraph = ' '.join(rng.choice(vocab.prose) for _ in range(rng.randint(2, 6)))
+        paragraphs.append('\n'.join(textwrap.wrap(paragraph, 70)))
+        size += len(paragraph)
+    return '\n\n'.join(paragraphs) + '\n'
+
+
+def write_book(path: Path, rng: random.Random, vocab: Vocabulary, pages: int, seed: int):
+    """A text in pdf_safeguards' extraction format (header, then a marker before each page)."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(f"# Text extracted from: {path.stem}.pdf\n")
+        f.write(f"# Extracted: synthetic (seed {seed})\n")
+        f.write(f"# Pages: {pages}\n\n")
+        for number in range(1, pages + 1):
+            f.write(f"\n{PAGE_RULE}\nPAGE {number}\n{PAGE_RULE}\n\n")
+            if rng.random() < RECIPE_PAGE_SHARE:
+                f.write(recipe_page(rng, vocab))
+            else:
+                f.write(prose_page(rng, vocab))
+    os.replace(tmp_path, path)
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+def generate_corpus(output: Path, scale: float, seed: int, images: bool = True,
+                    text: bool = True, image_size: int = DEFAULT_IMAGE_SIZE,
+                    books: Optional[int] = None) -> Dict:
+    """Write a synthetic corpus into `output`; returns its synthetic.json summary."""
+    recipes, meta, source = create_shards.load_collection()
+    vocab = Vocabulary(recipes)
+    counts = category_counts(vocab, scale)
+    total = sum(counts.values())
+    print(f"Source: {source} ({len(recipes)} recipes, {len(vocab.categories)} categories)")
+    print(f"Generating {total:,} recipes (scale {scale:g}, seed {seed}) into {output}")
+
+    output.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(f"{seed}:recipes")
+    pool = image_pool(seed, image_size) if images else None
+
+    # Counts are fixed up front, so the index header (meta, shard manifest) can be written first
+    shards = sorted(({'category': cat, 'file': f'recipes-{cat}.json', 'count': n}
+                     for cat, n in counts.items()), key=create_shards.manifest_sort_key)
+    meta = {k: v for k, v in meta.items() if k != 'index_format'}
+    meta['title'] = f"{meta.get('title', 'Recipes')} (synthetic x{scale:g})"
+    index_head = create_shards.build_index_data(meta, shards, [])
+    index_head['meta']['total_recipes'] = total
+    index_writer = ArrayWriter(output / 'recipes-index.json',
+                               {k: v for k, v in index_head.items() if k != 'recipes'}, 'recipes')
+    postings = SearchPostings()
+
+    number = 0
+    image_count = 0
+    for shard in shards:
+        category = shard['category']
+        shard_head = create_shards.build_shard_data(category, [])
+        shard_head['meta']['count'] = shard['count']
+        writer = ArrayWriter(output / shard['file'], {'meta': shard_head['meta']}, 'recipes')
+        for _ in range(shard['count']):
+            number += 1
+            recipe = synthetic_recipe(rng, vocab, category, number, images)
+            writer.write(recipe)
+            entry = create_shards.build_index_entry(recipe)
+            index_writer.write(entry)
+            postings.add(entry)
+            for k, name in enumerate(recipe.get('image_refs') or []):
+                with open(output / name, 'wb') as f:
+                    f.write(stub_jpeg(pool, name, number + k))
+                image_count += 1
+        writer.close()
+        print(f"  {shard['file']}: {shard['count']:,} recipes")
+
+    index_writer.close()
+    postings.write(output / 'search-index.json')
+    print(f"  recipes-index.json + search-index.json: {total:,} rows, {len(postings.postings):,} terms")
+    if images:
+        print(f"  {image_count:,} stub images ({image_size}px)")
+
+    book_count = 0
+    if text:
+        book_count = books if books is not None else max(1, round(len(book_files()) * scale))
+        text_rng = random.Random(f"{seed}:text")
+        for i in range(1, book_count + 1):
+            write_book(output / f"synthetic-book-{i:03d}.txt", text_rng, vocab, PAGES_PER_BOOK, seed)
+        print(f"  {book_count:,} stub book text(s), {PAGES_PER_BOOK} pages each")
+
+    summary = {
+        'version': SYNTHETIC_VERSION,
+        'seed': seed,
+        'scale': scale,
+        'source_recipes': len(recipes),
+        'recipes': total,
+        'shards': len(shards),
+        'images': image_count,
+        'image_size': image_size if images else None,
+        'books': book_count,
+        'pages_per_book': PAGES_PER_BOOK if book_count else None,
+    }
+    create_shards.write_json(str(output / 'synthetic.json'), summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic corpus for scaling tests")
+    parser.add_argument('--scale', type=float, required=True,
+                        help="Size relative to the real corpus (e.g. 10, 100, 1000)")
+    parser.add_argument('--output', '-o', type=Path, required=True,
+                        help="Directory to write the corpus into (must be empty or new)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default {DEFAULT_SEED})")
+    parser.add_argument('--no-images', action='store_true', help="Don't write stub images")
+    parser.add_argument('--no-text', action='store_true', help="Don't write stub book texts")
+    parser.add_argument('--image-size', type=int, default=DEFAULT_IMAGE_SIZE,
+                        help=f"Stub image height in pixels (default {DEFAULT_IMAGE_SIZE})")
+    parser.add_argument('--books', type=int,
+                        help="Number of stub book texts (default: the real count times the scale)")
+    args = parser.parse_args()
+
+    if args.scale <= 0:
+        print("ERROR: --scale must be positive")
+        sys.exit(1)
+    output = args.output.resolve()
+    if output == Path(create_shards.DATA_DIR).resolve():
+        print("ERROR: Refusing to write a synthetic corpus into data/")
+        sys.exit(1)
+    if output.exists() and any(output.iterdir()):
+        print(f"ERROR: {output} is not empty")
+        sys.exit(1)
+    images = not args.no_images
+    if images and not PIL_AVAILABLE:
+        print("WARNING: Pillow not installed - writing no stub images (pip install Pillow)")
+        images = False
+
+    start = time.perf_counter()
+    summary = generate_corpus(output, args.scale, args.seed, images=images, text=not args.no_text,
+                              image_size=args.image_size, books=args.books)
+    print(f"\n✓ {summary['recipes']:,} recipes in {summary['shards']} shards "
+          f"({time.perf_counter() - start:.1f}s)")
+    print(f"✓ Summary: {output / 'synthetic.json'}")
+
+
+if __name__ == '__main__':
+    main()
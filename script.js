@@ -68,10 +68,15 @@ function escapeAttr(value) {
 // Global state
 let recipes = [];
 let recipesFull = {};      // Full recipe data cache (id -> recipe)
-let loadedShards = {};     // Loaded shard cache (category -> recipes[])
+let loadedShards = {};     // Loaded shard cache (shard file -> recipes[])
 let shardManifest = [];    // Available shards from index
 let categories = new Set();
 let allTags = new Set();
+let recipeRowById = new Map(); // id -> row in recipes[]
+let titleOrder = [];       // recipes[] rows sorted by title
+let titleRank = [];        // row -> position in titleOrder
+let assetManifest = null;  // logical -> content-hashed file (data/build/manifest.json)
+let searchIndex = null;    // Inverted index from data/search-index.json (rows = recipes[])
 let currentFilter = { search: '', category: '', tag: '' };
 let showMetric = false; // Toggle for metric conversions
 
@@ -83,18 +88,43 @@ const COLLECTION_NAME = 'MomMom Baker';
 document.addEventListener('DOMContentLoaded', init);
 
 async function init() {
+  await loadAssetManifest();
   await loadRecipes();
   setupEventListeners();
   handleRouting();
 }
 
+/**
+ * Load the build manifest written by scripts/build_assets.py, if deployed.
+ * Without it every file is fetched under its plain name from data/.
+ */
+async function loadAssetManifest() {
+  try {
+    const response = await fetch('data/build/manifest.json', { cache: 'no-cache' });
+    if (!response.ok) return;
+    const manifest = await response.json();
+    assetManifest = manifest.files || null;
+  } catch (error) {
+    console.warn('No asset manifest, using unhashed data files:', error);
+  }
+}
+
+/**
+ * URL for a data file: its content-hashed build copy when the manifest has one
+ * @param {string} name - File name relative to data/ (e.g. recipes-desserts.json)
+ */
+function dataUrl(name) {
+  const built = assetManifest && assetManifest[name];
+  return built ? `data/build/${built.file}` : `data/${name}`;
+}
+
 /**
  * Load recipes from sharded index or fallback to monolithic JSON
  */
 async function loadRecipes() {
   try {
     // Try sharded index first
-    let response = await fetch('data/recipes-index.json');
+    let response = await fetch(dataUrl('recipes-index.json'));
 
     if (!response.ok) {
       // Fallback to monolithic recipes.json
@@ -105,13 +135,23 @@ async function loadRecipes() {
       // Cache all recipes since we loaded the full file
       recipes.forEach(r => { recipesFull[r.id] = r; });
     } else {
-      // Use sharded index
+      // Use sharded index (columnar layout is decoded back into objects)
       const data = await response.json();
-      recipes = data.recipes || [];
+      recipes = data.columnar ? decodeColumnarIndex(data.columnar) : (data.recipes || []);
+      if (data.columnar) titleOrder = data.columnar.title_order;
       shardManifest = data.shards || [];
-      console.log(`Loaded sharded index with ${shardManifest.length} category shards`);
+      console.log(`Loaded sharded index with ${shardManifest.length} shards`);
+      // Not awaited: search falls back to a full scan until it arrives
+      loadSearchIndex();
     }
 
+    recipes.forEach((recipe, row) => recipeRowById.set(recipe.id, row));
+    if (titleOrder.length !== recipes.length) {
+      titleOrder = recipes.map((_, row) => row)
+        .sort((a, b) => (recipes[a].title || '').localeCompare(recipes[b].title || ''));
+    }
+    titleOrder.forEach((row, rank) => { titleRank[row] = rank; });
+
     // Extract categories and tags
     recipes.forEach(recipe => {
       if (recipe.category) categories.add(recipe.category);
@@ -126,33 +166,171 @@ async function loadRecipes() {
 }
 
 /**
- * Load a category shard on-demand
- * @param {string} category - The category to load
- * @returns {Promise<Array>} - The recipes in that category
+ * Rebuild index entry objects from the columnar recipes-index.json layout
+ * (see encode_columnar_index in scripts/create_shards.py)
+ * @param {Object} col - The "columnar" section of the index
+ * @returns {Array} - Index entries in row order
+ */
+function decodeColumnarIndex(col) {
+  const { columns, strings, count } = col;
+  const interned = new Set(col.interned);
+  const sparse = new Set(col.sparse);
+  const entries = new Array(count);
+  for (let row = 0; row < count; row++) entries[row] = {};
+
+  // Column at a time: every entry gets its keys in the same order
+  for (const field of col.fields) {
+    const values = columns[field];
+    const table = strings[field];
+    if (sparse.has(field)) {
+      for (let row = 0; row < count; row++) entries[row][field] = values[row] ?? null;
+    } else if (field === 'tags') {
+      for (let row = 0; row < count; row++) entries[row][field] = values[row].map(i => table[i]);
+    } else if (interned.has(field)) {
+      for (let row = 0; row < count; row++) entries[row][field] = table[values[row]];
+    } else {
+      for (let row = 0; row < count; row++) entries[row][field] = values[row];
+    }
+  }
+  return entries;
+}
+
+/**
+ * Load the prebuilt inverted search index (built by scripts/create_shards.py)
  */
-async function loadShard(category) {
+async function loadSearchIndex() {
+  try {
+    const response = await fetch(dataUrl('search-index.json'));
+    if (!response.ok) return;
+
+    const data = await response.json();
+    if (data.version !== SEARCH_INDEX_VERSION || data.doc_count !== recipes.length) {
+      console.warn('Search index is stale or unsupported, using full scan');
+      return;
+    }
+    searchIndex = { terms: data.terms, encoded: data.postings, decoded: new Map() };
+    console.log(`Loaded search index (${data.terms.length} terms)`);
+
+    // Re-run a search typed before the index arrived
+    if (currentFilter.search) renderRecipeGrid();
+  } catch (error) {
+    console.warn('Failed to load search index, using full scan:', error);
+  }
+}
+
+// Tokenizing/stemming mirror scripts/search_index.py - keep them in sync
+const SEARCH_INDEX_VERSION = 1;
+const SEARCH_STOPWORDS = new Set(['a', 'an', 'and', 'the', 'of', 'with', 'in', 'for', 'to', 'or', 'on', 's']);
+const SEARCH_STEM_RULES = [
+  ['ies', 'y'], ['oes', 'o'], ['sses', 'ss'], ['ss', 'ss'], ['us', 'us'], ['is', 'is'], ['s', '']
+];
+
+function tokenizeSearch(text) {
+  const folded = text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+  return (folded.match(/[a-z0-9]+/g) || []).filter(t => !SEARCH_STOPWORDS.has(t));
+}
+
+function stemSearchToken(token) {
+  for (const [suffix, replacement] of SEARCH_STEM_RULES) {
+    if (token.endsWith(suffix)) {
+      const base = token.slice(0, token.length - suffix.length);
+      if (base.length + replacement.length < 3 || /^[0-9]+$/.test(base)) continue;
+      return base + replacement;
+    }
+  }
+  return token;
+}
+
+function searchPostingsAt(i) {
+  let rows = searchIndex.decoded.get(i);
+  if (!rows) {
+    rows = [];
+    let row = 0;
+    for (const gap of searchIndex.encoded[i]) {
+      row += gap;
+      rows.push(row);
+    }
+    searchIndex.decoded.set(i, rows);
+  }
+  return rows;
+}
+
+// First index in the sorted term list that is >= term
+function searchTermIndex(term) {
+  const terms = searchIndex.terms;
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (terms[mid] < term) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+function searchPrefixRows(prefix, rows) {
+  for (let i = searchTermIndex(prefix); i < searchIndex.terms.length && searchIndex.terms[i].startsWith(prefix); i++) {
+    searchPostingsAt(i).forEach(row => rows.add(row));
+  }
+  return rows;
+}
+
+/**
+ * Rows of `recipes` matching every query term (last term as a prefix, since
+ * this runs while typing). Returns null when the index isn't loaded or the
+ * query has no indexable terms, so the caller falls back to a full scan.
+ */
+function searchRecipeRows(query) {
+  if (!searchIndex) return null;
+  const tokens = tokenizeSearch(query);
+  if (tokens.length === 0) return null;
+
+  const sets = tokens.map((token, pos) => {
+    if (pos === tokens.length - 1) {
+      return searchPrefixRows(stemSearchToken(token), searchPrefixRows(token, new Set()));
+    }
+    const term = stemSearchToken(token);
+    const i = searchTermIndex(term);
+    return new Set(searchIndex.terms[i] === term ? searchPostingsAt(i) : []);
+  });
+
+  // Intersect smallest first
+  sets.sort((a, b) => a.size - b.size);
+  let result = sets[0];
+  for (const s of sets.slice(1)) {
+    if (result.size === 0) break;
+    result = new Set([...result].filter(row => s.has(row)));
+  }
+  return result;
+}
+
+/**
+ * Load a shard on-demand
+ * @param {string} shardFile - The shard file (relative to data/)
+ * @returns {Promise<Array>} - The recipes in that shard
+ */
+async function loadShard(shardFile) {
   // Return cached shard if available
-  if (loadedShards[category]) {
-    return loadedShards[category];
+  if (loadedShards[shardFile]) {
+    return loadedShards[shardFile];
   }
 
   try {
-    const response = await fetch(`data/recipes-${category}.json`);
+    const response = await fetch(dataUrl(shardFile));
     if (!response.ok) {
-      console.warn(`Shard for category '${category}' not found`);
+      console.warn(`Shard '${shardFile}' not found`);
       return [];
     }
 
     const data = await response.json();
-    loadedShards[category] = data.recipes;
+    loadedShards[shardFile] = data.recipes;
 
     // Cache individual recipes for quick lookup
     data.recipes.forEach(r => { recipesFull[r.id] = r; });
 
-    console.log(`Loaded shard: ${category} (${data.recipes.length} recipes)`);
+    console.log(`Loaded shard: ${shardFile} (${data.recipes.length} recipes)`);
     return data.recipes;
   } catch (error) {
-    console.error(`Failed to load shard for ${category}:`, error);
+    console.error(`Failed to load shard ${shardFile}:`, error);
     return [];
   }
 }
@@ -168,15 +346,15 @@ async function getFullRecipe(recipeId) {
     return recipesFull[recipeId];
   }
 
-  // Find the recipe in the index to get its category
-  const indexEntry = recipes.find(r => r.id === recipeId);
+  // Find the recipe in the index to get its shard
+  const indexEntry = recipes[recipeRowById.get(recipeId)];
   if (!indexEntry) {
     console.warn(`Recipe '${recipeId}' not found in index`);
     return null;
   }
 
-  // Load the shard for this category
-  await loadShard(indexEntry.category);
+  // by_size indexes record each recipe's shard; by_category uses its category file
+  await loadShard(indexEntry.shard || `recipes-${indexEntry.category}.json`);
 
   // Return the now-cached recipe
   return recipesFull[recipeId] || null;
@@ -322,15 +500,21 @@ function renderRecipeGrid() {
   const container = document.getElementById('recipe-grid');
   if (!container) return;
 
-  // Filter recipes
-  let filtered = recipes.filter(recipe => {
+  // Search via the inverted index when available (candidate rows only)
+  const searchRows = currentFilter.search ? searchRecipeRows(currentFilter.search) : null;
+  const rows = searchRows
+    ? [...searchRows].sort((a, b) => titleRank[a] - titleRank[b])
+    : titleOrder;
+
+  // Filter recipes (rows are already in title order)
+  let filtered = rows.map(row => recipes[row]).filter(recipe => {
     // Exclude variants from main grid (show canonical only)
     if (recipe.variant_of && recipe.variant_of !== recipe.id) {
       return false;
     }
 
-    // Search filter
-    if (currentFilter.search) {
+    // Search filter (full scan fallback)
+    if (currentFilter.search && !searchRows) {
       const searchText = [
         recipe.title,
         recipe.description,
@@ -354,9 +538,6 @@ function renderRecipeGrid() {
     return true;
   });
 
-  // Sort by title
-  filtered.sort((a, b) => a.title.localeCompare(b.title));
-
   // Render
   if (filtered.length === 0) {
     container.innerHTML = `
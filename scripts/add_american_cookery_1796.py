@@ -4,27 +4,21 @@ Add recipes from "American Cookery" by Amelia Simmons (1796)
 The First American Cookbook - historical recipes with 18th century language
 """
 
-import json
-from pathlib import Path
 from datetime import datetime
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-RECIPES_FILE = DATA_DIR / "recipes.json"
+from recipe_store import RecipeStore
 
 # Image references for this cookbook
 IMAGE_DIR = "The First American Cookbook"
 IMAGES = [f"IMG_{i}.PNG" for i in range(5925, 5997)]
 
 def load_recipes():
-    with open(RECIPES_FILE, 'r') as f:
-        return json.load(f)
+    return RecipeStore()
 
-def save_recipes(data):
-    data['meta']['last_updated'] = datetime.now().strftime('%Y-%m-%d')
-    data['meta']['total_recipes'] = len(data['recipes'])
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-    print(f"Saved {len(data['recipes'])} recipes")
+def save_recipes(store):
+    store.meta['last_updated'] = datetime.now().strftime('%Y-%m-%d')
+    written = store.commit()
+    print(f"Saved {len(store)} recipes ({len(written)} shard(s) rewritten)")
 
 def create_recipe(id, title, category, description, ingredients, instructions,
                   source_note, tags, image_refs, notes=None):
@@ -57,8 +51,8 @@ def create_recipe(id, title, category, description, ingredients, instructions,
     return recipe
 
 def main():
-    data = load_recipes()
-    existing_ids = {r['id'] for r in data['recipes']}
+    store = load_recipes()
+    existing_ids = store.ids()
     new_recipes = []
 
     # ============================================
@@ -745,9 +739,10 @@ def main():
 
     # Add all new recipes
     if new_recipes:
-        data['recipes'].extend(new_recipes)
+        for recipe in new_recipes:
+            store.add(recipe)
         print(f"Added {len(new_recipes)} recipes from American Cookery (1796)")
-        save_recipes(data)
+        save_recipes(store)
     else:
         print("No new recipes to add - all already exist")
 
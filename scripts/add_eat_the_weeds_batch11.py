@@ -4,10 +4,8 @@ Add Eat the Weeds recipes - Batch 11
 Unusual/historical recipes
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 ETW_BATCH11_RECIPES = [
     # ===== UNUSUAL HISTORICAL RECIPES =====
@@ -103,37 +101,29 @@ ETW_BATCH11_RECIPES = [
 
 
 def main():
-    print(f"Loading recipes from {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-    existing_ids = {r['id'] for r in recipes}
-    print(f"Found {len(recipes)} existing recipes")
+    print("Loading recipe index...")
+    store = RecipeStore()
+    print(f"Found {len(store)} existing recipes")
 
     added = 0
     skipped = 0
 
     for recipe in ETW_BATCH11_RECIPES:
-        if recipe['id'] in existing_ids:
+        if recipe['id'] in store:
             print(f"  Skipping duplicate: {recipe['id']}")
             skipped += 1
         else:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+            store.add(recipe)
             print(f"  Added: {recipe['title']}")
             added += 1
 
-    data['meta']['total_recipes'] = len(recipes)
-
-    print(f"\nWriting {len(recipes)} recipes to {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    written = store.commit()
+    print(f"\nWrote {len(written)} shard(s): {', '.join(written) or 'no changes'}")
 
     print(f"\nSummary:")
     print(f"  Added: {added} new Eat the Weeds recipes (batch 11)")
     print(f"  Skipped: {skipped} duplicates")
-    print(f"  Total recipes now: {len(recipes)}")
+    print(f"  Total recipes now: {len(store)}")
 
 
 if __name__ == "__main__":
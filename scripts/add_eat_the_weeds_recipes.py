@@ -1,16 +1,14 @@
 #!/usr/bin/env python3
 """
-Add Eat the Weeds recipes to recipes.json.
+Add Eat the Weeds recipes to the recipe shards.
 
 These are wild foraging recipes from Green Deane's website eattheweeds.com.
 This is a first batch - the site has 300+ plant pages with potentially
 hundreds more recipes.
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 ETW_RECIPES = [
     # ===== DANDELION RECIPES =====
@@ -1106,38 +1104,29 @@ ETW_RECIPES = [
 
 
 def main():
-    print(f"Loading recipes from {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-    existing_ids = {r['id'] for r in recipes}
+    print("Loading recipe index...")
+    store = RecipeStore()
 
     added = 0
     skipped = 0
 
     print("\nAdding Eat the Weeds recipes...")
     for recipe in ETW_RECIPES:
-        if recipe['id'] in existing_ids:
+        if recipe['id'] in store:
             print(f"  Skipping (exists): {recipe['id']}")
             skipped += 1
         else:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+            store.add(recipe)
             print(f"  Added: {recipe['title']}")
             added += 1
 
-    # Update total count
-    data['meta']['total_recipes'] = len(recipes)
-
-    print(f"\nWriting {len(recipes)} recipes back to {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    written = store.commit()
+    print(f"\nWrote {len(written)} shard(s): {', '.join(written) or 'no changes'}")
 
     print(f"\nDone!")
     print(f"  Added {added} Eat the Weeds recipes")
     print(f"  Skipped {skipped} existing")
-    print(f"  Total recipes now: {len(recipes)}")
+    print(f"  Total recipes now: {len(store)}")
     print("\nNote: This is a first batch. Eat the Weeds has 300+ plant pages")
     print("with potentially hundreds more recipes to add.")
 
@@ -1,13 +1,11 @@
 #!/usr/bin/env python3
 """
-Script to add Foxfire 3 recipes to recipes.json
+Script to add Foxfire 3 recipes to the recipe shards
 Summer and Fall Wild Plant Foods chapter - berry and fruit recipes
 """
-import json
-from pathlib import Path
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-RECIPES_FILE = DATA_DIR / "recipes.json"
+from recipe_store import RecipeStore
+
 
 # Foxfire 3 recipes - Summer and Fall Wild Plant Foods (Berries)
 FOXFIRE3_RECIPES = [
@@ -722,32 +720,25 @@ FOXFIRE3_RECIPES = [
 
 
 def main():
-    # Load existing recipes
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    # Get existing recipe IDs to avoid duplicates
-    existing_ids = {r['id'] for r in data['recipes']}
+    # Load the recipe index (shards are only read if a recipe changes)
+    store = RecipeStore()
 
     # Add new recipes
     added = 0
     for recipe in FOXFIRE3_RECIPES:
-        if recipe['id'] not in existing_ids:
-            data['recipes'].append(recipe)
+        if recipe['id'] not in store:
+            store.add(recipe)
             added += 1
             print(f"Added: {recipe['title']}")
         else:
             print(f"Skipped (exists): {recipe['title']}")
 
-    # Update metadata
-    data['meta']['total_recipes'] = len(data['recipes'])
-    data['meta']['last_updated'] = "2026-01-17"
+    store.meta['last_updated'] = "2026-01-17"
 
-    # Save
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Save (only the affected category shards are rewritten)
+    store.commit()
 
-    print(f"\nAdded {added} new recipes from Foxfire 3. Total: {len(data['recipes'])}")
+    print(f"\nAdded {added} new recipes from Foxfire 3. Total: {len(store)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Add recipes from Foxfire Book 4 to recipes.json
+Add recipes from Foxfire Book 4 to the recipe shards
 
 Foxfire 4 contains:
 - Cheese-making (Mrs. Reese's Pressed Cheese, Mrs. Earp's Quick Cheese, Cottage Cheese)
@@ -10,10 +10,8 @@ Foxfire 4 contains:
 - Fried Apple Pies
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 FOXFIRE4_RECIPES = [
     {
@@ -305,34 +303,23 @@ FOXFIRE4_RECIPES = [
 
 
 def main():
-    # Load existing recipes
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-
-    # Track existing IDs
-    existing_ids = {r['id'] for r in recipes}
+    # Load the recipe index (shards are only read if a recipe changes)
+    store = RecipeStore()
 
     # Add new recipes
     added = 0
     for recipe in FOXFIRE4_RECIPES:
-        if recipe['id'] not in existing_ids:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+        if recipe['id'] not in store:
+            store.add(recipe)
             added += 1
             print(f"Added: {recipe['title']}")
         else:
             print(f"Skipped (exists): {recipe['title']}")
 
-    # Update meta
-    data['meta']['total_recipes'] = len(recipes)
-
-    # Save updated recipes
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Save (only the affected category shards are rewritten)
+    store.commit()
 
-    print(f"\nAdded {added} Foxfire 4 recipes. Total: {len(recipes)}")
+    print(f"\nAdded {added} Foxfire 4 recipes. Total: {len(store)}")
 
 
 if __name__ == "__main__":
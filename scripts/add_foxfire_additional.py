@@ -14,10 +14,8 @@ Includes:
 - Sawmill gravy
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 ADDITIONAL_RECIPES = [
     {
@@ -637,34 +635,23 @@ ADDITIONAL_RECIPES = [
 
 
 def main():
-    # Load existing recipes
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-
-    # Track existing IDs
-    existing_ids = {r['id'] for r in recipes}
+    # Load the recipe index (shards are only read if a recipe changes)
+    store = RecipeStore()
 
     # Add new recipes
     added = 0
     for recipe in ADDITIONAL_RECIPES:
-        if recipe['id'] not in existing_ids:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+        if recipe['id'] not in store:
+            store.add(recipe)
             added += 1
             print(f"Added: {recipe['title']}")
         else:
             print(f"Skipped (exists): {recipe['title']}")
 
-    # Update meta
-    data['meta']['total_recipes'] = len(recipes)
-
-    # Save updated recipes
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Save (only the affected category shards are rewritten)
+    store.commit()
 
-    print(f"\nAdded {added} additional Foxfire recipes. Total: {len(recipes)}")
+    print(f"\nAdded {added} additional Foxfire recipes. Total: {len(store)}")
 
 
 if __name__ == "__main__":
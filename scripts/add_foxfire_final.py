@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Add final batch of missed Foxfire recipes to recipes.json.
+Add final batch of missed Foxfire recipes to the recipe shards.
 
 Recipes discovered through deeper search of Foxfire Books 2 and 3:
 - Ramp soup (with variations)
@@ -19,10 +19,8 @@ Recipes discovered through deeper search of Foxfire Books 2 and 3:
 - Steamed elderberry pudding
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 FINAL_RECIPES = [
     # From Foxfire Book 2 - Wild Plant Foods
@@ -430,35 +428,26 @@ FINAL_RECIPES = [
 
 
 def main():
-    print(f"Loading recipes from {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-    existing_ids = {r['id'] for r in recipes}
+    print("Loading recipe index...")
+    store = RecipeStore()
 
     added = 0
     skipped = 0
 
     for recipe in FINAL_RECIPES:
-        if recipe['id'] in existing_ids:
+        if recipe['id'] in store:
             print(f"  Skipping (exists): {recipe['id']}")
             skipped += 1
         else:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+            store.add(recipe)
             print(f"  Added: {recipe['title']}")
             added += 1
 
-    # Update total count
-    data['meta']['total_recipes'] = len(recipes)
-
-    print(f"\nWriting {len(recipes)} recipes back to {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    written = store.commit()
+    print(f"\nWrote {len(written)} shard(s): {', '.join(written) or 'no changes'}")
 
     print(f"\nDone! Added {added} recipes, skipped {skipped} existing.")
-    print(f"Total recipes now: {len(recipes)}")
+    print(f"Total recipes now: {len(store)}")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 """
-Script to add Foxfire Vol 1 recipes to recipes.json
+Script to add Foxfire Vol 1 recipes to the recipe shards
 """
-import json
-from pathlib import Path
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-RECIPES_FILE = DATA_DIR / "recipes.json"
+from recipe_store import RecipeStore
+
 
 # Foxfire Vol 1 recipes extracted with love and care
 FOXFIRE_RECIPES = [
@@ -768,32 +766,25 @@ FOXFIRE_RECIPES = [
 ]
 
 def main():
-    # Load existing recipes
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    # Get existing recipe IDs to avoid duplicates
-    existing_ids = {r['id'] for r in data['recipes']}
+    # Load the recipe index (shards are only read if a recipe changes)
+    store = RecipeStore()
 
     # Add new recipes
     added = 0
     for recipe in FOXFIRE_RECIPES:
-        if recipe['id'] not in existing_ids:
-            data['recipes'].append(recipe)
+        if recipe['id'] not in store:
+            store.add(recipe)
             added += 1
             print(f"Added: {recipe['title']}")
         else:
             print(f"Skipped (exists): {recipe['title']}")
 
-    # Update metadata
-    data['meta']['total_recipes'] = len(data['recipes'])
-    data['meta']['last_updated'] = "2026-01-17"
+    store.meta['last_updated'] = "2026-01-17"
 
-    # Save
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Save (only the affected category shards are rewritten)
+    store.commit()
 
-    print(f"\nAdded {added} new recipes. Total: {len(data['recipes'])}")
+    print(f"\nAdded {added} new recipes. Total: {len(store)}")
 
 if __name__ == "__main__":
     main()
@@ -2,11 +2,9 @@
 """
 Script to add Foxfire Vol 1 recipes - Batch 2 (Hog recipes and more preserves)
 """
-import json
-from pathlib import Path
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-RECIPES_FILE = DATA_DIR / "recipes.json"
+from recipe_store import RecipeStore
+
 
 FOXFIRE_RECIPES_BATCH2 = [
     # === HOG RECIPES ===
@@ -424,26 +422,22 @@ FOXFIRE_RECIPES_BATCH2 = [
 ]
 
 def main():
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
+    store = RecipeStore()
 
-    existing_ids = {r['id'] for r in data['recipes']}
     added = 0
     for recipe in FOXFIRE_RECIPES_BATCH2:
-        if recipe['id'] not in existing_ids:
-            data['recipes'].append(recipe)
+        if recipe['id'] not in store:
+            store.add(recipe)
             added += 1
             print(f"Added: {recipe['title']}")
         else:
             print(f"Skipped (exists): {recipe['title']}")
 
-    data['meta']['total_recipes'] = len(data['recipes'])
-    data['meta']['last_updated'] = "2026-01-17"
+    store.meta['last_updated'] = "2026-01-17"
 
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    store.commit()
 
-    print(f"\nAdded {added} new recipes. Total: {len(data['recipes'])}")
+    print(f"\nAdded {added} new recipes. Total: {len(store)}")
 
 if __name__ == "__main__":
     main()
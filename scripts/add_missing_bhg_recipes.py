@@ -4,13 +4,11 @@ Add missing BHG (Better Homes and Gardens) recipes that were found
 in unreferenced images during the image-by-image audit.
 
 These recipes were on images that existed but were never incorporated
-into recipes.json.
+into the recipe shards.
 """
 
-import json
-from pathlib import Path
+from recipe_store import RecipeStore
 
-RECIPES_FILE = Path(__file__).parent.parent / "data" / "recipes.json"
 
 MISSING_RECIPES = [
     # From IMG_5395 Large.jpeg (page 235)
@@ -1010,12 +1008,8 @@ TIPS_AND_TECHNIQUES = [
 
 
 def main():
-    print(f"Loading recipes from {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'r') as f:
-        data = json.load(f)
-
-    recipes = data['recipes']
-    existing_ids = {r['id'] for r in recipes}
+    print("Loading recipe index...")
+    store = RecipeStore()
 
     added_recipes = 0
     added_tips = 0
@@ -1024,39 +1018,33 @@ def main():
     # Add missing recipes
     print("\nAdding missing recipes...")
     for recipe in MISSING_RECIPES:
-        if recipe['id'] in existing_ids:
+        if recipe['id'] in store:
             print(f"  Skipping (exists): {recipe['id']}")
             skipped += 1
         else:
-            recipes.append(recipe)
-            existing_ids.add(recipe['id'])
+            store.add(recipe)
             print(f"  Added: {recipe['title']}")
             added_recipes += 1
 
     # Add tips and techniques
     print("\nAdding tips and techniques...")
     for tip in TIPS_AND_TECHNIQUES:
-        if tip['id'] in existing_ids:
+        if tip['id'] in store:
             print(f"  Skipping (exists): {tip['id']}")
             skipped += 1
         else:
-            recipes.append(tip)
-            existing_ids.add(tip['id'])
+            store.add(tip)
             print(f"  Added: {tip['title']}")
             added_tips += 1
 
-    # Update total count
-    data['meta']['total_recipes'] = len(recipes)
-
-    print(f"\nWriting {len(recipes)} recipes back to {RECIPES_FILE}")
-    with open(RECIPES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    written = store.commit()
+    print(f"\nWrote {len(written)} shard(s): {', '.join(written) or 'no changes'}")
 
     print(f"\nDone!")
     print(f"  Added {added_recipes} recipes")
     print(f"  Added {added_tips} tips/techniques")
     print(f"  Skipped {skipped} existing")
-    print(f"  Total recipes now: {len(recipes)}")
+    print(f"  Total recipes now: {len(store)}")
 
 
 if __name__ == "__main__":
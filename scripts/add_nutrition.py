@@ -4,12 +4,21 @@ Add nutrition data to ALL recipes lacking it.
 Expands on add_muffin_nutrition.py with comprehensive ingredient database.
 """
 
+import argparse
 import json
 import re
 import glob
-from fractions import Fraction
 from pathlib import Path
 
+from ingredient_line import is_normalized, parse_ingredient, parse_quantity_range
+
+# Optional: NumPy batch engine for whole-corpus recalculation
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # =============================================================================
 # COMPREHENSIVE NUTRITION DATABASE (USDA values)
 # Format: {ingredient: {unit: {cal, fat, carbs, protein, sodium, fiber, sugar}}}
@@ -1933,122 +1942,11 @@ STANDARD_JAR_SIZES = {
 # =============================================================================
 
 def parse_quantity(qty_str):
-    """Parse quantity string to float, handling fractions and ranges."""
-    if not qty_str or qty_str.strip() == "":
+    """Parse quantity string to float (midpoint of a range), 1.0 when there is no amount."""
+    low, high = parse_quantity_range(qty_str)
+    if low is None:
         return 1.0
-
-    qty_str = str(qty_str).strip().lower()
-
-    # Handle ranges like "1-2" or "6-8" - take midpoint
-    if '-' in qty_str and not qty_str.startswith('-'):
-        parts = qty_str.split('-')
-        if len(parts) == 2:
-            try:
-                low = parse_quantity(parts[0])
-                high = parse_quantity(parts[1])
-                return (low + high) / 2
-            except:
-                pass
-
-    # Handle "to" ranges like "6 to 8"
-    if ' to ' in qty_str:
-        parts = qty_str.split(' to ')
-        if len(parts) == 2:
-            try:
-                low = parse_quantity(parts[0])
-                high = parse_quantity(parts[1])
-                return (low + high) / 2
-            except:
-                pass
-
-    # Handle mixed numbers like "1 1/2"
-    parts = qty_str.split()
-    total = 0
-    for part in parts:
-        try:
-            if '/' in part:
-                total += float(Fraction(part))
-            else:
-                # Remove any trailing punctuation
-                part = part.rstrip('.,;:')
-                total += float(part)
-        except (ValueError, ZeroDivisionError):
-            continue
-
-    return total if total > 0 else 1.0
-
-
-def normalize_unit(unit):
-    """Normalize unit names to standard forms."""
-    unit = str(unit).lower().strip().rstrip('.')
-
-    unit_map = {
-        # Volume
-        "cups": "cup", "c": "cup", "c.": "cup",
-        "tablespoons": "tbsp", "tablespoon": "tbsp", "tbsps": "tbsp", "t": "tbsp", "tbs": "tbsp", "tbl": "tbsp",
-        "tblsp": "tbsp", "tblsps": "tbsp", "tblsp.": "tbsp", "tblsps.": "tbsp",
-        "teaspoons": "tsp", "teaspoon": "tsp", "tsps": "tsp", "t.": "tsp",
-        "ounces": "oz", "ounce": "oz", "ozs": "oz",
-        "pounds": "lb", "pound": "lb", "lbs": "lb",
-        "pints": "pint", "pt": "pint",
-        "quarts": "quart", "qt": "quart",
-        "gallons": "gallon", "gal": "gallon",
-        # Historical measurements (Batch 14)
-        "gill": "gill", "gills": "gill",  # 4 fl oz = 0.5 cup
-        "drachm": "drachm", "drachms": "drachm", "dram": "drachm", "drams": "drachm",  # 1/8 oz
-        "dessertspoon": "dessertspoon", "dessertspoons": "dessertspoon", "dssp": "dessertspoon",  # 2 tsp
-        "saltspoon": "saltspoon", "saltspoons": "saltspoon", "saltspoonful": "saltspoon", "saltspoonfuls": "saltspoon",  # 1/4 tsp
-        "wineglass": "wineglass", "wineglasses": "wineglass", "wine glass": "wineglass", "wine glasses": "wineglass",  # ~4 fl oz = 0.5 cup
-        "teacup": "teacup", "teacups": "teacup", "tea cup": "teacup", "tea cups": "teacup",  # ~6 fl oz = 0.75 cup
-        "coffeecup": "coffeecup", "coffeecups": "coffeecup", "coffee cup": "coffeecup", "coffee cups": "coffeecup",  # ~1 cup
-        "jigger": "jigger", "jiggers": "jigger",  # 1.5 oz = 3 tbsp
-        "peck": "peck", "pecks": "peck", "pk": "peck",  # 8 quarts (dry)
-        "bushel": "bushel", "bushels": "bushel", "bu": "bushel",  # 4 pecks = 32 quarts
-        "firkin": "firkin", "firkins": "firkin",  # 9 gallons
-        "hogshead": "hogshead", "hogsheads": "hogshead",  # 63 gallons
-        # Count
-        "slices": "slice",
-        "links": "link",
-        "cloves": "clove",
-        "cans": "can",
-        "packages": "packet", "pkg": "packet", "pkgs": "packet", "packets": "packet", "pkg.": "packet",
-        "sachet (7g)": "sachet", "sachets": "sachet",
-        "envelopes": "envelope",
-        "stalks": "stalk",
-        "sprigs": "sprig",
-        "ears": "ear",
-        "bunches": "bunch",
-        "heads": "head",
-        "loaves": "loaf",
-        "pieces": "piece", "pc": "piece", "pcs": "piece",
-        # Size-based
-        "small": "small", "sm": "small",
-        "medium": "medium", "med": "medium",
-        "large": "large", "lg": "large",
-    }
-
-    # Handle embedded sizes like "can (17 oz)" or "cup (4 oz)" → strip the size
-    import re
-    embedded_size = re.match(r'^(\w+)\s*\([\d\s.]+\s*oz\)$', unit)
-    if embedded_size:
-        unit = embedded_size.group(1)
-
-    # Handle "15 1/2 oz cans" or "14.5-oz cans" → "can"
-    oz_cans = re.match(r'^[\d\s./½¼¾-]+\s*oz\.?\s*cans?$', unit)
-    if oz_cans:
-        unit = "can"
-
-    # Handle "oz jar" or "16 oz jar" → "jar" (treat as can equivalent)
-    oz_jar = re.match(r'^(?:[\d\s./]+\s*)?oz\.?\s*jar$', unit)
-    if oz_jar:
-        unit = "can"  # jars are roughly equivalent to cans
-
-    # Descriptive units that should be treated as empty (each)
-    descriptive_units = ["ripe", "fresh"]
-    if unit in descriptive_units:
-        unit = ""
-
-    return unit_map.get(unit, unit)
+    return float((low + high) / 2)
 
 
 def normalize_ingredient(item):
@@ -4989,56 +4887,219 @@ def infer_servings(recipe):
 # NUTRITION CALCULATION
 # =============================================================================
 
-def get_nutrition_for_ingredient(ingredient):
-    """Calculate nutrition for a single ingredient entry."""
-    raw_item = ingredient.get("item", "")
-    raw_unit = ingredient.get("unit", "")
+# =============================================================================
+# PRECOMPILED LOOKUP - unit conversions and memoized ingredient results
+# =============================================================================
 
-    # Extract OCR-embedded unit prefixes from item (e.g., "c sugar" -> unit="cup", item="sugar")
-    ocr_unit_prefixes = {
-        "c ": "cup",
-        "t ": "tsp",
-        "T ": "tbsp",
-        "slices ": "slice",
-        "slice ": "slice",
-        "ears ": "ear",
-        "ear ": "ear",
-        "qt. ": "quart",
-        "qt ": "quart",
-        "pt. ": "pint",
-        "pt ": "pint",
-        "oz ": "oz",
-        "lb ": "lb",
-        "cups ": "cup",
-        "cup ": "cup",
-        "tbsp ": "tbsp",
-        "tsp ": "tsp",
-        "tblsp. ": "tbsp",
-        "tblsps. ": "tbsp",
-    }
-    extracted_unit = None
-    for prefix, unit_name in ocr_unit_prefixes.items():
-        if raw_item.lower().startswith(prefix.lower()) and not raw_unit:
-            extracted_unit = unit_name
-            raw_item = raw_item[len(prefix):]
-            break
+# Unit conversions, in priority order: (recipe unit, database unit, multiplier, divisor).
+# Only used when the database entry has neither the recipe unit nor a unit-less ("")
+# value; the first database unit present wins.
+UNIT_CONVERSIONS = [
+    ("tbsp", "cup", None, 16),
+    ("tsp", "cup", None, 48),        # 48 tsp = 1 cup
+    ("tsp", "tbsp", None, 3),
+    ("tbsp", "tsp", 3, None),
+    # Pint/quart to cup conversions
+    ("pint", "cup", 2, None),        # 1 pint = 2 cups
+    ("quart", "cup", 4, None),       # 1 quart = 4 cups
+    ("gallon", "cup", 16, None),     # 1 gallon = 16 cups
+    # ML to cup conversion
+    ("ml", "cup", None, 237),        # ~237 ml per cup
+    # Historical measurement conversions (Batch 14)
+    ("gill", "cup", 0.5, None),      # 1 gill = 0.5 cup (4 fl oz)
+    ("drachm", "oz", None, 8),       # 1 drachm = 1/8 oz
+    ("drachm", "tbsp", None, 4),     # 1 fluid drachm ≈ 0.25 tbsp
+    ("dessertspoon", "tsp", 2, None),     # 1 dessertspoon = 2 tsp
+    ("dessertspoon", "tbsp", 0.67, None), # 1 dessertspoon = 2/3 tbsp
+    ("dessertspoon", "cup", None, 24),    # 24 dessertspoons = 1 cup
+    ("saltspoon", "tsp", None, 4),   # 1 saltspoon = 1/4 tsp
+    ("saltspoon", "cup", None, 192), # 192 saltspoons = 1 cup
+    ("wineglass", "cup", 0.5, None), # 1 wineglass ≈ 0.5 cup (4 fl oz)
+    ("teacup", "cup", 0.75, None),   # 1 teacup ≈ 0.75 cup (6 fl oz)
+    ("coffeecup", "cup", None, None),  # 1 coffeecup ≈ 1 cup
+    ("jigger", "tbsp", 3, None),     # 1 jigger = 3 tbsp (1.5 oz)
+    ("jigger", "cup", None, 5.33),   # 1 jigger ≈ 3/16 cup
+    ("peck", "quart", 8, None),      # 1 peck = 8 quarts
+    ("peck", "cup", 32, None),       # 1 peck = 32 cups
+    ("bushel", "quart", 32, None),   # 1 bushel = 32 quarts
+    ("bushel", "cup", 128, None),    # 1 bushel = 128 cups
+    # Batch 15: Weight to volume conversions (lb -> cup factor depends on the item)
+    ("lb", "cup", "per-item", None),
+    ("oz", "cup", None, 8),          # 8 oz = 1 cup (volume)
+    ("oz", "tbsp", 2, None),         # 1 oz = 2 tbsp
+]
+
+# Empty unit fallback - prefer common units in order
+EMPTY_UNIT_PREFERENCE = ["tbsp", "tsp", "cup", "oz", "each", ""]
+
+NUTRIENT_KEYS = ("cal", "fat", "carbs", "protein", "sodium", "fiber", "sugar")
+ZERO_NUTRITION = {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0}
+SKIPPED_NUTRITION = dict(ZERO_NUTRITION, _skipped=True)
+SEASONING_NUTRITION = dict(ZERO_NUTRITION, sodium=150)
+
+NON_COUNTABLE_UNITS = ["for greasing", "for brushing", "for drizzling", "as needed"]
+
+
+def lb_to_cup_factor(item):
+    """Cups per pound: flour ~4 cups/lb, sugar ~2.25 cups/lb, butter/generic ~2 cups/lb."""
+    if "flour" in item:
+        return 4
+    if "sugar" in item:
+        return 2.25
+    return 2
+
+
+def compile_unit_table(nutrition_db):
+    """
+    Compile NUTRITION_DB into {item: ({unit: conversion}, any-unit fallback)}.
+
+    A conversion is (base nutrient items, multiplier, divisor); the nutrition for a
+    quantity is v * quantity * multiplier (or / divisor) for each base value.
+    Resolving a line is then one dict lookup instead of a walk over the conversions.
+    """
+    table = {}
+    for item, entry in nutrition_db.items():
+        units = {unit: (tuple(base.items()), None, None) for unit, base in entry.items()}
+        if "" in entry:
+            # Unit-less items: any unit not in the entry scales the "" values
+            table[item] = (units, units[""])
+            continue
 
-    item = normalize_ingredient(raw_item)
-    unit = str(raw_unit).lower() if raw_unit else (extracted_unit or "")
+        for unit, db_unit, mul, div in UNIT_CONVERSIONS:
+            if unit in units or db_unit not in entry:
+                continue
+            if mul == "per-item":
+                mul = lb_to_cup_factor(item)
+            units[unit] = (tuple(entry[db_unit].items()), mul, div)
+
+        if "" not in units:
+            for preferred in EMPTY_UNIT_PREFERENCE:
+                if preferred in entry:
+                    units[""] = units[preferred][:1] + (None, None)
+                    break
+
+        table[item] = (units, None)
+    return table
+
+
+UNIT_TABLE = compile_unit_table(NUTRITION_DB)
+
+# Memoized normalize_ingredient() results and per-line nutrition results
+_normalized_cache = {}
+_nutrition_cache = {}
+
+
+def normalize_ingredient_cached(item):
+    """normalize_ingredient() with memoization (it runs dozens of substitutions)."""
+    try:
+        return _normalized_cache[item]
+    except KeyError:
+        result = _normalized_cache[item] = normalize_ingredient(item)
+        return result
+    except TypeError:
+        return normalize_ingredient(item)
+
+
+def scale_nutrition(conversion, quantity):
+    """Apply a compiled unit conversion to a quantity."""
+    base, mul, div = conversion
+    if mul is not None:
+        return {k: v * quantity * mul for k, v in base}
+    if div is not None:
+        return {k: v * quantity / div for k, v in base}
+    return {k: v * quantity for k, v in base}
+
+
+def canonical_fields(raw_item, raw_unit, raw_quantity):
+    """
+    The normalized view of one ingredient line:
+    (item_canonical, unit_canonical, qty_low, qty_high, is_equipment).
+
+    normalize_ingredients.py stores these on each ingredient in the shards;
+    stored_fields() reads them back for recipes with a current
+    normalizer_version, so only un-normalized recipes pay for this.
+    """
+    # Units (including ones written into the quantity or item) come from the
+    # same parse the validator and estimate_nutrition use
+    line = parse_ingredient(raw_quantity, raw_unit, raw_item)
+    item = normalize_ingredient_cached(line.item)
+    return item, line.unit, line.low, line.high, is_equipment(item)
+
+
+def stored_fields(ingredient):
+    """canonical_fields() as stored on a normalized ingredient."""
+    return (ingredient["item_canonical"], ingredient["unit_canonical"],
+            ingredient["qty_low"], ingredient["qty_high"], ingredient["is_equipment"])
+
+
+def ingredient_fields(ingredient, normalized=False):
+    """Stored canonical fields if `normalized` (see ingredient_line.is_normalized), else computed."""
+    if normalized:
+        return stored_fields(ingredient)
+    return canonical_fields(ingredient.get("item", ""), ingredient.get("unit", ""),
+                            ingredient.get("quantity", "1"))
+
+
+def get_nutrition_for_ingredient(ingredient, normalized=False):
+    """
+    Calculate nutrition for a single ingredient entry.
+
+    Results are memoized on the raw (item, unit, quantity) fields, so repeated
+    lines cost a single dict lookup; callers get a fresh dict each time. Pass
+    normalized=True for ingredients of a recipe with current stored fields.
+    """
+    raw_item = ingredient.get("item", "")
+    raw_unit = ingredient.get("unit", "")
+    raw_quantity = ingredient.get("quantity", "1")
+    prep_note = str(ingredient.get("prep_note", "")).lower()
+    to_taste = "to taste" in prep_note or "to sweeten" in prep_note
+    fields = stored_fields(ingredient) if normalized else None
+
+    key = (raw_item, raw_unit, raw_quantity, to_taste)
+    try:
+        result = _nutrition_cache[key]
+    except KeyError:
+        result = _nutrition_cache[key] = compute_ingredient_nutrition(
+            raw_item, raw_unit, raw_quantity, to_taste, fields)
+    except TypeError:  # unhashable field values
+        result = compute_ingredient_nutrition(raw_item, raw_unit, raw_quantity, to_taste, fields)
+
+    return dict(result) if result is not None else None
+
+
+def compute_ingredient_nutrition(raw_item, raw_unit, raw_quantity, to_taste_note=False, fields=None):
+    """Uncached nutrition lookup for one ingredient line (see get_nutrition_for_ingredient)."""
+    resolved = resolve_ingredient(raw_item, raw_unit, raw_quantity, to_taste_note, fields)
+    if resolved is None or isinstance(resolved, dict):
+        return resolved
+    item, unit, quantity = resolved
+    return scale_nutrition(UNIT_TABLE[item][0][unit], quantity)
+
+
+def resolve_ingredient(raw_item, raw_unit, raw_quantity, to_taste_note=False, fields=None):
+    """
+    Resolve one ingredient line against the compiled unit table.
+
+    Returns (item, unit, quantity) where UNIT_TABLE[item][0][unit] is the conversion
+    to apply, a constant nutrition dict (skipped / to-taste / water lines), or None
+    when the ingredient is not in the database. `fields` are the line's
+    canonical_fields(), if already known.
+    """
+    item_field, unit_field = raw_item, raw_unit
+    if fields is None:
+        fields = canonical_fields(raw_item, raw_unit, raw_quantity)
+    item, unit, low, high, equipment = fields
 
     # Skip equipment and non-food items
-    if is_equipment(item):
-        return {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0, "_skipped": True}
+    if equipment:
+        return SKIPPED_NUTRITION
 
     # Skip items where unit indicates non-countable usage (greasing, brushing, etc.)
-    non_countable_units = ["for greasing", "for brushing", "for drizzling", "as needed"]
-    if any(ncu in unit for ncu in non_countable_units):
-        return {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0, "_skipped": True}
+    raw_unit_lower = str(raw_unit).lower() if raw_unit else ""
+    if any(ncu in raw_unit_lower for ncu in NON_COUNTABLE_UNITS):
+        return SKIPPED_NUTRITION
 
-    quantity = parse_quantity(ingredient.get("quantity", "1"))
-    # Only normalize unit if we didn't extract one from OCR prefix
-    if not extracted_unit:
-        unit = normalize_unit(ingredient.get("unit", ""))
+    quantity = float((low + high) / 2) if low is not None else 1.0
 
     # Handle compound units like "5-oz" or "6-inch" -> extract multiplier
     compound_match = re.match(r'^(\d+(?:\.\d+)?)-?(\w+)$', unit)
@@ -5048,143 +5109,26 @@ def get_nutrition_for_ingredient(ingredient):
         quantity = quantity * unit_multiplier
 
     # Handle "to taste" / "to sweeten" - minimal impact (check unit, item, and prep_note)
-    to_taste_fields = [
-        str(ingredient.get("unit", "")).lower(),
-        str(ingredient.get("item", "")).lower(),
-        str(ingredient.get("prep_note", "")).lower()
-    ]
-    if any("to taste" in f or "to sweeten" in f for f in to_taste_fields):
+    to_taste_fields = [str(unit_field).lower(), str(item_field).lower()]
+    if to_taste_note or any("to taste" in f or "to sweeten" in f for f in to_taste_fields):
         if "salt" in item or "pepper" in item:
-            return {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 150, "fiber": 0, "sugar": 0}
-        return {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0}
+            return SEASONING_NUTRITION
+        return ZERO_NUTRITION
+
+    compiled = UNIT_TABLE.get(item)
 
     # Handle water
-    if "water" in item and item not in NUTRITION_DB:
-        return {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0}
-
-    # Try exact match
-    if item in NUTRITION_DB:
-        db_entry = NUTRITION_DB[item]
-        if unit in db_entry:
-            base = db_entry[unit]
-            return {k: v * quantity for k, v in base.items()}
-        elif "" in db_entry:  # Unit-less items
-            base = db_entry[""]
-            return {k: v * quantity for k, v in base.items()}
-        # Try unit conversions
-        elif unit == "tbsp" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 16 for k, v in base.items()}
-        elif unit == "tsp" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 48 for k, v in base.items()}
-        elif unit == "tsp" and "tbsp" in db_entry:
-            base = db_entry["tbsp"]
-            return {k: v * quantity / 3 for k, v in base.items()}
-        elif unit == "tbsp" and "tsp" in db_entry:
-            base = db_entry["tsp"]
-            return {k: v * quantity * 3 for k, v in base.items()}
-        # Pint/quart to cup conversions
-        elif unit == "pint" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 2 for k, v in base.items()}  # 1 pint = 2 cups
-        elif unit == "quart" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 4 for k, v in base.items()}  # 1 quart = 4 cups
-        elif unit == "gallon" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 16 for k, v in base.items()}  # 1 gallon = 16 cups
-        # ML to cup conversion
-        elif unit == "ml" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 237 for k, v in base.items()}  # ~237 ml per cup
-        # Historical measurement conversions (Batch 14)
-        elif unit == "gill" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 0.5 for k, v in base.items()}  # 1 gill = 0.5 cup (4 fl oz)
-        elif unit == "drachm" and "oz" in db_entry:
-            base = db_entry["oz"]
-            return {k: v * quantity / 8 for k, v in base.items()}  # 1 drachm = 1/8 oz
-        elif unit == "drachm" and "tbsp" in db_entry:
-            base = db_entry["tbsp"]
-            return {k: v * quantity / 4 for k, v in base.items()}  # 1 fluid drachm ≈ 0.25 tbsp
-        elif unit == "dessertspoon" and "tsp" in db_entry:
-            base = db_entry["tsp"]
-            return {k: v * quantity * 2 for k, v in base.items()}  # 1 dessertspoon = 2 tsp
-        elif unit == "dessertspoon" and "tbsp" in db_entry:
-            base = db_entry["tbsp"]
-            return {k: v * quantity * 0.67 for k, v in base.items()}  # 1 dessertspoon = 2/3 tbsp
-        elif unit == "dessertspoon" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 24 for k, v in base.items()}  # 24 dessertspoons = 1 cup
-        elif unit == "saltspoon" and "tsp" in db_entry:
-            base = db_entry["tsp"]
-            return {k: v * quantity / 4 for k, v in base.items()}  # 1 saltspoon = 1/4 tsp
-        elif unit == "saltspoon" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 192 for k, v in base.items()}  # 192 saltspoons = 1 cup
-        elif unit == "wineglass" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 0.5 for k, v in base.items()}  # 1 wineglass ≈ 0.5 cup (4 fl oz)
-        elif unit == "teacup" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 0.75 for k, v in base.items()}  # 1 teacup ≈ 0.75 cup (6 fl oz)
-        elif unit == "coffeecup" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity for k, v in base.items()}  # 1 coffeecup ≈ 1 cup
-        elif unit == "jigger" and "tbsp" in db_entry:
-            base = db_entry["tbsp"]
-            return {k: v * quantity * 3 for k, v in base.items()}  # 1 jigger = 3 tbsp (1.5 oz)
-        elif unit == "jigger" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 5.33 for k, v in base.items()}  # 1 jigger ≈ 3/16 cup
-        elif unit == "peck" and "quart" in db_entry:
-            base = db_entry["quart"]
-            return {k: v * quantity * 8 for k, v in base.items()}  # 1 peck = 8 quarts
-        elif unit == "peck" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 32 for k, v in base.items()}  # 1 peck = 32 cups
-        elif unit == "bushel" and "quart" in db_entry:
-            base = db_entry["quart"]
-            return {k: v * quantity * 32 for k, v in base.items()}  # 1 bushel = 32 quarts
-        elif unit == "bushel" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity * 128 for k, v in base.items()}  # 1 bushel = 128 cups
-        # Batch 15: Weight to volume conversions for common baking items
-        elif unit == "lb" and "cup" in db_entry:
-            # Common conversions: flour ~4 cups/lb, sugar ~2.25 cups/lb, butter ~2 cups/lb
-            if "flour" in item:
-                base = db_entry["cup"]
-                return {k: v * quantity * 4 for k, v in base.items()}  # 1 lb flour ≈ 4 cups
-            elif "sugar" in item:
-                base = db_entry["cup"]
-                return {k: v * quantity * 2.25 for k, v in base.items()}  # 1 lb sugar ≈ 2.25 cups
-            else:
-                base = db_entry["cup"]
-                return {k: v * quantity * 2 for k, v in base.items()}  # Generic: 1 lb ≈ 2 cups
-        elif unit == "oz" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 8 for k, v in base.items()}  # 8 oz = 1 cup (volume)
-        elif unit == "oz" and "tbsp" in db_entry:
-            base = db_entry["tbsp"]
-            return {k: v * quantity * 2 for k, v in base.items()}  # 1 oz = 2 tbsp
-        elif unit == "tsp" and "cup" in db_entry:
-            base = db_entry["cup"]
-            return {k: v * quantity / 48 for k, v in base.items()}  # 48 tsp = 1 cup
-        # Empty unit fallback - use first available unit as reasonable default
-        elif unit == "" and db_entry:
-            # Prefer common units in order
-            for preferred in ["tbsp", "tsp", "cup", "oz", "each", ""]:
-                if preferred in db_entry:
-                    base = db_entry[preferred]
-                    return {k: v * quantity for k, v in base.items()}
-
-    # Try without unit for counted items
-    if item in NUTRITION_DB and "" in NUTRITION_DB[item]:
-        base = NUTRITION_DB[item][""]
-        return {k: v * quantity for k, v in base.items()}
-
-    return None
+    if "water" in item and compiled is None:
+        return ZERO_NUTRITION
+
+    if compiled is None:
+        return None
+    units, any_unit = compiled
+    if unit not in units:
+        if any_unit is None:
+            return None
+        unit = ""
+    return item, unit, quantity
 
 
 def parse_servings(servings_str, default=4):
@@ -5223,17 +5167,14 @@ def calculate_recipe_nutrition(recipe, default_servings=4):
     """Calculate complete nutrition for a recipe."""
     ingredients = recipe.get("ingredients", [])
 
-    # Use smart serving inference
-    servings = infer_servings(recipe)
-    serving_inferred = not recipe.get("servings_yield")
-
     total = {"cal": 0, "fat": 0, "carbs": 0, "protein": 0, "sodium": 0, "fiber": 0, "sugar": 0}
     missing = []
     skipped_equipment = 0
     actual_ingredients = 0
 
+    normalized = is_normalized(recipe)
     for ing in ingredients:
-        nutr = get_nutrition_for_ingredient(ing)
+        nutr = get_nutrition_for_ingredient(ing, normalized)
         if nutr:
             # Check if it was skipped equipment
             if nutr.get("_skipped"):
@@ -5243,23 +5184,39 @@ def calculate_recipe_nutrition(recipe, default_servings=4):
                 for key in total:
                     total[key] += nutr.get(key, 0)
         else:
-            # Check if it's equipment before adding to missing
-            item = normalize_ingredient(ing.get("item", ""))
-            if not is_equipment(item):
+            if record_missing(ing, missing, normalized):
                 actual_ingredients += 1
-                ing_str = f"{ing.get('quantity', '')} {ing.get('unit', '')} {ing.get('item', '')}".strip()
-                if ing_str:
-                    missing.append(ing_str)
+
+    servings = infer_servings(recipe)
+    return build_nutrition(recipe, servings, [total[k] / servings for k in NUTRIENT_KEYS],
+                           missing, actual_ingredients)
+
+
+def record_missing(ing, missing, normalized=False):
+    """Record an unmatched ingredient line; returns False for equipment (not counted)."""
+    # Check if it's equipment before adding to missing
+    if ingredient_fields(ing, normalized)[4]:
+        return False
+    ing_str = f"{ing.get('quantity', '')} {ing.get('unit', '')} {ing.get('item', '')}".strip()
+    if ing_str:
+        missing.append(ing_str)
+    return True
+
+
+def build_nutrition(recipe, servings, per_serving_raw, missing, actual_ingredients):
+    """Build a recipe's nutrition object from unrounded per-serving totals."""
+    serving_inferred = not recipe.get("servings_yield")
+    cal, fat, carbs, protein, sodium, fiber, sugar = per_serving_raw
 
     # Calculate per-serving values
     per_serving = {
-        "calories": round(total["cal"] / servings),
-        "fat_g": round(total["fat"] / servings, 1),
-        "carbs_g": round(total["carbs"] / servings, 1),
-        "protein_g": round(total["protein"] / servings, 1),
-        "sodium_mg": round(total["sodium"] / servings),
-        "fiber_g": round(total["fiber"] / servings, 1),
-        "sugar_g": round(total["sugar"] / servings, 1)
+        "calories": round(cal),
+        "fat_g": round(fat, 1),
+        "carbs_g": round(carbs, 1),
+        "protein_g": round(protein, 1),
+        "sodium_mg": round(sodium),
+        "fiber_g": round(fiber, 1),
+        "sugar_g": round(sugar, 1)
     }
 
     # Determine status (based on actual food ingredients, not equipment)
@@ -5286,12 +5243,159 @@ def calculate_recipe_nutrition(recipe, default_servings=4):
     }
 
 
+# =============================================================================
+# BATCH ENGINE - NumPy recalculation of many recipes at once
+# =============================================================================
+
+# Constant per-line results get their own rows in the nutrition matrix
+CONSTANT_ROWS = {"@zero": ZERO_NUTRITION, "@seasoning": SEASONING_NUTRITION}
+
+_resolution_cache = {}
+_nutrition_matrix = None
+
+
+class NutritionMatrix:
+    """
+    NUTRITION_DB as a dense (ingredients x units x nutrients) array.
+
+    base[row, col] holds the database values used for that unit (after unit
+    conversion lookup); a line's nutrition is base * quantity * mul / div,
+    which reproduces scale_nutrition() bit for bit.
+    """
+
+    def __init__(self, unit_table=None):
+        unit_table = UNIT_TABLE if unit_table is None else unit_table
+        items = list(unit_table) + list(CONSTANT_ROWS)
+        units = sorted({u for units, _ in unit_table.values() for u in units} | {""})
+        self.rows = {item: i for i, item in enumerate(items)}
+        self.cols = {unit: j for j, unit in enumerate(units)}
+
+        shape = (len(items), len(units))
+        self.base = np.zeros(shape + (len(NUTRIENT_KEYS),))
+        self.mul = np.ones(shape)
+        self.div = np.ones(shape)
+
+        for item, (conversions, _) in unit_table.items():
+            i = self.rows[item]
+            for unit, (base, mul, div) in conversions.items():
+                j = self.cols[unit]
+                values = dict(base)
+                self.base[i, j] = [values.get(k, 0) for k in NUTRIENT_KEYS]
+                if mul is not None:
+                    self.mul[i, j] = mul
+                elif div is not None:
+                    self.div[i, j] = div
+
+        j = self.cols[""]
+        for name, values in CONSTANT_ROWS.items():
+            self.base[self.rows[name], j] = [values[k] for k in NUTRIENT_KEYS]
+
+    def line_values(self, rows, cols, quantities):
+        """Nutrient vectors for (row, col, quantity) triples, shape (n, 7)."""
+        return (self.base[rows, cols] * quantities[:, None]
+                * self.mul[rows, cols][:, None] / self.div[rows, cols][:, None])
+
+
+def get_nutrition_matrix():
+    """Build the dense nutrition matrix once per process."""
+    global _nutrition_matrix
+    if _nutrition_matrix is None:
+        _nutrition_matrix = NutritionMatrix()
+    return _nutrition_matrix
+
+
+def resolve_ingredient_cached(ing, normalized=False):
+    """resolve_ingredient() memoized on the raw (item, unit, quantity) fields."""
+    raw_item = ing.get("item", "")
+    raw_unit = ing.get("unit", "")
+    raw_quantity = ing.get("quantity", "1")
+    prep_note = str(ing.get("prep_note", "")).lower()
+    to_taste = "to taste" in prep_note or "to sweeten" in prep_note
+
+    key = (raw_item, raw_unit, raw_quantity, to_taste)
+    try:
+        return _resolution_cache[key]
+    except KeyError:
+        result = _resolution_cache[key] = resolve_ingredient(
+            raw_item, raw_unit, raw_quantity, to_taste, stored_fields(ing) if normalized else None)
+        return result
+    except TypeError:  # unhashable field values
+        return resolve_ingredient(raw_item, raw_unit, raw_quantity, to_taste,
+                                  stored_fields(ing) if normalized else None)
+
+
+def calculate_nutrition_batch(recipes, default_servings=4):
+    """
+    Calculate nutrition for many recipes at once.
+
+    Every ingredient line is resolved to a (row, unit, quantity) triple and all
+    lines are summed into per-recipe totals with a single np.add.at scatter (in
+    line order, so sums match the per-recipe path exactly). Returns the same
+    nutrition objects as calculate_recipe_nutrition(), in recipe order.
+    """
+    if not NUMPY_AVAILABLE:
+        return [calculate_recipe_nutrition(r, default_servings) for r in recipes]
+
+    matrix = get_nutrition_matrix()
+    zero_row, seasoning_row = matrix.rows["@zero"], matrix.rows["@seasoning"]
+    empty_col = matrix.cols[""]
+
+    recipe_idx, rows, cols, quantities = [], [], [], []
+    missing_lists = []
+    actual_counts = []
+
+    for r, recipe in enumerate(recipes):
+        missing = []
+        actual_ingredients = 0
+        normalized = is_normalized(recipe)
+        for ing in recipe.get("ingredients", []):
+            resolved = resolve_ingredient_cached(ing, normalized)
+            if resolved is None:
+                if record_missing(ing, missing, normalized):
+                    actual_ingredients += 1
+                continue
+            if isinstance(resolved, dict):
+                if resolved.get("_skipped"):
+                    continue
+                row = seasoning_row if resolved is SEASONING_NUTRITION else zero_row
+                col, quantity = empty_col, 1.0
+            else:
+                item, unit, quantity = resolved
+                row, col = matrix.rows[item], matrix.cols[unit]
+            actual_ingredients += 1
+            recipe_idx.append(r)
+            rows.append(row)
+            cols.append(col)
+            quantities.append(quantity)
+        missing_lists.append(missing)
+        actual_counts.append(actual_ingredients)
+
+    totals = np.zeros((len(recipes), len(NUTRIENT_KEYS)))
+    if rows:
+        values = matrix.line_values(np.array(rows), np.array(cols), np.array(quantities, dtype=float))
+        np.add.at(totals, np.array(recipe_idx), values)
+
+    servings = [infer_servings(recipe) for recipe in recipes]
+    per_serving = (totals / np.array(servings, dtype=float)[:, None]).tolist()
+
+    return [
+        build_nutrition(recipe, servings[r], per_serving[r], missing_lists[r], actual_counts[r])
+        for r, recipe in enumerate(recipes)
+    ]
+
+
 # =============================================================================
 # MAIN PROCESSING
 # =============================================================================
 
-def process_all_recipes():
-    """Process all recipe shards and add nutrition data."""
+def process_all_recipes(recompute_all=False):
+    """
+    Process all recipe shards and add nutrition data.
+
+    By default only recipes without complete nutrition are calculated. With
+    recompute_all, every recipe is recalculated (batch engine, one pass per
+    shard); shards whose nutrition did not change are not rewritten.
+    """
     shard_files = sorted(glob.glob('data/recipes-*.json'))
 
     total_processed = 0
@@ -5309,7 +5413,7 @@ def process_all_recipes():
             data = json.load(f)
 
         recipes = data.get('recipes', [])
-        updated = 0
+        pending = []
 
         for recipe in recipes:
             # Skip flagged non-recipe content
@@ -5318,14 +5422,18 @@ def process_all_recipes():
 
             # Skip if already has complete nutrition
             existing = recipe.get('nutrition', {})
-            if existing.get('status') == 'complete':
+            if existing.get('status') == 'complete' and not recompute_all:
                 total_complete += 1
                 continue
 
-            # Calculate nutrition
-            nutrition = calculate_recipe_nutrition(recipe, default_servings=4)
-            recipe['nutrition'] = nutrition
-            updated += 1
+            pending.append(recipe)
+
+        # Calculate nutrition
+        updated = 0
+        for recipe, nutrition in zip(pending, calculate_nutrition_batch(pending, default_servings=4)):
+            if recipe.get('nutrition') != nutrition:
+                recipe['nutrition'] = nutrition
+                updated += 1
             total_processed += 1
 
             if nutrition['status'] == 'complete':
@@ -5336,8 +5444,9 @@ def process_all_recipes():
                 total_insufficient += 1
 
         # Save updated shard
-        with open(shard_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if updated:
+            with open(shard_file, 'w') as f:
+                json.dump(data, f, indent=2)
 
         print(f"  Updated {updated} recipes")
 
@@ -5353,4 +5462,9 @@ def process_all_recipes():
 
 
 if __name__ == "__main__":
-    process_all_recipes()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Add nutrition data to recipe shards")
+    parser.add_argument('--all', action='store_true',
+                        help='Recalculate every recipe, not just those without complete nutrition')
+    args = parser.parse_args()
+
+    process_all_recipes(recompute_all=args.all)
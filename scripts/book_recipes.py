@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Candidate Recipe Extractor for MomMom's Kitchen (Standalone Collection)
+
+Triage for the extracted book texts (pdf_safeguards.py extract output:
+Foxfire-Book-2.txt, foxfire-three.txt, FoxfireVol1.txt.html, ...). Instead
+of reading a book cover to cover and hand-typing recipe literals, this
+streams it and yields draft recipes - with the page they came from - for a
+person to check and clean up.
+
+Pipeline (generators, one page in memory at a time):
+
+    iter_lines()      pages via text_pages.PageText (mmap), OCR-normalized lines
+    find_mentions()   "2 cups corn meal", "one tablespoon vanilla", "1 small chicken"
+                      using the ingredient_line quantity / unit grammar
+    iter_blocks()     groups nearby ingredient lines (list style or run-in
+                      "Dewberry pie: one cup sugar; 1/4 cup flour; ...") with a
+                      title and the method text that follows
+    draft_recipe()    recipe-schema dict with "provenance": {"file", "pages"}
+
+Drafts are marked confidence "low"; nothing is written to the collection.
+
+Usage:
+    python scripts/book_recipes.py                                   # All book texts, summary
+    python scripts/book_recipes.py foxfire-three.txt                 # One book
+    python scripts/book_recipes.py --output drafts.jsonl             # Drafts as JSON lines
+    python scripts/book_recipes.py --min-ingredients 3 FoxfireVol1.txt.html
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from add_nutrition import NUTRITION_DB, UNIT_CONVERSIONS, normalize_ingredient_cached
+from ingredient_line import (NUMBER, RANGE_SEPARATOR, WORD_NUMBER, format_quantity,
+                             normalize_unit, parse_quantity_range)
+from text_pages import DATA_DIR, PageText, book_files
+
+MIN_INGREDIENTS = 2          # Mentions needed for a block to become a draft
+MAX_METHOD_LINES = 12        # Method lines kept after the last ingredient line
+MAX_TITLE_WORDS = 7
+TITLE_LOOKBACK = 3           # Non-blank lines searched above the first ingredient
+
+# Units a measured ingredient can use: everything the conversions and the
+# nutrition database know, minus sizes/placeholders handled separately
+SIZE_WORDS = {"small", "medium", "large"}
+KNOWN_UNITS = ({unit for row in UNIT_CONVERSIONS for unit in row[:2]}
+               | {unit for units in NUTRITION_DB.values() for unit in units}
+               | {"dash", "pinch", "handful", "gallon", "peck", "bushel"}) \
+              - {"", "each", "to taste", "half", "inch", "1-oz"} - SIZE_WORDS
+
+_QUANTITY = "(?:" + NUMBER + "|" + WORD_NUMBER + ")"
+MENTION_PATTERN = re.compile(
+    r"(?<![\w/.])(?P<qty>" + _QUANTITY + "(?:" + RANGE_SEPARATOR + _QUANTITY + r")?)"
+    r"\s+(?P<unit>[a-z]+\.?)"
+    r"(?:\s+of)?"
+    r"(?P<item>(?:\s+(?!(?:and|or|to)\s+" + _QUANTITY + r")[a-z][\w'-]*)+)",
+    re.IGNORECASE)
+OCR_FIXES = [
+    (re.compile(r"(?<![A-Za-z])[lIi]/\s?(\d)"), r"1/\1"),     # "l/2", "i/ 2" -> "1/2"
+    (re.compile(r"(\d)/\s(\d)"), r"\1/\2"),                    # "1/ 2" -> "1/2"
+    (re.compile(r"(?<![\d/])([1-9])([1-7])/([2-8])(?![\d/])"),  # "11/2" -> "1 1/2"
+     lambda m: f"{m[1]} {m[2]}/{m[3]}" if int(m[2]) < int(m[3]) else m[0]),
+    (re.compile(r"¬\s*$"), "-"),                                # soft-hyphen line breaks
+    (re.compile(r"(^|[;,:]\s*)(pinch|dash)\b", re.IGNORECASE), r"\g<1>1 \2"),  # "; pinch of salt"
+]
+# A quantity wrapped onto the next line: "...; 1 1/4" / "cups milk; ..."
+TRAILING_QTY = re.compile(r"(?:^|(?<=[\s;,:]))(\d+\s+\d+/\d+|\d+/\d+|\d+)$")
+# Words that end an ingredient phrase in run-in prose ("2/3 cup sugar and pour into...")
+ITEM_STOP_WORDS = {"add", "bake", "beat", "boil", "cook", "cover", "heat", "let", "mix",
+                   "place", "pour", "put", "serve", "stir", "then", "until", "when"}
+RUN_IN_TITLE = re.compile(r"^([A-Z][\w' -]{2,60}?)\s*[:—]\s*")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+
+
+class Line(NamedTuple):
+    page: int
+    text: str
+
+
+class Mention(NamedTuple):
+    quantity: str
+    unit: str
+    item: str
+    start: int
+    end: int
+
+
+def normalize_line(text: str) -> str:
+    for pattern, replacement in OCR_FIXES:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def iter_lines(path: Path) -> Iterator[Line]:
+    """Normalized lines of a book text, page by page (blank lines kept as '')."""
+    carry = ""
+    with PageText.open(path) as book:
+        for number, text in book.pages(1, max(book.numbers, default=0)):
+            for raw in text.split("\n"):
+                line = normalize_line(raw)
+                if carry and line:
+                    line, carry = f"{carry} {line}", ""
+                m = TRAILING_QTY.search(line)
+                if m and m.start() > 0:
+                    line, carry = line[:m.start()].rstrip(), m.group(1)
+                yield Line(number, line)
+    if carry:
+        yield Line(number, carry)
+
+
+# Every word of a nutrition-database ingredient name. normalize_ingredient is
+# ~1ms per call, so a phrase must share a word with the database to get one.
+ITEM_WORDS = {word for name in NUTRITION_DB for word in re.findall(r"[a-z]+", name)}
+
+
+def _known_item(item: str) -> bool:
+    words = re.findall(r"[a-z]+", item.lower())
+    if not any(w in ITEM_WORDS or w.rstrip("s") in ITEM_WORDS or w[:-2] in ITEM_WORDS
+               for w in words):
+        return False
+    return normalize_ingredient_cached(item) in NUTRITION_DB
+
+
+def find_mentions(text: str) -> List[Mention]:
+    """Quantity + unit + item phrases in a line, validated against the unit grammar."""
+    mentions = []
+    for m in MENTION_PATTERN.finditer(text):
+        qty, unit, item = m.group("qty"), m.group("unit"), m.group("item").strip()
+        unit_key = normalize_unit(unit)
+        if unit_key in KNOWN_UNITS:
+            pass
+        elif unit.lower() in SIZE_WORDS or _known_item(f"{unit} {item}") or _known_item(unit):
+            # No unit: "3 eggs", "1 small chicken", "2 onions, chopped"
+            item, unit_key = f"{unit} {item}".strip(), ""
+        else:
+            continue
+        if qty.lower() in ("a", "an") and not unit_key:
+            continue  # "a little while", "an old man" - too loose without a unit
+        words = item.split()
+        for i, word in enumerate(words):
+            if word.lower() in ITEM_STOP_WORDS:
+                words = words[:i]
+                break
+        while words and words[-1].lower() in ("and", "or", "with"):
+            words.pop()
+        item = " ".join(words).strip(" -")
+        low, high = parse_quantity_range(qty)
+        if not item or low is None:
+            continue
+        mentions.append(Mention(format_quantity(low, high), unit_key, item, m.start(), m.end()))
+    return mentions
+
+
+def heading_title(text: str) -> Optional[str]:
+    """
+    The title if a line reads like one: a short title-cased line
+    ("CORN PONES", "Persimmon Pudding") or the lead of a run-in "Name: ..." paragraph.
+    """
+    run_in = RUN_IN_TITLE.match(text)
+    if run_in and len(run_in.group(1).split()) <= MAX_TITLE_WORDS:
+        return run_in.group(1).strip()
+    words = text.split()
+    if not words or len(words) > MAX_TITLE_WORDS or text[-1] in ".,;:!?":
+        return None
+    letters = [w for w in words if w[0].isalpha()]
+    if letters and all(w[0].isupper() for w in letters):
+        return text
+    return None
+
+
+class _Block:
+    def __init__(self, title: str, page: int):
+        self.title = title
+        self.first_page = page
+        self.last_page = page
+        self.ingredients: List[Mention] = []
+        self.method: List[str] = []
+        self.continuable = False    # Previous line ended an ingredient phrase
+
+    def add_method(self, text: str):
+        if self.method and self.method[-1].endswith("-"):
+            self.method[-1] = self.method[-1][:-1] + text      # re-join hyphenated words
+        else:
+            self.method.append(text)
+
+
+def iter_blocks(lines: Iterable[Line], min_ingredients: int = MIN_INGREDIENTS) -> Iterator[_Block]:
+    """Group streamed lines into candidate recipe blocks (constant memory)."""
+    recent = deque(maxlen=TITLE_LOOKBACK)   # Recent non-ingredient lines, for titles
+    block: Optional[_Block] = None
+
+    def finish(b):
+        return b if b is not None and len(b.ingredients) >= min_ingredients else None
+
+    for line in lines:
+        text = line.text
+        if not text:
+            continue
+        mentions = find_mentions(text)
+
+        if mentions:
+            run_in = RUN_IN_TITLE.match(text)
+            starts_new = block is None or bool(block.method) or (
+                run_in is not None and run_in.end() <= mentions[0].start)
+            if starts_new:
+                done = finish(block)
+                if done:
+                    yield done
+                if run_in and run_in.end() <= mentions[0].start:
+                    title = run_in.group(1)
+                else:
+                    title = next((t for t in map(heading_title, reversed(recent)) if t), "")
+                block = _Block(title.strip(), line.page)
+                recent.clear()
+            block.ingredients.extend(mentions)
+            block.last_page = line.page
+            tail = text[mentions[-1].end:].lstrip(" ;,")
+            if tail[:1] == "." or (tail and len(tail.split()) >= 3 and tail[0].isupper()):
+                block.add_method(tail.lstrip(". "))
+            block.continuable = not tail
+            continue
+
+        if block is not None:
+            if block.continuable and not block.method and text[0].islower() \
+                    and len(text.split()) <= 4:
+                last = block.ingredients[-1]
+                block.ingredients[-1] = last._replace(item=f"{last.item} {text.rstrip(',')}")
+                continue
+            block.continuable = False
+            if heading_title(text) or len(block.method) >= MAX_METHOD_LINES:
+                done = finish(block)
+                if done:
+                    yield done
+                block = None
+            else:
+                block.add_method(text)
+                block.last_page = line.page
+                continue
+
+        recent.append(text)
+
+    done = finish(block)
+    if done:
+        yield done
+
+
+def slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def draft_recipe(block: _Block, source: str) -> Dict:
+    """Recipe-schema draft for a block, with page provenance."""
+    title = block.title.title() if block.title.isupper() else block.title
+    method = " ".join(block.method).strip()
+    steps = [s.strip() for s in SENTENCE_SPLIT.split(method) if s.strip()] if method else []
+    pages = [block.first_page, block.last_page]
+    return {
+        "id": f"draft-{slug(source.split('.')[0])}-p{block.first_page}-"
+              f"{slug(title)[:40] or 'untitled'}",
+        "title": title or f"Untitled ({source} p{block.first_page})",
+        "category": "",
+        "source_note": f"Auto-extracted from {source}, page "
+                       + (str(pages[0]) if pages[0] == pages[1] else f"{pages[0]}-{pages[1]}"),
+        "ingredients": [{"item": m.item, "quantity": m.quantity, "unit": m.unit, "prep_note": ""}
+                        for m in block.ingredients],
+        "instructions": [{"step": i, "text": s} for i, s in enumerate(steps, 1)],
+        "tags": ["draft"],
+        "confidence": {
+            "overall": "low",
+            "flags": [{"field": "all", "issue": "Auto-extracted draft; verify against the page",
+                       "candidates": []}],
+        },
+        "image_refs": [source],
+        "provenance": {"file": source, "pages": pages},
+    }
+
+
+def extract_drafts(path: Path, min_ingredients: int = MIN_INGREDIENTS) -> Iterator[Dict]:
+    """Stream draft recipes from one extracted book text."""
+    seen = {}
+    for block in iter_blocks(iter_lines(path), min_ingredients):
+        draft = draft_recipe(block, path.name)
+        n = seen[draft["id"]] = seen.get(draft["id"], 0) + 1
+        if n > 1:
+            draft["id"] += f"-{n}"
+        yield draft
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find candidate recipes in extracted book texts")
+    parser.add_argument("files", nargs="*", help="Text files (default: every book text in data/)")
+    parser.add_argument("--output", "-o", metavar="PATH", help="Write drafts as JSON lines")
+    parser.add_argument("--min-ingredients", type=int, default=MIN_INGREDIENTS,
+                        help=f"Ingredient mentions needed for a draft (default {MIN_INGREDIENTS})")
+    args = parser.parse_args()
+
+    files = []
+    for name in args.files:
+        path = Path(name) if Path(name).exists() else DATA_DIR / name
+        if not path.exists():
+            print(f"ERROR: Text file not found: {name}")
+            sys.exit(1)
+        files.append(path)
+    files = files or book_files()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    total = 0
+    try:
+        for path in files:
+            start = time.perf_counter()
+            count = 0
+            for draft in extract_drafts(path, args.min_ingredients):
+                count += 1
+                if out:
+                    out.write(json.dumps(draft, ensure_ascii=False) + "\n")
+                else:
+                    pages = draft["provenance"]["pages"]
+                    where = f"p{pages[0]}" if pages[0] == pages[1] else f"p{pages[0]}-{pages[1]}"
+                    print(f"  {where:>9}  {draft['title'][:50]:<50} "
+                          f"{len(draft['ingredients'])} ingredients")
+            elapsed = time.perf_counter() - start
+            size = path.stat().st_size / (1024 * 1024)
+            print(f"{path.name}: {count} candidate(s) from {size:.1f} MB in {elapsed:.1f}s")
+            total += count
+    finally:
+        if out:
+            out.close()
+
+    print(f"\n{total} candidate recipe(s)" + (f" written to {args.output}" if out else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build for MomMom's Kitchen (Standalone Collection)
+
+Run after create_shards.py. Copies the files the website fetches
+(recipes-index.json, search-index.json and every shard in the index manifest)
+into data/build/ as:
+
+    - minified JSON named by content hash, e.g. recipes-desserts.3f9a1c2b.json
+      (shards without the normalized ingredient fields, which only scripts use)
+    - a precompressed .gz sibling (gzip -9, fixed mtime so output is stable)
+    - a precompressed .br sibling when the brotli package is installed
+
+and writes data/build/manifest.json mapping logical -> hashed names, which
+script.js reads first. Hashed files never change, so they can be served with
+a far-future cache header; a redeploy only changes the names of files whose
+content changed. Files from the previous build stay one generation (for
+visitors still holding the old manifest), then are pruned; a rebuild that
+changes nothing keeps them.
+
+Usage:
+    python scripts/create_shards.py
+    python scripts/build_assets.py
+    python scripts/build_assets.py --no-compress   # Minified + hashed only
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from create_shards import DATA_DIR, INDEX_FILE, SEARCH_INDEX_FILE, load_index
+from normalize_ingredients import strip_recipe
+
+BUILD_DIR = os.path.join(DATA_DIR, 'build')
+MANIFEST_FILE = os.path.join(BUILD_DIR, 'manifest.json')
+MANIFEST_VERSION = 1
+HASH_LENGTH = 8
+
+
+def minify(path, strip_normalized=False):
+    """
+    Minified UTF-8 JSON bytes for a source file. For shards, strip_normalized
+    drops the ingredient fields normalize_ingredients.py stores for the
+    scripts (the site only reads item/quantity/unit/prep_note).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if strip_normalized and isinstance(data.get('recipes'), list):
+        data['recipes'] = [strip_recipe(r) for r in data['recipes']]
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(logical_name, payload):
+    """recipes-desserts.json + bytes -> recipes-desserts.<sha256[:8]>.json"""
+    stem, ext = os.path.splitext(logical_name)
+    digest = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}{ext}"
+
+
+def write_bytes(path, payload):
+    """Atomic write (temp file + rename)."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def logical_files():
+    """Files (relative to data/) that the site fetches, with whether each is a shard."""
+    index_data = load_index()
+    if index_data is None:
+        raise FileNotFoundError(f"{INDEX_FILE} not found - run scripts/create_shards.py first")
+    names = [(os.path.basename(INDEX_FILE), False)]
+    if os.path.exists(SEARCH_INDEX_FILE):
+        names.append((os.path.basename(SEARCH_INDEX_FILE), False))
+    names.extend((s['file'], True) for s in index_data.get('shards', []))
+    return names
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return None
+    try:
+        with open(MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def build_assets(compress=True):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    previous = load_manifest()
+
+    files = {}
+    totals = {'source': 0, 'minified': 0, 'gzip': 0, 'brotli': 0}
+    written = 0
+    for logical, is_shard in logical_files():
+        source = os.path.join(DATA_DIR, logical)
+        payload = minify(source, strip_normalized=is_shard)
+        name = hashed_name(logical, payload)
+        entry = {'file': name, 'bytes': len(payload)}
+        totals['source'] += os.path.getsize(source)
+        totals['minified'] += len(payload)
+
+        # Content-addressed: an existing file with this name is already correct
+        target = os.path.join(BUILD_DIR, name)
+        if not os.path.exists(target):
+            write_bytes(target, payload)
+            written += 1
+
+        if compress:
+            gz_path = f'{target}.gz'
+            if not os.path.exists(gz_path):
+                write_bytes(gz_path, gzip.compress(payload, compresslevel=9, mtime=0))
+            entry['gzip'] = os.path.getsize(gz_path)
+            totals['gzip'] += entry['gzip']
+
+            if BROTLI_AVAILABLE:
+                br_path = f'{target}.br'
+                if not os.path.exists(br_path):
+                    write_bytes(br_path, brotli.compress(payload, quality=11))
+                entry['brotli'] = os.path.getsize(br_path)
+                totals['brotli'] += entry['brotli']
+
+        files[logical] = entry
+
+    # Hashed names still on disk from the previous generation (pruned once a newer
+    # one replaces this build). A build that changes nothing isn't a new
+    # generation, so it keeps the previous list it found.
+    current = {e['file'] for e in files.values()}
+    live = {e['file'] for e in (previous or {}).get('files', {}).values()}
+    if live == current:
+        previous_files = set((previous or {}).get('previous', [])) - current
+    else:
+        previous_files = live - current
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'files': files,
+        'previous': sorted(previous_files),
+    }
+    write_bytes(MANIFEST_FILE, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+
+    # Prune anything not in this build or the previous one
+    keep = current | previous_files
+    pruned = 0
+    for name in os.listdir(BUILD_DIR):
+        if name == os.path.basename(MANIFEST_FILE) or name.endswith('.tmp'):
+            continue
+        base = name[:-3] if name.endswith(('.gz', '.br')) else name
+        if base not in keep:
+            os.remove(os.path.join(BUILD_DIR, name))
+            pruned += 1
+
+    print(f"Built {len(files)} assets in data/build/ ({written} new, {pruned} stale files pruned)")
+    print(f"  Source (indent=2): {totals['source']:>10,} bytes")
+    print(f"  Minified:          {totals['minified']:>10,} bytes")
+    if compress:
+        print(f"  gzip -9:           {totals['gzip']:>10,} bytes "
+              f"({totals['source'] / max(totals['gzip'], 1):.1f}x smaller)")
+        if BROTLI_AVAILABLE:
+            print(f"  brotli q11:        {totals['brotli']:>10,} bytes "
+                  f"({totals['source'] / max(totals['brotli'], 1):.1f}x smaller)")
+        else:
+            print("  brotli: skipped (pip install brotli to emit .br files)")
+    print(f"Manifest: data/build/{os.path.basename(MANIFEST_FILE)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build minified, hashed, precompressed site data")
+    parser.add_argument('--no-compress', action='store_true', help="Skip .gz/.br siblings")
+    args = parser.parse_args()
+
+    try:
+        build_assets(compress=not args.no_compress)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,11 +5,50 @@ Create category-based recipe shards for better performance.
 This splits the monolithic recipes.json into:
 - recipes-index.json: Minimal metadata for all recipes (for browsing/search)
 - recipes-{category}.json: Full recipe data per category (loaded on-demand)
+
+If data/recipes.json is absent, the existing shards are the source of truth
+and are reassembled (in index order) before rebuilding.
+
+Incremental mode keeps a per-recipe content-hash ledger (data/shard_ledger.json)
+and only rewrites the shards whose members changed, patching the index in place:
+
+    python scripts/create_shards.py                 # Full rebuild
+    python scripts/create_shards.py --incremental   # Rewrite changed shards only
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import unicodedata
+import zlib
+
+from search_index import build_search_index
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+RECIPES_FILE = os.path.join(DATA_DIR, 'recipes.json')
+INDEX_FILE = os.path.join(DATA_DIR, 'recipes-index.json')
+LEDGER_FILE = os.path.join(DATA_DIR, 'shard_ledger.json')
+SEARCH_INDEX_FILE = os.path.join(DATA_DIR, 'search-index.json')
+LEDGER_VERSION = 1
+
+# Shard strategies (meta.shard_strategy). 'by_size' packs small categories
+# together and splits large ones into hash sub-shards around a byte budget;
+# the resulting plan is stored in meta.shard_plan.
+SHARD_STRATEGIES = ['by_category', 'by_size']
+DEFAULT_SHARD_BUDGET = 256 * 1024
+# Categories smaller than this fraction of the budget are packed together
+PACK_FRACTION = 0.5
+
+# recipes-index.json layouts (meta.index_format; absent means 'objects')
+INDEX_FORMATS = ['objects', 'columnar']
+COLUMNAR_VERSION = 1
+# Columnar index: fields stored as indexes into a per-field string table
+INTERNED_FIELDS = ['category', 'tags', 'collection', 'attribution', 'shard']
+# Columnar index: mostly-null fields stored as {row: value}
+SPARSE_FIELDS = ['variant_of', 'canonical_id']
 
 
 def sanitize_category(cat):
@@ -17,13 +56,400 @@ def sanitize_category(cat):
     return re.sub(r'\s+', '-', cat.strip().lower())
 
 
-def create_shards():
-    # Load existing recipes
-    with open('data/recipes.json', 'r') as f:
+def shard_file_for(recipe, plan=None):
+    """
+    Return the shard filename (relative to data/) a recipe belongs in.
+
+    Without a plan (by_category) that is its category's file. With a by_size
+    plan a category is either packed into a shared file, split into
+    power-of-two hash buckets by id, or (if new since the plan) its own file.
+    """
+    cat = sanitize_category(recipe.get('category', 'uncategorized'))
+    spec = plan['categories'].get(cat) if plan else None
+    if spec is None:
+        return f"recipes-{cat}.json"
+    if 'buckets' in spec:
+        bucket = zlib.crc32((recipe.get('id') or '').encode('utf-8')) % spec['buckets']
+        return f"recipes-{cat}-{bucket}.json"
+    return spec['file']
+
+
+def recipe_bytes(recipe):
+    """Approximate bytes a recipe takes inside a shard (indent=2, nested two levels)."""
+    text = json.dumps(recipe, indent=2)
+    return len(text) + 4 * text.count('\n') + 6
+
+
+def plan_shards(recipes, budget=DEFAULT_SHARD_BUDGET):
+    """
+    Build a by_size shard plan: {'budget': bytes, 'categories': {cat: spec}}.
+
+    - Categories over budget are split into the fewest power-of-two hash
+      buckets that keep every bucket within budget (a bucket only exceeds it
+      if it holds a single oversized recipe). Doubling only splits buckets, so
+      ids never move between sibling sub-shards as a category grows.
+    - Categories under PACK_FRACTION of the budget are packed, in name order,
+      into recipes-packed-N.json files of at most one budget each.
+    - Everything else keeps its own recipes-{category}.json.
+
+    The plan is stored in the index and reused by incremental updates; only a
+    full rebuild re-plans.
+    """
+    sizes = {}
+    for r in recipes:
+        cat = sanitize_category(r.get('category', 'uncategorized'))
+        sizes.setdefault(cat, []).append((r.get('id') or '', recipe_bytes(r)))
+
+    categories = {}
+    packs = []    # [(bytes, [categories])]
+    for cat in sorted(sizes):
+        members = sizes[cat]
+        total = sum(size for _, size in members)
+        if total > budget and len(members) > 1:
+            buckets = 1
+            while buckets * budget < total:
+                buckets *= 2
+            while buckets < len(members):
+                loads = [0] * buckets
+                for recipe_id, size in members:
+                    loads[zlib.crc32(recipe_id.encode('utf-8')) % buckets] += size
+                if max(loads) <= budget:
+                    break
+                buckets *= 2
+            categories[cat] = {'buckets': buckets}
+        elif total < budget * PACK_FRACTION:
+            if not packs or packs[-1][0] + total > budget:
+                packs.append([0, []])
+            packs[-1][0] += total
+            packs[-1][1].append(cat)
+        else:
+            categories[cat] = {'file': f'recipes-{cat}.json'}
+
+    for n, (_, pack_categories) in enumerate(packs):
+        for cat in pack_categories:
+            categories[cat] = {'file': f'recipes-packed-{n}.json'}
+
+    return {'budget': budget, 'categories': dict(sorted(categories.items()))}
+
+
+def recipe_hash(recipe):
+    """Stable content hash of a recipe (key order independent)."""
+    payload = json.dumps(recipe, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def build_index_entry(r):
+    """Minimal metadata kept in recipes-index.json for browsing/search."""
+    return {
+        'id': r.get('id'),
+        'title': r.get('title'),
+        'category': sanitize_category(r.get('category', 'uncategorized')),  # Sanitized for shard lookup
+        'tags': r.get('tags', []),
+        'collection': r.get('collection'),
+        'description': (r.get('description', '') or '')[:100],
+        'servings_yield': r.get('servings_yield', ''),
+        'total_time': r.get('total_time', '') or r.get('cook_time', ''),
+        # Include attribution for search
+        'attribution': r.get('attribution', ''),
+        # Include variant info for filtering
+        'variant_of': r.get('variant_of'),
+        'canonical_id': r.get('canonical_id'),
+    }
+
+
+INDEX_FIELDS = list(build_index_entry({}))
+
+
+def index_entry_for(r, plan=None):
+    """Index entry; by_size indexes also record the recipe's shard file."""
+    entry = build_index_entry(r)
+    if plan is not None:
+        entry['shard'] = shard_file_for(r, plan)
+    return entry
+
+
+def shard_categories(members):
+    return sorted({sanitize_category(r.get('category', 'uncategorized')) for r in members})
+
+
+def shard_data_for(shard_file, members, plan=None):
+    """Shard file structure; by_size shards list the categories they hold."""
+    if plan is None:
+        return build_shard_data(shard_file[len('recipes-'):-len('.json')], members)
+    return {
+        'meta': {
+            'categories': shard_categories(members),
+            'count': len(members),
+            'parent_collection': 'mommom'
+        },
+        'recipes': members
+    }
+
+
+def manifest_entry(shard_file, members, plan=None):
+    """One recipes-index.json "shards" entry."""
+    if plan is None:
+        return {'category': shard_file[len('recipes-'):-len('.json')], 'file': shard_file,
+                'count': len(members)}
+    return {'file': shard_file, 'categories': shard_categories(members), 'count': len(members)}
+
+
+def manifest_sort_key(entry):
+    return (entry.get('category', ''), entry['file'])
+
+
+def build_shard_data(cat, cat_recipes):
+    """Wrap a category's recipes in the shard file structure."""
+    return {
+        'meta': {
+            'category': cat,
+            'count': len(cat_recipes),
+            'parent_collection': 'mommom'
+        },
+        'recipes': cat_recipes
+    }
+
+
+def write_json(path, data, compact=False):
+    """Write JSON atomically (temp file + rename) so readers never see a partial file."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        if compact:
+            json.dump(data, f, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def title_sort_key(title):
+    """Accent- and case-insensitive title order (close to JS localeCompare)."""
+    title = title or ''
+    folded = unicodedata.normalize('NFKD', title)
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch)).casefold()
+    # Ties: lowercase before uppercase, as ICU collation does
+    return (folded, title.swapcase())
+
+
+def encode_columnar_index(index_data):
+    """
+    Convert an object-form index into the columnar layout: one array per
+    field, interned string tables for repetitive fields, sparse maps for
+    mostly-null fields, and the rows in title order. Rows keep their order,
+    so search-index.json postings stay valid.
+    """
+    entries = index_data['recipes']
+    fields = list(INDEX_FIELDS)
+    if entries and 'shard' in entries[0]:
+        fields.append('shard')
+    interned = [field for field in INTERNED_FIELDS if field in fields]
+    strings = {field: [] for field in interned}
+    lookup = {field: {} for field in interned}
+
+    def intern(field, value):
+        table = lookup[field]
+        if value not in table:
+            table[value] = len(strings[field])
+            strings[field].append(value)
+        return table[value]
+
+    columns = {}
+    for field in fields:
+        if field == 'tags':
+            columns[field] = [[intern(field, t) for t in e.get(field) or []] for e in entries]
+        elif field in interned:
+            columns[field] = [intern(field, e.get(field)) for e in entries]
+        elif field in SPARSE_FIELDS:
+            columns[field] = {str(row): e[field] for row, e in enumerate(entries)
+                              if e.get(field) is not None}
+        else:
+            columns[field] = [e.get(field) for e in entries]
+
+    return {
+        'meta': index_data['meta'],
+        'shards': index_data['shards'],
+        'columnar': {
+            'version': COLUMNAR_VERSION,
+            'count': len(entries),
+            'fields': fields,
+            'interned': interned,
+            'sparse': SPARSE_FIELDS,
+            'strings': strings,
+            'columns': columns,
+            'title_order': sorted(range(len(entries)),
+                                  key=lambda row: title_sort_key(entries[row].get('title'))),
+        },
+    }
+
+
+def decode_columnar_index(data):
+    """Rebuild the object-form index (same entries, same order) from columnar data."""
+    col = data['columnar']
+    if col.get('version') != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar index version: {col.get('version')}")
+    columns, strings = col['columns'], col['strings']
+    interned, sparse = set(col['interned']), set(col['sparse'])
+
+    entries = []
+    for row in range(col['count']):
+        entry = {}
+        for field in col['fields']:
+            value = columns[field]
+            if field in sparse:
+                entry[field] = value.get(str(row))
+            elif field == 'tags':
+                entry[field] = [strings[field][i] for i in value[row]]
+            elif field in interned:
+                entry[field] = strings[field][value[row]]
+            else:
+                entry[field] = value[row]
+        entries.append(entry)
+
+    return {'meta': data['meta'], 'shards': data['shards'], 'recipes': entries}
+
+
+def write_index(index_data):
+    """
+    Write recipes-index.json (in the layout meta.index_format asks for) and
+    the search index built from its rows.
+    """
+    if index_data['meta'].get('index_format') == 'columnar':
+        write_json(INDEX_FILE, encode_columnar_index(index_data), compact=True)
+    else:
+        write_json(INDEX_FILE, index_data)
+    write_json(SEARCH_INDEX_FILE, build_search_index(index_data['recipes']), compact=True)
+
+
+def file_stat(path):
+    """(mtime_ns, size) used as a cheap change prefilter."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_index():
+    """
+    Load recipes-index.json in object form (columnar files are decoded), or
+    None if it doesn't exist yet.
+    """
+    if not os.path.exists(INDEX_FILE):
+        return None
+    with open(INDEX_FILE, 'r') as f:
         data = json.load(f)
+    if 'columnar' in data:
+        data = decode_columnar_index(data)
+    return data
+
+
+def load_ledger():
+    """Load the content-hash ledger, or None if missing/outdated."""
+    if not os.path.exists(LEDGER_FILE):
+        return None
+    try:
+        with open(LEDGER_FILE, 'r') as f:
+            ledger = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    if ledger.get('version') != LEDGER_VERSION:
+        return None
+    return ledger
+
+
+def save_ledger(ledger):
+    write_json(LEDGER_FILE, ledger)
+
+
+def shard_files_on_disk():
+    """recipes-*.json shard files in DATA_DIR, whether or not the index lists them."""
+    return {
+        name for name in os.listdir(DATA_DIR)
+        if name.startswith('recipes-') and name.endswith('.json')
+        and name != os.path.basename(INDEX_FILE)
+    }
+
+
+def load_collection():
+    """
+    Load the full recipe collection.
+
+    Returns (recipes, meta, source). Prefers the monolithic recipes.json; when it
+    is absent the shards are reassembled in index order - listed shards first,
+    then any recipes-*.json the index doesn't list (as --incremental reads them).
+    """
+    if os.path.exists(RECIPES_FILE):
+        with open(RECIPES_FILE, 'r') as f:
+            data = json.load(f)
+        return data['recipes'], data['meta'], RECIPES_FILE
+
+    index_data = load_index()
+    if index_data is None:
+        raise FileNotFoundError(f"Neither {RECIPES_FILE} nor {INDEX_FILE} exists")
+
+    position = {r['id']: i for i, r in enumerate(index_data.get('recipes', []))}
+    listed = [shard['file'] for shard in index_data.get('shards', [])]
+    unlisted = sorted(shard_files_on_disk() - set(listed))
+    recipes = []
+    seen = set()
+    for shard_file in listed + unlisted:
+        shard_path = os.path.join(DATA_DIR, shard_file)
+        if not os.path.exists(shard_path):
+            continue
+        with open(shard_path, 'r') as f:
+            shard_recipes = json.load(f).get('recipes', [])
+        # A recipe in two shards (e.g. copied by hand) is kept once
+        for r in shard_recipes:
+            if r.get('id') not in seen:
+                seen.add(r.get('id'))
+                recipes.append(r)
+
+    # Keep index order; recipes missing from the index go last
+    recipes.sort(key=lambda r: position.get(r.get('id'), len(position)))
 
-    recipes = data['recipes']
-    meta = data['meta']
+    meta = {k: v for k, v in index_data.get('meta', {}).items()
+            if k not in ('sharded', 'shard_strategy', 'shard_count', 'shard_plan')}
+    return recipes, meta, 'shards'
+
+
+def build_index_data(meta, shards, index_recipes, plan=None):
+    """Assemble the recipes-index.json structure."""
+    meta = {
+        **meta,
+        'total_recipes': len(index_recipes),
+        'sharded': True,
+        'shard_strategy': 'by_size' if plan is not None else 'by_category',
+        'shard_count': len(shards)
+    }
+    if plan is not None:
+        meta['shard_plan'] = plan
+    return {
+        'meta': meta,
+        'shards': shards,
+        'recipes': index_recipes
+    }
+
+
+def create_shards(index_format=None, strategy=None, budget=None):
+    recipes, meta, source = load_collection()
+
+    # Shard files this rebuild may replace: everything the last build wrote, plus
+    # any unlisted shard load_collection() just read. Other files are left alone.
+    previous_index = load_index() or {}
+    replaceable = {shard['file'] for shard in previous_index.get('shards', [])}
+    replaceable |= set((load_ledger() or {}).get('shards', {}))
+    if source == 'shards':
+        replaceable |= shard_files_on_disk()
+
+    # Index layout and shard strategy persist between runs unless overridden
+    previous_meta = previous_index.get('meta', {})
+    index_format = index_format or previous_meta.get('index_format') or 'objects'
+    if index_format == 'columnar':
+        meta['index_format'] = 'columnar'
+    else:
+        meta.pop('index_format', None)
+    strategy = strategy or previous_meta.get('shard_strategy') or 'by_category'
+    plan = None
+    if strategy == 'by_size':
+        budget = budget or (previous_meta.get('shard_plan') or {}).get('budget') or DEFAULT_SHARD_BUDGET
+        plan = plan_shards(recipes, budget)
+    print(f"Source: {source} ({len(recipes)} recipes)")
 
     # Group by category (with sanitization check)
     by_category = {}
@@ -49,73 +475,270 @@ def create_shards():
         print("  Consider normalizing these in recipes.json\n")
 
     # Create index with minimal metadata for browsing/search
-    index_recipes = []
-    for r in recipes:
-        index_recipes.append({
-            'id': r.get('id'),
-            'title': r.get('title'),
-            'category': sanitize_category(r.get('category', 'uncategorized')),  # Sanitized for shard lookup
-            'tags': r.get('tags', []),
-            'collection': r.get('collection'),
-            'description': (r.get('description', '') or '')[:100],
-            'servings_yield': r.get('servings_yield', ''),
-            'total_time': r.get('total_time', '') or r.get('cook_time', ''),
-            # Include attribution for search
-            'attribution': r.get('attribution', ''),
-            # Include variant info for filtering
-            'variant_of': r.get('variant_of'),
-            'canonical_id': r.get('canonical_id'),
-        })
-
-    # Build shard manifest (categories are already sanitized)
-    shards = [
-        {
-            'category': cat,  # Already sanitized
-            'file': f'recipes-{cat}.json',
-            'count': len(recs)
-        }
-        for cat, recs in sorted(by_category.items())
-    ]
-
-    # Write index
-    index_data = {
-        'meta': {
-            **meta,
-            'sharded': True,
-            'shard_strategy': 'by_category',
-            'shard_count': len(shards)
-        },
-        'shards': shards,
-        'recipes': index_recipes
-    }
+    index_recipes = [index_entry_for(r, plan) for r in recipes]
+
+    # Group into shard files (categories are already sanitized)
+    if plan is None:
+        by_shard = {f'recipes-{cat}.json': recs for cat, recs in by_category.items()}
+    else:
+        by_shard = {}
+        for r in recipes:
+            by_shard.setdefault(shard_file_for(r, plan), []).append(r)
 
-    with open('data/recipes-index.json', 'w') as f:
-        json.dump(index_data, f, indent=2)
+    # Build shard manifest
+    shards = sorted((manifest_entry(f, recs, plan) for f, recs in by_shard.items()),
+                    key=manifest_sort_key)
+
+    # Write index (and the search index over it)
+    write_index(build_index_data(meta, shards, index_recipes, plan))
 
     print(f"Created recipes-index.json with {len(index_recipes)} recipe summaries")
+    print("Created search-index.json")
+
+    # Write shards
+    ledger = {'version': LEDGER_VERSION, 'recipes': {}, 'shards': {}}
+    for shard_file, shard_recipes in by_shard.items():
+        filename = os.path.join(DATA_DIR, shard_file)
+        write_json(filename, shard_data_for(shard_file, shard_recipes, plan))
 
-    # Write category shards
-    for cat, cat_recipes in by_category.items():
-        shard_data = {
-            'meta': {
-                'category': cat,
-                'count': len(cat_recipes),
-                'parent_collection': 'mommom'
-            },
-            'recipes': cat_recipes
-        }
+        for r in shard_recipes:
+            ledger['recipes'][r.get('id')] = {'hash': recipe_hash(r), 'shard': shard_file}
+        ledger['shards'][shard_file] = file_stat(filename)
 
-        filename = f'data/recipes-{cat}.json'
-        with open(filename, 'w') as f:
-            json.dump(shard_data, f, indent=2)
+        print(f"Created data/{shard_file} with {len(shard_recipes)} recipes")
 
-        print(f"Created {filename} with {len(cat_recipes)} recipes")
+    # Drop shard files left over from a previous plan or a vanished category
+    for name in sorted((replaceable & shard_files_on_disk()) - set(by_shard)):
+        os.remove(os.path.join(DATA_DIR, name))
+        print(f"Removed stale data/{name}")
+
+    save_ledger(ledger)
 
     print(f"\n✓ Created {len(shards)} shards from {len(recipes)} recipes")
     print(f"✓ Index file: data/recipes-index.json")
-    print(f"✓ Shard files: data/recipes-{{category}}.json")
-    print(f"\nFallback: Keep data/recipes.json for backward compatibility")
+    print("✓ Search index: data/search-index.json")
+    if plan is None:
+        print(f"✓ Shard files: data/recipes-{{category}}.json")
+    else:
+        print(f"✓ Shard files: by_size, budget {plan['budget']:,} bytes")
+    print("✓ Ledger: data/shard_ledger.json")
+    if source == RECIPES_FILE:
+        print(f"\nFallback: Keep data/recipes.json for backward compatibility")
+
+
+def patch_shards(upserts, removals, index_data, ledger, loaded_shards=None):
+    """
+    Apply recipe upserts/removals to the shard files and patch the index in place.
+
+    Args:
+        upserts: {recipe_id: recipe} - new or possibly-changed recipes
+        removals: set of recipe ids to drop
+        index_data: loaded recipes-index.json structure (modified in place)
+        ledger: loaded shard ledger (modified in place)
+        loaded_shards: {shard_file: shard data} already read from disk, if any
+
+    Only shards whose member list actually changes are rewritten. Returns
+    (shard files written, number of recipes added/changed/removed).
+    """
+    loaded_shards = dict(loaded_shards or {})
+    plan = index_data['meta'].get('shard_plan')
+    ledger_recipes = ledger['recipes']
+    entries = index_data['recipes']
+    position = {e['id']: i for i, e in enumerate(entries)}
+
+    def previous(recipe_id):
+        # Ledger first; fall back to the index entry's category (no hash known)
+        if recipe_id in ledger_recipes:
+            return ledger_recipes[recipe_id]
+        if recipe_id in position:
+            return {'hash': None, 'shard': shard_file_for(entries[position[recipe_id]], plan)}
+        return None
+
+    changed = {}      # recipe_id -> (recipe, target shard, hash)
+    dirty = set()
+    for recipe_id, recipe in upserts.items():
+        target = shard_file_for(recipe, plan)
+        new_hash = recipe_hash(recipe)
+        old = previous(recipe_id)
+        if old and old['hash'] == new_hash and old['shard'] == target:
+            continue
+        changed[recipe_id] = (recipe, target, new_hash)
+        dirty.add(target)
+        if old and old['shard'] != target:
+            dirty.add(old['shard'])
+
+    removed = set()
+    for recipe_id in removals:
+        old = previous(recipe_id)
+        if old and recipe_id not in changed:
+            dirty.add(old['shard'])
+            removed.add(recipe_id)
+
+    if not changed and not removed:
+        return [], 0
+
+    written = []
+    counts = {}
+    for shard_file in sorted(dirty):
+        shard_path = os.path.join(DATA_DIR, shard_file)
+        if shard_file not in loaded_shards:
+            if os.path.exists(shard_path):
+                with open(shard_path, 'r') as f:
+                    loaded_shards[shard_file] = json.load(f)
+            else:
+                loaded_shards[shard_file] = None
+        existing = loaded_shards[shard_file]
+        old_members = existing.get('recipes', []) if existing else []
+
+        members = []
+        seen = set()
+        for r in old_members:
+            rid = r.get('id')
+            if rid in removed or rid in seen:
+                continue
+            if rid in changed:
+                recipe, target, _ = changed[rid]
+                if target != shard_file:
+                    continue
+                r = recipe
+            members.append(r)
+            seen.add(rid)
+        for rid, (recipe, target, _) in changed.items():
+            if target == shard_file and rid not in seen:
+                members.append(recipe)
+                seen.add(rid)
+
+        counts[shard_file] = members
+
+        if not members:
+            if os.path.exists(shard_path):
+                os.remove(shard_path)
+                written.append(shard_file)
+            ledger['shards'].pop(shard_file, None)
+            continue
+
+        new_data = shard_data_for(shard_file, members, plan)
+        if new_data != existing:
+            write_json(shard_path, new_data)
+            written.append(shard_file)
+        ledger['shards'][shard_file] = file_stat(shard_path)
+
+    # Patch index entries in place (preserving order, new recipes appended)
+    for rid, (recipe, _, _) in changed.items():
+        entry = index_entry_for(recipe, plan)
+        if rid in position:
+            entries[position[rid]] = entry
+        else:
+            position[rid] = len(entries)
+            entries.append(entry)
+    if removed:
+        index_data['recipes'] = entries = [e for e in entries if e['id'] not in removed]
+
+    # Patch shard manifest counts
+    manifest = {s['file']: s for s in index_data.get('shards', [])}
+    for shard_file, members in counts.items():
+        if not members:
+            manifest.pop(shard_file, None)
+        else:
+            manifest[shard_file] = manifest_entry(shard_file, members, plan)
+    index_data['shards'] = sorted(manifest.values(), key=manifest_sort_key)
+    index_data['meta']['total_recipes'] = len(entries)
+    index_data['meta']['shard_count'] = len(index_data['shards'])
+    write_index(index_data)
+
+    # Update ledger
+    for rid, (_, target, new_hash) in changed.items():
+        ledger_recipes[rid] = {'hash': new_hash, 'shard': target}
+    for rid in removed:
+        ledger_recipes.pop(rid, None)
+
+    return written, len(changed) + len(removed)
+
+
+def create_shards_incremental():
+    """Rewrite only the shards whose members changed since the last build."""
+    ledger = load_ledger()
+    index_data = load_index()
+    if ledger is None or index_data is None:
+        print("No shard ledger found - running full rebuild")
+        create_shards()
+        return
+
+    loaded_shards = {}
+    if os.path.exists(RECIPES_FILE):
+        with open(RECIPES_FILE, 'r') as f:
+            recipes = json.load(f)['recipes']
+        upserts = {r['id']: r for r in recipes}
+        removals = set(ledger['recipes']) - set(upserts)
+        print(f"Source: data/recipes.json ({len(recipes)} recipes)")
+    else:
+        # Shards are the source: only re-read shard files whose stat changed
+        shard_files = {s['file'] for s in index_data.get('shards', [])}
+        shard_files |= set(ledger['shards'])
+        shard_files |= shard_files_on_disk()
+        upserts = {}
+        removals = set()
+        for shard_file in sorted(shard_files):
+            shard_path = os.path.join(DATA_DIR, shard_file)
+            if not os.path.exists(shard_path):
+                removals |= {rid for rid, e in ledger['recipes'].items() if e['shard'] == shard_file}
+                continue
+            if ledger['shards'].get(shard_file) == file_stat(shard_path):
+                continue
+            with open(shard_path, 'r') as f:
+                data = json.load(f)
+            loaded_shards[shard_file] = data
+            present = set()
+            for r in data.get('recipes', []):
+                upserts[r['id']] = r
+                present.add(r['id'])
+            removals |= {rid for rid, e in ledger['recipes'].items()
+                         if e['shard'] == shard_file and rid not in present}
+            ledger['shards'][shard_file] = file_stat(shard_path)
+        removals -= set(upserts)
+        print(f"Source: shards ({len(loaded_shards)} changed on disk)")
+
+    written, n_changed = patch_shards(upserts, removals, index_data, ledger, loaded_shards)
+    save_ledger(ledger)
+
+    for shard_file in written:
+        print(f"Updated data/{shard_file}")
+    if n_changed:
+        print(f"\n✓ {n_changed} recipe(s) changed; rewrote {len(written)} shard(s), "
+              f"index patched ({index_data['meta']['total_recipes']} recipes)")
+    else:
+        print("✓ Shards are up to date")
+
 
 if __name__ == '__main__':
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    create_shards()
+
+    parser = argparse.ArgumentParser(description="Build recipe shards and the browse index")
+    parser.add_argument(
+        '--incremental', '-i',
+        action='store_true',
+        help="Only rewrite shards whose recipes changed (uses data/shard_ledger.json)"
+    )
+    parser.add_argument(
+        '--strategy',
+        choices=SHARD_STRATEGIES,
+        help="Shard layout (full rebuild; kept by later runs). 'by_size' packs small "
+             "categories and splits large ones to stay near --shard-budget"
+    )
+    parser.add_argument(
+        '--shard-budget',
+        type=int,
+        help=f"Target bytes per shard for by_size (default {DEFAULT_SHARD_BUDGET})"
+    )
+    parser.add_argument(
+        '--index-format',
+        choices=INDEX_FORMATS,
+        help="recipes-index.json layout (full rebuild; kept by later runs). "
+             "'columnar' is smaller and faster for the site to parse"
+    )
+    args = parser.parse_args()
+
+    if args.incremental and not (args.index_format or args.strategy or args.shard_budget):
+        create_shards_incremental()
+    else:
+        create_shards(args.index_format, args.strategy, args.shard_budget)
@@ -10,6 +10,8 @@ import json
 import re
 from pathlib import Path
 
+from ingredient_line import is_normalized, parse_ingredient
+
 # Approximate nutrition per standard unit (calories, fat_g, protein_g, carbs_g)
 # Sources: USDA FoodData Central approximations
 NUTRITION_DB = {
@@ -979,33 +981,92 @@ UNIT_CONVERSIONS = {
     'envelope': 1.0,
 }
 
-def parse_fraction(s):
-    """Parse a fraction string to float."""
-    s = s.strip()
-    if not s:
-        return None
+class IngredientMatcher:
+    """
+    Aho-Corasick automaton over ingredient names.
+
+    Every pattern has a rank (lower wins); one pass over the item string finds
+    the best-ranked pattern occurring anywhere in it. Built once at import.
+    """
+
+    def __init__(self, patterns):
+        """patterns: iterable of (pattern, result) in priority order."""
+        self.goto = [{}]        # node -> {char: node}
+        self.fail = [0]
+        self.best = [None]      # node -> (rank, result) of best pattern ending here
+        for rank, (pattern, result) in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                node = nxt
+            if self.best[node] is None:
+                self.best[node] = (rank, result)
+
+        # Breadth-first: failure links, and fold each node's best with its failure chain
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                queue.append(child)
+            inherited = self.best[self.fail[node]]
+            if inherited is not None and (self.best[node] is None or inherited[0] < self.best[node][0]):
+                self.best[node] = inherited
+
+    def search(self, text):
+        """Return the result of the best-ranked pattern contained in text, or None."""
+        goto, fail, best = self.goto, self.fail, self.best
+        found = best[0]
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best[node]
+            if hit is not None and (found is None or hit[0] < found[0]):
+                found = hit
+        return found[1] if found is not None else None
+
+
+def build_ingredient_matcher():
+    """Longest alias first, then longest DB key (same priority as the old sorted scans)."""
+    aliases = sorted(INGREDIENT_ALIASES.items(), key=lambda x: len(x[0]), reverse=True)
+    keys = sorted(NUTRITION_DB.keys(), key=len, reverse=True)
+    return IngredientMatcher(aliases + [(key, key) for key in keys])
+
+
+INGREDIENT_MATCHER = build_ingredient_matcher()
 
-    # Handle mixed fractions like "1 1/2"
-    parts = s.split()
-    total = 0
-    for part in parts:
-        if '/' in part:
-            try:
-                num, denom = part.split('/')
-                total += float(num) / float(denom)
-            except:
-                return None
-        else:
-            try:
-                total += float(part)
-            except:
-                return None
-    return total if total > 0 else None
 
 def find_ingredient_match(item):
     """Find the best match for an ingredient in our database."""
     item_lower = item.lower().strip()
 
+    # Direct match in NUTRITION_DB
+    if item_lower in NUTRITION_DB:
+        return item_lower
+
+    # Check aliases first (exact match)
+    if item_lower in INGREDIENT_ALIASES:
+        return INGREDIENT_ALIASES[item_lower]
+
+    # Longest contained alias, else longest contained DB key - one pass
+    return INGREDIENT_MATCHER.search(item_lower)
+
+
+def find_ingredient_match_scan(item):
+    """Reference matcher: sorted substring scans (kept for benchmarking)."""
+    item_lower = item.lower().strip()
+
     # Direct match in NUTRITION_DB
     if item_lower in NUTRITION_DB:
         return item_lower
@@ -1026,6 +1087,34 @@ def find_ingredient_match(item):
 
     return None
 
+
+def benchmark_matchers(repeat=3):
+    """Time the scan and automaton matchers over every ingredient line in the shards."""
+    import time
+    from recipe_store import RecipeStore
+
+    items = [str(ing.get('item', '')) for recipe in RecipeStore().iter_recipes()
+             for ing in recipe.get('ingredients', [])]
+    print(f"Ingredient lines: {len(items)}")
+
+    mismatches = [i for i in items if find_ingredient_match(i) != find_ingredient_match_scan(i)]
+    print(f"Mismatches: {len(mismatches)}")
+
+    results = {}
+    for name, matcher in (('scan', find_ingredient_match_scan), ('automaton', find_ingredient_match)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items:
+                matcher(item)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+        print(f"  {name:10} {best:8.3f}s  ({best / max(len(items), 1) * 1e6:.1f} us/line)")
+    print(f"  Speedup: {results['scan'] / results['automaton']:.1f}x")
+    return results
+
+
 def estimate_servings(recipe):
     """Try to estimate servings from yield field."""
     servings = recipe.get('servings_yield', '')
@@ -1054,6 +1143,7 @@ def calculate_recipe_nutrition(recipe):
     matched = 0
     missing = []
     assumptions = []
+    normalized = is_normalized(recipe)
 
     for ing in ingredients:
         item = ing.get('item', '')
@@ -1072,25 +1162,24 @@ def calculate_recipe_nutrition(recipe):
             continue
 
         # Parse quantity
-        qty = parse_fraction(str(quantity))
+        if normalized:
+            low, high = ing['qty_low'], ing['qty_high']
+            qty = (low + high) / 2 if low is not None else None
+        else:
+            qty = parse_ingredient(quantity, unit, item).quantity
         if qty is None:
-            # Try to extract number from quantity string
-            match_num = re.search(r'[\d./]+', str(quantity))
-            if match_num:
-                qty = parse_fraction(match_num.group())
-            else:
-                # Try to infer from DEFAULT_QUANTITIES
-                item_lower = item.lower()
-                default_found = False
-                for default_item, default_qty in DEFAULT_QUANTITIES.items():
-                    if default_item in item_lower or item_lower in default_item:
-                        qty = default_qty
-                        assumptions.append(f"Inferred {qty} for {item} (standard quantity)")
-                        default_found = True
-                        break
-                if not default_found:
-                    qty = 1  # Fallback assumption
-                    assumptions.append(f"Assumed 1 unit for {item}")
+            # Try to infer from DEFAULT_QUANTITIES
+            item_lower = item.lower()
+            default_found = False
+            for default_item, default_qty in DEFAULT_QUANTITIES.items():
+                if default_item in item_lower or item_lower in default_item:
+                    qty = default_qty
+                    assumptions.append(f"Inferred {qty} for {item} (standard quantity)")
+                    default_found = True
+                    break
+            if not default_found:
+                qty = 1  # Fallback assumption
+                assumptions.append(f"Assumed 1 unit for {item}")
 
         # Get nutrition data
         nut_data = NUTRITION_DB[match]
@@ -1237,6 +1326,10 @@ def process_recipes(dry_run=False):
 if __name__ == '__main__':
     import sys
 
+    if '--benchmark' in sys.argv:
+        benchmark_matchers()
+        sys.exit(0)
+
     dry_run = '--dry-run' in sys.argv
 
     if dry_run:
@@ -13,6 +13,13 @@ Usage:
     python scripts/image_safeguards.py status           # Show processing status
     python scripts/image_safeguards.py next             # Get next processable image
     python scripts/image_safeguards.py mark <file> <status>  # Mark image status
+    python scripts/image_safeguards.py compact          # Fold journal into manifest
+    python scripts/image_safeguards.py --sqlite <command>     # Use data/manifests.sqlite (manifest_db.py)
+
+Status changes and session positions are appended to
+image_manifest.journal.jsonl (see manifest_journal.py) instead of rewriting
+the whole manifest; the journal is compacted into image_manifest.json
+periodically and after every validate.
 
 The manifest file (image_manifest.json) can be used by AI assistants to:
 - Skip known broken images
@@ -26,7 +33,7 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
 
 try:
     from PIL import Image, ImageFile
@@ -35,6 +42,7 @@ try:
 except ImportError:
     PILLOW_AVAILABLE = False
 
+from manifest_journal import ManifestJournal, move_stats
 
 # Configuration
 MANIFEST_FILE = "image_manifest.json"
@@ -47,6 +55,12 @@ COLLECTIONS = {
     "mommom": {"path": "", "prefix": "Moms Recipes"}
 }
 
+# Header-only integrity checks: formats with a fixed end-of-file marker
+JPEG_EOI = b'\xff\xd9'                  # End Of Image marker
+PNG_IEND = b'IEND\xaeB`\x82'            # IEND chunk type + CRC
+TRAILER_FORMATS = {"JPEG": JPEG_EOI, "MPO": JPEG_EOI, "PNG": PNG_IEND}
+TRAILER_BYTES = 64
+
 # Image statuses
 STATUS_UNVALIDATED = "unvalidated"
 STATUS_VALID = "valid"
@@ -57,6 +71,66 @@ STATUS_RECOVERABLE = "recoverable"     # Broken but may be salvageable
 STATUS_PROCESSED = "processed"         # Recipe extraction complete
 STATUS_SKIPPED = "skipped"             # Not a recipe (household hints, etc.)
 
+VALIDATED_STATUSES = [STATUS_VALID, STATUS_RESIZED, STATUS_PROCESSED, STATUS_SKIPPED]
+COUNTED_STATUSES = [STATUS_BROKEN, STATUS_OVERSIZED, STATUS_PROCESSED, STATUS_SKIPPED]
+NEXT_STATUSES = [STATUS_VALID, STATUS_RESIZED, STATUS_OVERSIZED]   # Still to process
+
+
+def stat_keys(status: str) -> List[str]:
+    """Stats counters (besides total) that an image with `status` counts towards."""
+    keys = []
+    if status in VALIDATED_STATUSES:
+        keys.append("validated")
+    if status in COUNTED_STATUSES:
+        keys.append(status)
+    return keys
+
+
+def has_complete_trailer(image_path: Path, image_format: Optional[str]) -> Optional[bool]:
+    """
+    Cheap truncation check: does the file end with its format's end marker?
+
+    Returns True/False for JPEG (EOI) and PNG (IEND), None for other formats.
+    Zero padding after the JPEG EOI marker is tolerated.
+    """
+    marker = TRAILER_FORMATS.get(image_format)
+    if marker is None:
+        return None
+
+    with open(image_path, 'rb') as f:
+        f.seek(0, 2)
+        f.seek(max(0, f.tell() - TRAILER_BYTES))
+        tail = f.read()
+
+    if marker == JPEG_EOI:
+        tail = tail.rstrip(b'\x00')
+    return tail.endswith(marker)
+
+
+def check_image_integrity(img, image_path: Path):
+    """
+    Detect truncation without decoding the whole frame when possible.
+
+    `img` is an opened (header-only) PIL image. JPEG/PNG files that end with
+    their end marker are accepted as-is; if the marker is missing the image is
+    decoded with truncated-image tolerance off, so a genuinely truncated file
+    raises OSError("image file is truncated ...") while files with trailing
+    vendor data still pass. Other formats are fully decoded as before.
+    """
+    complete = has_complete_trailer(image_path, img.format)
+    if complete:
+        return
+    if complete is None:
+        img.load()
+        return
+
+    tolerant = ImageFile.LOAD_TRUNCATED_IMAGES
+    ImageFile.LOAD_TRUNCATED_IMAGES = False
+    try:
+        img.load()
+    finally:
+        ImageFile.LOAD_TRUNCATED_IMAGES = tolerant
+
 
 class ImageManifest:
     """Manages the image processing manifest for session resilience."""
@@ -64,7 +138,20 @@ class ImageManifest:
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
         self.manifest_path = data_dir / MANIFEST_FILE
+        self.journal = ManifestJournal(self.manifest_path, "images")
         self.manifest = self._load_manifest()
+        self.journal.replay(self.manifest)
+        self._update_stats()
+        self._reindex()
+
+    def _reindex(self):
+        """Rebuild the filename -> key lookup and next-image cursors."""
+        self._keys = list(self.manifest["images"])
+        self._position = {key: i for i, key in enumerate(self._keys)}
+        self._by_filename = {}
+        for key, data in self.manifest["images"].items():
+            self._by_filename.setdefault(data.get("filename"), key)
+        self._next_from = {}   # collection (or None) -> first index worth scanning
 
     def _load_manifest(self) -> Dict:
         """Load existing manifest or create new one."""
@@ -98,15 +185,36 @@ class ImageManifest:
         }
 
     def save(self):
-        """Save manifest to disk."""
+        """Save the full manifest to disk (compacts the journal)."""
         self.manifest["last_updated"] = datetime.now().isoformat()
         self._update_stats()
+        self.journal.write_snapshot(self.manifest)
+        self._reindex()
+
+    def compact(self):
+        """Fold journaled changes into image_manifest.json."""
+        self._update_stats()
+        self.journal.write_snapshot(self.manifest)
+
+    def _record(self, key: str, fields: Dict):
+        """Journal an update to one image and apply it, keeping stats current."""
+        old_status = self.manifest["images"][key].get("status", STATUS_UNVALIDATED)
+        entry = {"op": "update", "key": key, "fields": fields, "at": datetime.now().isoformat()}
+        self.journal.append(entry)
+        self.journal.apply(self.manifest, entry)
+
+        new_status = self.manifest["images"][key].get("status", STATUS_UNVALIDATED)
+        move_stats(self.manifest["stats"], stat_keys(old_status), stat_keys(new_status))
+        if new_status in NEXT_STATUSES:
+            position = self._position[key]
+            for collection, start in self._next_from.items():
+                self._next_from[collection] = min(start, position)
 
-        with open(self.manifest_path, 'w') as f:
-            json.dump(self.manifest, f, indent=2)
+        if self.journal.needs_compaction():
+            self.compact()
 
     def _update_stats(self):
-        """Update summary statistics."""
+        """Recompute summary statistics from scratch."""
         stats = {
             "total": 0,
             "validated": 0,
@@ -118,18 +226,8 @@ class ImageManifest:
 
         for img_data in self.manifest["images"].values():
             stats["total"] += 1
-            status = img_data.get("status", STATUS_UNVALIDATED)
-
-            if status in [STATUS_VALID, STATUS_RESIZED, STATUS_PROCESSED, STATUS_SKIPPED]:
-                stats["validated"] += 1
-            if status == STATUS_BROKEN:
-                stats["broken"] += 1
-            if status == STATUS_OVERSIZED:
-                stats["oversized"] += 1
-            if status == STATUS_PROCESSED:
-                stats["processed"] += 1
-            if status == STATUS_SKIPPED:
-                stats["skipped"] += 1
+            for key in stat_keys(img_data.get("status", STATUS_UNVALIDATED)):
+                stats[key] += 1
 
         self.manifest["stats"] = stats
 
@@ -164,7 +262,8 @@ class ImageManifest:
 
         try:
             with Image.open(image_path) as img:
-                img.load()  # Actually load to detect truncation
+                # Header gives dimensions; trailer check detects truncation
+                check_image_integrity(img, image_path)
                 result["width"] = img.width
                 result["height"] = img.height
 
@@ -243,14 +342,20 @@ class ImageManifest:
 
         self.save()
 
-    def get_processable_images(self, collection_id: Optional[str] = None) -> List[Dict]:
-        """Get list of images that can be processed (not broken)."""
-        result = []
-
+    def iter_images(self, statuses: Optional[List[str]] = None,
+                    collection_id: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """(key, data) for images in manifest order, optionally filtered."""
         for key, data in self.manifest["images"].items():
             if collection_id and data.get("collection") != collection_id:
                 continue
+            if statuses is None or data.get("status", STATUS_UNVALIDATED) in statuses:
+                yield key, data
 
+    def get_processable_images(self, collection_id: Optional[str] = None) -> List[Dict]:
+        """Get list of images that can be processed (not broken)."""
+        result = []
+
+        for key, data in self.iter_images(NEXT_STATUSES, collection_id):
             status = data.get("status", STATUS_UNVALIDATED)
             # Include valid, oversized (if processed folder exists), and resized
             if status in [STATUS_VALID, STATUS_RESIZED]:
@@ -278,47 +383,75 @@ class ImageManifest:
         """Get list of broken images that need attention."""
         return [
             {"key": key, **data}
-            for key, data in self.manifest["images"].items()
-            if data.get("status") in [STATUS_BROKEN, STATUS_RECOVERABLE]
+            for key, data in self.iter_images([STATUS_BROKEN, STATUS_RECOVERABLE])
         ]
 
     def get_next_unprocessed(self, collection_id: Optional[str] = None) -> Optional[Dict]:
-        """Get the next image that hasn't been processed yet."""
-        for key, data in self.manifest["images"].items():
+        """
+        Get the next image that hasn't been processed yet.
+
+        Resumes scanning where the previous call stopped; marking an image
+        back to a to-do status moves the cursor back to it.
+        """
+        images = self.manifest["images"]
+        start = self._next_from.get(collection_id, 0)
+        for i in range(start, len(self._keys)):
+            key = self._keys[i]
+            data = images[key]
             if collection_id and data.get("collection") != collection_id:
                 continue
 
             status = data.get("status", STATUS_UNVALIDATED)
-            if status in [STATUS_VALID, STATUS_RESIZED, STATUS_OVERSIZED]:
+            if status in NEXT_STATUSES:
+                self._next_from[collection_id] = i
                 return {"key": key, **data}
 
+        self._next_from[collection_id] = len(self._keys)
+        return None
+
+    def find_key(self, filename: str) -> Optional[str]:
+        """Manifest key for a filename (or key suffix), or None."""
+        if filename in self.manifest["images"]:
+            return filename
+        key = self._by_filename.get(filename)
+        if key is not None:
+            return key
+        for key in self._keys:
+            if key.endswith(filename):
+                return key
         return None
 
     def mark_status(self, filename: str, status: str, notes: str = ""):
         """Mark an image with a specific status."""
-        # Find the image by filename
-        for key, data in self.manifest["images"].items():
-            if data.get("filename") == filename or key.endswith(filename):
-                data["status"] = status
-                data["status_updated"] = datetime.now().isoformat()
-                if notes:
-                    data["notes"] = notes
-                self.save()
-                print(f"Marked {filename} as {status}")
-                return True
-
-        print(f"Image not found: {filename}")
-        return False
+        key = self.find_key(filename)
+        if key is None:
+            print(f"Image not found: {filename}")
+            return False
+
+        fields = {"status": status, "status_updated": datetime.now().isoformat()}
+        if notes:
+            fields["notes"] = notes
+        self._record(key, fields)
+        print(f"Marked {filename} as {status}")
+        return True
 
     def set_session_position(self, collection_id: str, index: int, last_file: str):
         """Save session position for resumable processing."""
-        self.manifest["session"] = {
-            "last_processed": last_file,
-            "processing_collection": collection_id,
-            "processing_index": index,
-            "saved_at": datetime.now().isoformat()
+        entry = {
+            "op": "set",
+            "field": "session",
+            "value": {
+                "last_processed": last_file,
+                "processing_collection": collection_id,
+                "processing_index": index,
+                "saved_at": datetime.now().isoformat()
+            },
+            "at": datetime.now().isoformat()
         }
-        self.save()
+        self.journal.append(entry)
+        self.journal.apply(self.manifest, entry)
+        if self.journal.needs_compaction():
+            self.compact()
 
     def get_session_position(self) -> Dict:
         """Get the saved session position."""
@@ -333,6 +466,8 @@ class ImageManifest:
         print("IMAGE MANIFEST STATUS")
         print("="*60)
         print(f"Last updated: {self.manifest.get('last_updated', 'Never')}")
+        if self.journal and self.journal.entries:
+            print(f"Journal: {self.journal.entries} change(s) not yet compacted")
         print(f"\nStatistics:")
         print(f"  Total images:    {stats.get('total', 0)}")
         print(f"  Validated:       {stats.get('validated', 0)}")
@@ -361,6 +496,10 @@ class ImageManifest:
 
 
 def main():
+    use_sqlite = "--sqlite" in sys.argv
+    if use_sqlite:
+        sys.argv.remove("--sqlite")
+
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
@@ -375,7 +514,11 @@ def main():
         print(f"ERROR: Data directory not found: {data_dir}")
         sys.exit(1)
 
-    manifest = ImageManifest(data_dir)
+    if use_sqlite:
+        from manifest_db import SQLiteImageManifest
+        manifest = SQLiteImageManifest(data_dir)
+    else:
+        manifest = ImageManifest(data_dir)
 
     if command == "validate":
         collection = sys.argv[2] if len(sys.argv) > 2 else None
@@ -408,6 +551,11 @@ def main():
         notes = sys.argv[4] if len(sys.argv) > 4 else ""
         manifest.mark_status(filename, status, notes)
 
+    elif command == "compact":
+        pending = manifest.journal.entries if manifest.journal else 0
+        manifest.compact()
+        print(f"Compacted {pending} journaled change(s) into {manifest.manifest_path.name}")
+
     elif command == "broken":
         broken = manifest.get_broken_images()
         if broken:
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Ingredient Index for MomMom's Kitchen (Standalone Collection)
+
+Answers "which recipes use X" and "what can I cook from my pantry" without
+loading every shard. Every ingredient line is mapped to a canonical name (the stored
+item_canonical field, or add_nutrition.normalize_ingredient_cached() for
+recipes not yet normalized), and each canonical ingredient
+gets a bitset of recipe ordinals (rows of recipes-index.json, the same
+ordinals search-index.json uses).
+
+Bitsets are Python ints in memory, so queries are a handful of bitwise ops:
+
+    all_of(names)            AND of the ingredients' bitsets
+    any_of(names)            OR of the ingredients' bitsets
+    missing_at_most(pantry, k)
+        recipes needing at most k ingredients outside the pantry. Per-recipe
+        ingredient counts are stored bit-sliced (one bitset per binary digit),
+        so "count - |pantry hits| <= k" is evaluated for every recipe at once
+        with a bit-sliced adder and comparator - cost grows with the pantry
+        size, not the corpus size.
+
+On disk (data/ingredient-index.json) each bitset is zlib-compressed and
+base64-encoded; `ids_digest` ties the file to the recipes-index.json row
+order it was built from.
+
+Usage:
+    python scripts/ingredient_index.py build
+    python scripts/ingredient_index.py all buttermilk cornmeal
+    python scripts/ingredient_index.py any molasses honey "2 c. buttermilk"
+    python scripts/ingredient_index.py pantry 1 flour sugar butter egg milk
+    python scripts/ingredient_index.py benchmark [--synthetic 100000]
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from create_shards import DATA_DIR, load_index
+from ingredient_line import is_normalized, parse_line
+
+INGREDIENT_INDEX_FILE = os.path.join(DATA_DIR, 'ingredient-index.json')
+INGREDIENT_INDEX_VERSION = 1
+
+# Treated as always on hand by missing_at_most() unless staples=False
+PANTRY_STAPLES = frozenset(['water', 'salt', 'pepper', 'ice'])
+
+
+# =============================================================================
+# Bitset encoding
+# =============================================================================
+
+def encode_bitset(bits: int) -> str:
+    """int bitset -> base64(zlib(little-endian bytes))."""
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    return base64.b64encode(zlib.compress(raw, 9)).decode('ascii')
+
+
+def decode_bitset(text: str) -> int:
+    return int.from_bytes(zlib.decompress(base64.b64decode(text)), 'little')
+
+
+def rows_to_bitset(rows: Iterable[int], size: int) -> int:
+    """Build a bitset from row numbers (via a bytearray: linear, not quadratic)."""
+    buf = bytearray((size + 7) // 8)
+    for row in rows:
+        buf[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def bit_rows(bits: int) -> List[int]:
+    """Set bit positions (recipe ordinals), ascending."""
+    rows = []
+    while bits:
+        low = bits & -bits
+        rows.append(low.bit_length() - 1)
+        bits ^= low
+    return rows
+
+
+def ids_digest(ids: Iterable[str]) -> str:
+    return hashlib.sha1('\n'.join(ids).encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# Bit-sliced arithmetic (one bitset per binary digit, all recipes in parallel)
+# =============================================================================
+
+def sliced_add(planes: List[int], bits: int) -> List[int]:
+    """Add 1 to every lane set in `bits` (ripple carry; modifies planes)."""
+    carry = bits
+    for i in range(len(planes)):
+        if not carry:
+            return planes
+        planes[i], carry = planes[i] ^ carry, planes[i] & carry
+    if carry:
+        planes.append(carry)
+    return planes
+
+
+def sliced_add_constant(planes: List[int], k: int, universe: int) -> List[int]:
+    """Add the constant k to every lane."""
+    planes = list(planes)
+    i = 0
+    while k:
+        if k & 1:
+            while len(planes) <= i:
+                planes.append(0)
+            # Add universe at digit i: ripple from plane i upward
+            carry = universe
+            j = i
+            while carry:
+                if j == len(planes):
+                    planes.append(0)
+                planes[j], carry = planes[j] ^ carry, planes[j] & carry
+                j += 1
+        k >>= 1
+        i += 1
+    return planes
+
+
+def sliced_ge(a: List[int], b: List[int], universe: int) -> int:
+    """Lanes where a >= b."""
+    width = max(len(a), len(b))
+    gt, eq = 0, universe
+    for i in reversed(range(width)):
+        ai = a[i] if i < len(a) else 0
+        bi = b[i] if i < len(b) else 0
+        gt |= eq & ai & ~bi
+        eq &= ~(ai ^ bi)
+    return (gt | eq) & universe
+
+
+def build_count_planes(counts: List[int]) -> List[int]:
+    """Bit-sliced planes for a list of per-lane counts."""
+    width = max(counts, default=0).bit_length()
+    return [rows_to_bitset((lane for lane, c in enumerate(counts) if c >> digit & 1), len(counts))
+            for digit in range(width)]
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+def recipe_ingredients(recipe: Dict) -> Set[str]:
+    """Distinct canonical ingredient names for one recipe."""
+    if is_normalized(recipe):
+        return {ing['item_canonical'] for ing in recipe.get('ingredients') or []
+                if isinstance(ing, dict) and ing['item_canonical']}
+
+    from add_nutrition import normalize_ingredient_cached
+
+    names = set()
+    for ing in recipe.get('ingredients') or []:
+        if isinstance(ing, dict):
+            name = normalize_ingredient_cached(ing.get('item', ''))
+            if name:
+                names.add(name)
+    return names
+
+
+class IngredientIndex:
+    """Bitset postings per canonical ingredient over recipe ordinals."""
+
+    def __init__(self, bitsets: Dict[str, int], count_planes: List[int], doc_count: int,
+                 ids: Optional[List[str]] = None):
+        self.bitsets = bitsets
+        self.count_planes = count_planes
+        self.doc_count = doc_count
+        self.universe = (1 << doc_count) - 1
+        self.ids = ids
+
+    @classmethod
+    def from_ingredient_sets(cls, ingredient_sets: List[Set[str]],
+                             ids: Optional[List[str]] = None) -> 'IngredientIndex':
+        postings = {}
+        for row, names in enumerate(ingredient_sets):
+            for name in names:
+                postings.setdefault(name, []).append(row)
+        size = len(ingredient_sets)
+        bitsets = {name: rows_to_bitset(rows, size) for name, rows in postings.items()}
+        counts = [len(names) for names in ingredient_sets]
+        return cls(bitsets, build_count_planes(counts), len(ingredient_sets), ids)
+
+    # -- Persistence -------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': INGREDIENT_INDEX_VERSION,
+            'doc_count': self.doc_count,
+            'ids_digest': ids_digest(self.ids) if self.ids is not None else None,
+            'count_planes': [encode_bitset(p) for p in self.count_planes],
+            'ingredients': {name: encode_bitset(bits) for name, bits in sorted(self.bitsets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, ids: Optional[List[str]] = None) -> 'IngredientIndex':
+        if data.get('version') != INGREDIENT_INDEX_VERSION:
+            raise ValueError(f"Unsupported ingredient index version: {data.get('version')}")
+        if ids is not None and data.get('ids_digest') != ids_digest(ids):
+            raise ValueError("ingredient-index.json is out of date with recipes-index.json "
+                             "(run scripts/ingredient_index.py build)")
+        bitsets = {name: decode_bitset(text) for name, text in data['ingredients'].items()}
+        planes = [decode_bitset(text) for text in data['count_planes']]
+        return cls(bitsets, planes, data['doc_count'], ids)
+
+    @classmethod
+    def load(cls, path: str = INGREDIENT_INDEX_FILE) -> 'IngredientIndex':
+        """Load the index, checked against the current recipes-index.json rows."""
+        index_data = load_index()
+        ids = [e['id'] for e in index_data['recipes']] if index_data else None
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f), ids)
+
+    # -- Queries -----------------------------------------------------------
+
+    def canonical(self, name: str) -> Optional[str]:
+        """
+        Map user input ("Eggs", "2 c. buttermilk") to an indexed name, or None.
+
+        parse_line() strips a leading amount and unit first. normalize_ingredient
+        is only a fallback for cleanup ("eggs" -> "egg"): its result must be an
+        indexed name whose words all appear in the input, so a nutrition-table
+        synonym ("sorghum" -> "rice") is reported as unknown, not substituted.
+        """
+        if name in self.bitsets:
+            return name
+        line = parse_line(name)
+        item = (line.item if line else name).strip().lower()
+        if item in self.bitsets:
+            return item
+        from add_nutrition import normalize_ingredient_cached
+        normalized = normalize_ingredient_cached(item)
+        if normalized in self.bitsets and all(word in item for word in normalized.split()):
+            return normalized
+        return None
+
+    def unknown(self, names: Iterable[str]) -> List[str]:
+        """The names canonical() can't map to an indexed ingredient."""
+        return [name for name in names if self.canonical(name) is None]
+
+    def bits_for(self, name: str) -> int:
+        canonical = self.canonical(name)
+        return self.bitsets.get(canonical, 0) if canonical else 0
+
+    def all_of(self, names: Iterable[str]) -> int:
+        """Recipes containing every ingredient."""
+        result = self.universe
+        for name in names:
+            result &= self.bits_for(name)
+            if not result:
+                break
+        return result
+
+    def any_of(self, names: Iterable[str]) -> int:
+        """Recipes containing at least one of the ingredients."""
+        result = 0
+        for name in names:
+            result |= self.bits_for(name)
+        return result
+
+    def missing_at_most(self, pantry: Iterable[str], k: int = 0, staples: bool = True) -> int:
+        """
+        Recipes whose ingredients are all in the pantry except at most k
+        (recipes with no ingredient list never match).
+
+        have = number of the recipe's ingredients found in the pantry, summed
+        bit-sliced over the pantry's bitsets; the answer is have + k >= count.
+        """
+        names = {self.canonical(n) for n in pantry} - {None}
+        if staples:
+            names |= PANTRY_STAPLES
+        have = []
+        for name in names:
+            bits = self.bitsets.get(name)
+            if bits:
+                sliced_add(have, bits)
+        have = sliced_add_constant(have, k, self.universe)
+        # Recipes without ingredients (tips, reference) have a count of zero
+        has_ingredients = 0
+        for plane in self.count_planes:
+            has_ingredients |= plane
+        return sliced_ge(have, self.count_planes, self.universe) & has_ingredients
+
+    def rows(self, bits: int) -> List[int]:
+        return bit_rows(bits)
+
+    def ids_for(self, bits: int) -> List[str]:
+        return [self.ids[row] for row in bit_rows(bits)]
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def build_ingredient_index() -> IngredientIndex:
+    """Read every shard and build the index over recipes-index.json rows."""
+    index_data = load_index()
+    if index_data is None:
+        raise FileNotFoundError("recipes-index.json not found - run scripts/create_shards.py first")
+
+    by_id = {}
+    for shard in index_data.get('shards', []):
+        with open(os.path.join(DATA_DIR, shard['file']), 'r') as f:
+            for recipe in json.load(f).get('recipes', []):
+                by_id[recipe.get('id')] = recipe
+
+    ids = [e['id'] for e in index_data['recipes']]
+    sets = [recipe_ingredients(by_id[i]) if i in by_id else set() for i in ids]
+    return IngredientIndex.from_ingredient_sets(sets, ids)
+
+
+def save_ingredient_index(index: IngredientIndex, path: str = INGREDIENT_INDEX_FILE):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index.to_dict(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def synthetic_ingredient_sets(index: IngredientIndex, n: int, seed: int = 42) -> List[Set[str]]:
+    """n recipes with ingredient sets drawn from the real corpus distribution."""
+    rng = random.Random(seed)
+    names = sorted(index.bitsets)
+    weights = [index.bitsets[name].bit_count() for name in names]
+    counts = [0] * index.doc_count
+    for plane_digit, plane in enumerate(index.count_planes):
+        for row in bit_rows(plane):
+            counts[row] += 1 << plane_digit
+    counts = [c for c in counts if c] or [8]
+    return [set(rng.choices(names, weights, k=rng.choice(counts))) for _ in range(n)]
+
+
+def time_query(fn, repeat: int = 200) -> float:
+    """Best-of timing in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark(index: IngredientIndex, label: str):
+    common = sorted(index.bitsets, key=lambda n: -index.bitsets[n].bit_count())
+    pantry = common[:15]
+    queries = [
+        ('all_of(2 common)', lambda: index.all_of(common[:2])),
+        ('all_of(4 mixed)', lambda: index.all_of([common[0], common[5], common[20], common[60]])),
+        ('any_of(5)', lambda: index.any_of(common[10:15])),
+        ('missing_at_most(15, k=0)', lambda: index.missing_at_most(pantry, 0)),
+        ('missing_at_most(15, k=2)', lambda: index.missing_at_most(pantry, 2)),
+        ('missing_at_most(30, k=1)', lambda: index.missing_at_most(common[:30], 1)),
+    ]
+    print(f"\n{label}: {index.doc_count:,} recipes, {len(index.bitsets):,} ingredients")
+    for name, fn in queries:
+        hits = fn().bit_count()
+        print(f"  {name:<28} {time_query(fn):8.3f} ms   ({hits:,} recipes)")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingredient inverted index (bitset postings)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help="Build data/ingredient-index.json from the shards")
+    for name, help_text in (('all', "Recipes using all of the ingredients"),
+                            ('any', "Recipes using any of the ingredients")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('ingredients', nargs='+')
+    p = sub.add_parser('pantry', help="Recipes missing at most K ingredients from a pantry")
+    p.add_argument('k', type=int)
+    p.add_argument('ingredients', nargs='+')
+    p.add_argument('--no-staples', action='store_true',
+                   help=f"Don't assume {', '.join(sorted(PANTRY_STAPLES))} are on hand")
+    p = sub.add_parser('benchmark', help="Time queries on the corpus (and a synthetic one)")
+    p.add_argument('--synthetic', type=int, default=100000,
+                   help="Synthetic corpus size (0 to skip; default 100000)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = build_ingredient_index()
+        save_ingredient_index(index)
+        print(f"Wrote {INGREDIENT_INDEX_FILE}: {len(index.bitsets):,} ingredients over "
+              f"{index.doc_count:,} recipes ({time.perf_counter() - start:.2f}s)")
+        return
+
+    try:
+        index = IngredientIndex.load()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.command == 'benchmark':
+        run_benchmark(index, "Corpus")
+        if args.synthetic:
+            start = time.perf_counter()
+            synthetic = IngredientIndex.from_ingredient_sets(
+                synthetic_ingredient_sets(index, args.synthetic))
+            print(f"\n(synthetic corpus built in {time.perf_counter() - start:.1f}s)")
+            run_benchmark(synthetic, "Synthetic")
+        return
+
+    # Unknown names are left out of the query (in an 'all' query they would
+    # otherwise match nothing)
+    unknown = index.unknown(args.ingredients)
+    if unknown:
+        print(f"Not in the index (ignored): {', '.join(unknown)}")
+    known = [name for name in args.ingredients if name not in unknown]
+    if not known and args.command != 'pantry':
+        print("\nNo indexed ingredients to search for")
+        return
+
+    if args.command == 'all':
+        bits = index.all_of(known)
+    elif args.command == 'any':
+        bits = index.any_of(known)
+    else:
+        bits = index.missing_at_most(known, args.k, staples=not args.no_staples)
+
+    entries = {e['id']: e for e in load_index()['recipes']}
+    for recipe_id in index.ids_for(bits):
+        print(f"  {recipe_id}: {entries[recipe_id]['title']}")
+    print(f"\n{bits.bit_count()} recipe(s)")
+
+
+if __name__ == '__main__':
+    main()
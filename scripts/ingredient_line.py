@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Ingredient Line Parser for MomMom's Kitchen (Standalone Collection)
+
+One grammar for ingredient quantities and units, shared by add_nutrition.py,
+estimate_nutrition.py, validate-recipes.py and book_recipes.py. Each used to
+parse quantities its own way and they disagreed:
+
+    "1-1/2"     add_nutrition: midpoint of 1 and 1/2 (0.75)    here: 1 1/2
+    "½", "1½"   add_nutrition: unparsed (1.0)                   here: 1/2, 1 1/2
+    "1-2"       validator: float("1.2")                         here: 1 to 2
+    "6 to 8"    estimate_nutrition: unparsed (regex fallback)   here: 6 to 8
+
+Quantities parse to exact Fractions as a (low, high) range - equal for a
+single amount, None when there is no amount ("to taste", "dash"). Units
+normalize to the canonical names the nutrition tables use ("cups" -> "cup",
+"T" -> "tbsp", "15 1/2 oz cans" -> "can"). parse_ingredient() is the only
+place a structured line's unit is derived - add_nutrition.canonical_fields()
+(and so the fields normalize_ingredients.py stores) calls it too.
+
+Everything is memoized on the raw strings, so a line seen by several tools
+in one run is parsed once.
+
+Usage:
+    from ingredient_line import parse_ingredient, parse_quantity_range, normalize_unit
+
+    line = parse_ingredient("1-1/2", "cups", "flour")
+    line.low, line.high, line.unit, line.item     # Fraction(3, 2), Fraction(3, 2), "cup", "flour"
+    line.quantity                                 # 1.5 (midpoint, or None)
+
+    parse_quantity_range("6 to 8")                # (Fraction(6, 1), Fraction(8, 1))
+    parse_line("2 1/2 cups sifted flour")         # IngredientLine(5/2, 5/2, "cup", "sifted flour")
+
+    python scripts/ingredient_line.py "1½ to 2 T" "3-1/2 cups flour"   # Show parses
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import hashlib
+import re
+import sys
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+CACHE_SIZE = 1 << 16
+
+# Version of the normalized ingredient fields stored in the shards by
+# normalize_ingredients.py (item_canonical, unit_canonical, qty_low, qty_high,
+# is_equipment). Bump it when this grammar, normalize_unit, OCR_UNIT_PREFIXES,
+# or add_nutrition's normalize_ingredient / is_equipment change; readers then
+# ignore the stored fields until the stage is re-run.
+NORMALIZER_VERSION = 2
+
+# Recipe field holding a hash of the raw item/quantity/unit the stored fields
+# were computed from, so hand-editing a line (without re-running the stage)
+# makes readers recompute instead of trusting stale values
+SOURCE_HASH_FIELD = 'ingredients_hash'
+
+VULGAR_FRACTIONS = {
+    '½': Fraction(1, 2), '¼': Fraction(1, 4), '¾': Fraction(3, 4), '⅓': Fraction(1, 3),
+    '⅔': Fraction(2, 3), '⅛': Fraction(1, 8), '⅜': Fraction(3, 8), '⅝': Fraction(5, 8),
+    '⅞': Fraction(7, 8),
+}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "a half": Fraction(1, 2), "one-half": Fraction(1, 2), "half": Fraction(1, 2),
+}
+APPROXIMATE_WORDS = ("about", "approx.", "approximately", "up to", "scant", "heaping", "generous")
+
+_VULGAR = "[" + "".join(VULGAR_FRACTIONS) + "]"
+# Order matters: mixed numbers ("1 1/2", "1-1/2", "1½") before fractions before integers
+NUMBER = (r"(?:\d+(?:\s+|-)\d+/\d+|\d+\s*" + _VULGAR + r"|\d+/\d+|\d*\.\d+|\d+|" + _VULGAR + ")")
+WORD_NUMBER = ("(?:" + "|".join(sorted((re.escape(w) for w in NUMBER_WORDS), key=len, reverse=True))
+               + r")\b")
+RANGE_SEPARATOR = r"\s*(?:-|–|—|to|or)\s*"
+
+_APPROX = "(?:(?:" + "|".join(re.escape(w) for w in APPROXIMATE_WORDS) + r")\s+)?"
+# Leading quantity, digits or words: "about 6 to 8", "three", "1½-2"
+LEADING_QUANTITY = re.compile(
+    r"^\s*" + _APPROX + r"(?P<low>" + NUMBER + "|" + WORD_NUMBER + ")"
+    r"(?:" + RANGE_SEPARATOR + r"(?P<high>" + NUMBER + "|" + WORD_NUMBER + "))?",
+    re.IGNORECASE)
+# First numeric quantity anywhere: "[approx] 2", "2-serving"
+ANY_QUANTITY = re.compile(
+    r"(?<![\w/.])(?P<low>" + NUMBER + r")(?:" + RANGE_SEPARATOR + r"(?P<high>" + NUMBER + r"))?",
+    re.IGNORECASE)
+_MIXED = re.compile(r"^(\d+)(?:\s+|-)(\d+)/(\d+)$|^(\d+)\s*(" + _VULGAR + ")$")
+
+UNIT_MAP = {
+    # Volume
+    "cups": "cup", "c": "cup", "c.": "cup",
+    "tablespoons": "tbsp", "tablespoon": "tbsp", "tbsps": "tbsp", "t": "tbsp", "tbs": "tbsp", "tbl": "tbsp",
+    "tblsp": "tbsp", "tblsps": "tbsp", "tblsp.": "tbsp", "tblsps.": "tbsp",
+    "teaspoons": "tsp", "teaspoon": "tsp", "tsps": "tsp", "t.": "tsp",
+    "ounces": "oz", "ounce": "oz", "ozs": "oz",
+    "pounds": "lb", "pound": "lb", "lbs": "lb",
+    "pints": "pint", "pt": "pint",
+    "quarts": "quart", "qt": "quart",
+    "gallons": "gallon", "gal": "gallon",
+    # Historical measurements (Batch 14)
+    "gill": "gill", "gills": "gill",  # 4 fl oz = 0.5 cup
+    "drachm": "drachm", "drachms": "drachm", "dram": "drachm", "drams": "drachm",  # 1/8 oz
+    "dessertspoon": "dessertspoon", "dessertspoons": "dessertspoon", "dssp": "dessertspoon",  # 2 tsp
+    "saltspoon": "saltspoon", "saltspoons": "saltspoon", "saltspoonful": "saltspoon", "saltspoonfuls": "saltspoon",  # 1/4 tsp
+    "wineglass": "wineglass", "wineglasses": "wineglass", "wine glass": "wineglass", "wine glasses": "wineglass",  # ~4 fl oz = 0.5 cup
+    "teacup": "teacup", "teacups": "teacup", "tea cup": "teacup", "tea cups": "teacup",  # ~6 fl oz = 0.75 cup
+    "coffeecup": "coffeecup", "coffeecups": "coffeecup", "coffee cup": "coffeecup", "coffee cups": "coffeecup",  # ~1 cup
+    "jigger": "jigger", "jiggers": "jigger",  # 1.5 oz = 3 tbsp
+    "peck": "peck", "pecks": "peck", "pk": "peck",  # 8 quarts (dry)
+    "bushel": "bushel", "bushels": "bushel", "bu": "bushel",  # 4 pecks = 32 quarts
+    "firkin": "firkin", "firkins": "firkin",  # 9 gallons
+    "hogshead": "hogshead", "hogsheads": "hogshead",  # 63 gallons
+    # Count
+    "slices": "slice",
+    "links": "link",
+    "cloves": "clove",
+    "cans": "can",
+    "packages": "packet", "pkg": "packet", "pkgs": "packet", "packets": "packet", "pkg.": "packet",
+    "sachet (7g)": "sachet", "sachets": "sachet",
+    "envelopes": "envelope",
+    "stalks": "stalk",
+    "sprigs": "sprig",
+    "ears": "ear",
+    "bunches": "bunch",
+    "heads": "head",
+    "loaves": "loaf",
+    "pieces": "piece", "pc": "piece", "pcs": "piece",
+    # Size-based
+    "small": "small", "sm": "small",
+    "medium": "medium", "med": "medium",
+    "large": "large", "lg": "large",
+}
+# Units parse_line() accepts after a quantity in free text
+MEASURE_UNITS = (set(UNIT_MAP.values()) - {"small", "medium", "large"}) | {
+    "cup", "tbsp", "tsp", "oz", "lb", "pint", "quart", "gallon", "gill",
+    "can", "jar", "box", "bag", "bottle", "dash", "pinch", "handful", "sachet",
+}
+DESCRIPTIVE_UNITS = {"ripe", "fresh"}     # Treated as no unit ("each")
+
+# OCR-embedded unit prefixes in the item (e.g., "c sugar" -> unit="cup", item="sugar")
+OCR_UNIT_PREFIXES = [
+    ("c ", "cup"),
+    ("t ", "tsp"),
+    ("T ", "tbsp"),
+    ("slices ", "slice"),
+    ("slice ", "slice"),
+    ("ears ", "ear"),
+    ("ear ", "ear"),
+    ("qt. ", "quart"),
+    ("qt ", "quart"),
+    ("pt. ", "pint"),
+    ("pt ", "pint"),
+    ("oz ", "oz"),
+    ("lb ", "lb"),
+    ("cups ", "cup"),
+    ("cup ", "cup"),
+    ("tbsp ", "tbsp"),
+    ("tsp ", "tsp"),
+    ("tblsp. ", "tbsp"),
+    ("tblsps. ", "tbsp"),
+]
+
+EMBEDDED_SIZE = re.compile(r'^(\w+)\s*\([\d\s.]+\s*oz\)$')           # "can (17 oz)" -> "can"
+OZ_CANS = re.compile(r'^[\d\s./½¼¾-]+\s*oz\.?\s*cans?$')            # "14.5-oz cans" -> "can"
+OZ_JAR = re.compile(r'^(?:[\d\s./]+\s*)?oz\.?\s*jar$')              # "16 oz jar" -> "can"
+UNIT_WORDS = re.compile(r"^\s*(?:of\s+)?([a-z]+\.?(?:\s+(?:glass(?:es)?|cups?))?)\s*(?:of\s+)?",
+                        re.IGNORECASE)
+
+
+class IngredientLine(NamedTuple):
+    low: Optional[Fraction]       # None when the line has no amount
+    high: Optional[Fraction]      # == low unless the amount is a range
+    unit: str                     # Canonical unit ("" for count/each)
+    item: str
+
+    @property
+    def quantity(self) -> Optional[float]:
+        """Midpoint of the range as a float, or None."""
+        if self.low is None:
+            return None
+        return float((self.low + self.high) / 2)
+
+    @property
+    def is_range(self) -> bool:
+        return self.low is not None and self.low != self.high
+
+
+def ingredients_hash(ingredients) -> str:
+    """Short hash of the raw item/quantity/unit of every ingredient line, in order."""
+    raw = '\x1e'.join(f"{ing.get('item', '')}\x1f{ing.get('quantity', '')}\x1f{ing.get('unit', '')}"
+                      if isinstance(ing, dict) else '\x1d' for ing in ingredients)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def is_normalized(recipe) -> bool:
+    """
+    True if the recipe's stored normalized ingredient fields are current: the
+    normalizer version matches and the raw lines are the ones they came from.
+    """
+    return (recipe.get('normalizer_version') == NORMALIZER_VERSION
+            and recipe.get(SOURCE_HASH_FIELD) == ingredients_hash(recipe.get('ingredients') or []))
+
+
+def number_value(text: str) -> Optional[Fraction]:
+    """Exact value of one NUMBER / WORD_NUMBER token."""
+    text = text.strip().lower()
+    if text in NUMBER_WORDS:
+        return Fraction(NUMBER_WORDS[text])
+    if text in VULGAR_FRACTIONS:
+        return VULGAR_FRACTIONS[text]
+    mixed = _MIXED.match(text)
+    try:
+        if mixed:
+            if mixed.group(1):
+                return int(mixed.group(1)) + Fraction(int(mixed.group(2)), int(mixed.group(3)))
+            return int(mixed.group(4)) + VULGAR_FRACTIONS[mixed.group(5)]
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _match_range(match) -> Tuple[Optional[Fraction], Optional[Fraction]]:
+    low = number_value(match.group("low"))
+    high = number_value(match.group("high")) if match.group("high") else low
+    if low is None or high is None or low <= 0:
+        return None, None
+    return (low, high) if high >= low else (high, low)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _quantity_match(text: str):
+    """(low, high, end offset) of the quantity in `text`, or (None, None, 0)."""
+    match = LEADING_QUANTITY.match(text) or ANY_QUANTITY.search(text)
+    if not match:
+        return None, None, 0
+    low, high = _match_range(match)
+    return low, high, match.end() if low is not None else 0
+
+
+def parse_quantity_range(text) -> Tuple[Optional[Fraction], Optional[Fraction]]:
+    """
+    Exact (low, high) for a quantity string: "1 1/2" -> (3/2, 3/2), "6 to 8" ->
+    (6, 8), "½-1" -> (1/2, 1), "to taste" -> (None, None).
+    """
+    if text is None:
+        return None, None
+    low, high, _ = _quantity_match(str(text))
+    return low, high
+
+
+def format_fraction(value: Fraction) -> str:
+    """Recipe-style text for an amount: 3/2 -> "1 1/2", 2 -> "2"."""
+    whole, part = divmod(value.numerator, value.denominator)
+    if not part:
+        return str(whole)
+    fraction = f"{part}/{value.denominator}"
+    return f"{whole} {fraction}" if whole else fraction
+
+
+def format_quantity(low: Optional[Fraction], high: Optional[Fraction]) -> str:
+    """Quantity-field text for a parsed range: "1 1/2", "6-8", "" for no amount."""
+    if low is None:
+        return ""
+    if high is None or high == low:
+        return format_fraction(low)
+    return f"{format_fraction(low)}-{format_fraction(high)}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_unit(unit) -> str:
+    """Normalize unit names to standard forms."""
+    unit = str(unit).lower().strip().rstrip('.')
+
+    embedded_size = EMBEDDED_SIZE.match(unit)
+    if embedded_size:
+        unit = embedded_size.group(1)
+    if OZ_CANS.match(unit):
+        unit = "can"
+    if OZ_JAR.match(unit):
+        unit = "can"  # jars are roughly equivalent to cans
+    if unit in DESCRIPTIVE_UNITS:
+        unit = ""
+
+    return UNIT_MAP.get(unit, unit)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_ingredient(quantity: str, unit: str, item: str) -> IngredientLine:
+    low, high, end = _quantity_match(quantity)
+    if not unit and end:
+        # Unit written into the quantity field: "1 tsp (0.1 lb) / 1 1/2 tsp (...)"
+        rest = UNIT_WORDS.match(quantity[end:])
+        if rest and normalize_unit(rest.group(1)) in MEASURE_UNITS:
+            unit = rest.group(1)
+    if not unit:
+        # Unit OCR'd onto the front of the item: "c sugar"
+        item_lower = item.lower()
+        for prefix, unit_name in OCR_UNIT_PREFIXES:
+            if item_lower.startswith(prefix.lower()):
+                return IngredientLine(low, high, unit_name, item[len(prefix):].strip())
+    return IngredientLine(low, high, normalize_unit(unit) if unit else "", item.strip())
+
+
+def parse_ingredient(quantity, unit, item) -> IngredientLine:
+    """
+    Parse a structured ingredient's quantity/unit/item fields. With no unit,
+    one written into the quantity ("2 tsp or 1 tsp") or onto the start of
+    the item ("c sugar" -> "cup", "sugar") is used.
+    """
+    return _parse_ingredient('' if quantity is None else str(quantity),
+                             '' if unit is None else str(unit),
+                             '' if item is None else str(item))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_line(text: str) -> Optional[IngredientLine]:
+    """
+    Parse a free-text ingredient line that starts with an amount
+    ("2 1/2 cups sifted flour", "one pint of berries", "3 eggs"), or None.
+    """
+    match = LEADING_QUANTITY.match(text)
+    if not match:
+        return None
+    low, high = _match_range(match)
+    if low is None:
+        return None
+    rest = text[match.end():]
+    unit = ""
+    words = UNIT_WORDS.match(rest)
+    if words and normalize_unit(words.group(1)) in MEASURE_UNITS:
+        unit = normalize_unit(words.group(1))
+        rest = rest[words.end():]
+    return IngredientLine(low, high, unit, rest.strip(" ,;"))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    for text in sys.argv[1:]:
+        line = parse_line(text)
+        if line is None:
+            low, high = parse_quantity_range(text)
+            print(f"{text!r}: quantity {low} to {high}")
+        else:
+            amount = str(line.low) if not line.is_range else f"{line.low} to {line.high}"
+            print(f"{text!r}: {amount} | unit {line.unit or '-'} | item {line.item!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Manifest Database for MomMom's Kitchen (Standalone Collection)
+
+Optional SQLite backend (stdlib sqlite3) for the processing manifests.
+image_manifest.json, pdf_manifest.json and processed_images.json stay the
+files in git; this imports them into data/manifests.sqlite, where the
+questions the safeguards scripts keep asking are indexed queries instead of
+scans over every entry:
+
+    - next unprocessed image / processable / broken images   (collection, status)
+    - which images fed this recipe, which recipes came from an image
+      (image_recipes, indexed both ways; built from processed_images.json
+      recipes_extracted and each recipe's image_refs)
+
+SQLiteImageManifest and SQLitePDFManifest are drop-in subclasses of
+ImageManifest and PDFManifest; the safeguards scripts use them with --sqlite.
+`export` writes the database back to the JSON files in their original
+format, so the two stay interchangeable - use one backend at a time and
+export before committing.
+
+Usage:
+    python scripts/manifest_db.py import             # JSON -> data/manifests.sqlite
+    python scripts/manifest_db.py export             # data/manifests.sqlite -> JSON
+    python scripts/manifest_db.py status             # Counts by collection/status
+    python scripts/manifest_db.py next [collection]  # Next unprocessed image
+    python scripts/manifest_db.py recipe <id>        # Images that fed a recipe
+    python scripts/manifest_db.py image <filename>   # Recipes from an image
+
+    python scripts/image_safeguards.py --sqlite next
+    python scripts/pdf_safeguards.py --sqlite status
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import image_safeguards
+import pdf_safeguards
+from image_safeguards import ImageManifest, NEXT_STATUSES, STATUS_UNVALIDATED
+from manifest_journal import ManifestJournal
+from pdf_safeguards import PDFManifest
+
+DB_FILE = "manifests.sqlite"
+PROCESSED_IMAGES_FILE = "processed_images.json"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL                    -- JSON
+);
+CREATE TABLE IF NOT EXISTS images (
+    key        TEXT PRIMARY KEY,
+    seq        INTEGER NOT NULL,           -- Order in image_manifest.json
+    collection TEXT,
+    filename   TEXT,
+    status     TEXT,
+    width      INTEGER,
+    height     INTEGER,
+    data       TEXT NOT NULL               -- Full JSON record
+);
+CREATE INDEX IF NOT EXISTS images_collection_status ON images (collection, status, seq);
+CREATE INDEX IF NOT EXISTS images_status ON images (status, seq);
+CREATE INDEX IF NOT EXISTS images_filename ON images (filename);
+
+CREATE TABLE IF NOT EXISTS pdfs (
+    key      TEXT PRIMARY KEY,
+    seq      INTEGER NOT NULL,
+    filename TEXT,
+    status   TEXT,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pdfs_status ON pdfs (status, seq);
+
+CREATE TABLE IF NOT EXISTS processed_images (
+    seq      INTEGER PRIMARY KEY,          -- Order in processed_images.json
+    filename TEXT,
+    status   TEXT,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS processed_images_filename ON processed_images (filename);
+
+CREATE TABLE IF NOT EXISTS image_recipes (
+    filename  TEXT NOT NULL,
+    recipe_id TEXT NOT NULL,
+    source    TEXT NOT NULL,               -- 'processed_images' or 'image_refs'
+    PRIMARY KEY (filename, recipe_id, source)
+);
+CREATE INDEX IF NOT EXISTS image_recipes_recipe ON image_recipes (recipe_id, filename);
+"""
+
+# Manifest keys stored as meta rows; everything else is in the tables
+IMAGE_RECORDS = "images"
+PDF_RECORDS = "pdfs"
+
+
+class ManifestDB:
+    """data/manifests.sqlite: manifests as indexed tables."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def close(self):
+        self.conn.close()
+
+    # -- Meta --------------------------------------------------------------
+
+    def get_meta(self, name: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, name: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                          (name, json.dumps(value, ensure_ascii=False)))
+
+    def is_empty(self) -> bool:
+        return self.get_meta("schema_version") is None
+
+    # -- Images ------------------------------------------------------------
+
+    def upsert_images(self, images: Dict[str, Dict]):
+        """Insert or replace image records, keeping existing manifest order."""
+        next_seq = self.conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM images").fetchone()[0]
+        rows = []
+        for key, data in images.items():
+            existing = self.conn.execute("SELECT seq FROM images WHERE key = ?", (key,)).fetchone()
+            if existing:
+                seq = existing[0]
+            else:
+                seq, next_seq = next_seq, next_seq + 1
+            rows.append((key, seq, data.get("collection"), data.get("filename"),
+                         data.get("status", STATUS_UNVALIDATED), data.get("width"),
+                         data.get("height"), json.dumps(data, ensure_ascii=False)))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO images "
+            "(key, seq, collection, filename, status, width, height, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def get_image(self, key: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM images WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_images(self, statuses: Optional[List[str]] = None,
+                    collection_id: Optional[str] = None,
+                    limit: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """(key, data) in manifest order; filters use the (collection, status) index."""
+        sql = "SELECT key, data FROM images"
+        clauses, params = [], []
+        if collection_id:
+            clauses.append("collection = ?")
+            params.append(collection_id)
+        if statuses is not None:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        for key, data in self.conn.execute(sql, params):
+            yield key, json.loads(data)
+
+    def image_key_for(self, filename: str) -> Optional[str]:
+        """Key for an exact key, a filename (indexed), or a key suffix."""
+        row = self.conn.execute(
+            "SELECT key FROM images WHERE key = ? "
+            "UNION ALL SELECT key FROM (SELECT key FROM images WHERE filename = ? ORDER BY seq LIMIT 1)",
+            (filename, filename)).fetchone()
+        if row:
+            return row[0]
+        row = self.conn.execute(
+            "SELECT key FROM images WHERE substr(key, -length(?)) = ? ORDER BY seq LIMIT 1",
+            (filename, filename)).fetchone()
+        return row[0] if row else None
+
+    def status_counts(self, table: str = IMAGE_RECORDS) -> Dict[str, int]:
+        return dict(self.conn.execute(f"SELECT status, COUNT(*) FROM {table} GROUP BY status"))
+
+    # -- PDFs --------------------------------------------------------------
+
+    def replace_pdfs(self, pdfs: Dict[str, Dict]):
+        self.conn.execute("DELETE FROM pdfs")
+        self.conn.executemany(
+            "INSERT INTO pdfs (key, seq, filename, status, data) VALUES (?, ?, ?, ?, ?)",
+            [(key, seq, data.get("filename"), data.get("status", STATUS_UNVALIDATED),
+              json.dumps(data, ensure_ascii=False))
+             for seq, (key, data) in enumerate(pdfs.items())])
+
+    def load_pdfs(self) -> Dict[str, Dict]:
+        return {key: json.loads(data)
+                for key, data in self.conn.execute("SELECT key, data FROM pdfs ORDER BY seq")}
+
+    # -- Recipe <-> image links -------------------------------------------
+
+    def images_for_recipe(self, recipe_id: str) -> List[Tuple[str, str]]:
+        """(filename, source) for every image linked to a recipe."""
+        return self.conn.execute(
+            "SELECT filename, source FROM image_recipes WHERE recipe_id = ? ORDER BY filename, source",
+            (recipe_id,)).fetchall()
+
+    def recipes_for_image(self, filename: str) -> List[Tuple[str, str]]:
+        """(recipe_id, source) for every recipe linked to an image filename."""
+        return self.conn.execute(
+            "SELECT recipe_id, source FROM image_recipes WHERE filename = ? ORDER BY recipe_id, source",
+            (filename,)).fetchall()
+
+    # -- JSON import / export ---------------------------------------------
+
+    def import_json(self, data_dir: Path) -> Dict[str, int]:
+        """Replace the database contents with the JSON manifests (journals replayed)."""
+        image_manifest = ImageManifest(data_dir).manifest
+        pdf_manifest = PDFManifest(data_dir).manifest
+        processed = {}
+        processed_path = data_dir / PROCESSED_IMAGES_FILE
+        if processed_path.exists():
+            with open(processed_path, 'r', encoding='utf-8') as f:
+                processed = json.load(f)
+
+        with self.conn:
+            for table in ("meta", "images", "pdfs", "processed_images", "image_recipes"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.set_meta("schema_version", SCHEMA_VERSION)
+            self.set_meta("imported_at", datetime.now().isoformat())
+            self.set_meta("image_manifest", {k: v for k, v in image_manifest.items()
+                                             if k != IMAGE_RECORDS})
+            self.set_meta("pdf_manifest", {k: v for k, v in pdf_manifest.items()
+                                           if k != PDF_RECORDS})
+            self.set_meta("processed_images", {k: v for k, v in processed.items()
+                                               if k != "images"})
+
+            self.upsert_images(image_manifest[IMAGE_RECORDS])
+            self.replace_pdfs(pdf_manifest[PDF_RECORDS])
+
+            links = set()
+            rows = []
+            for seq, entry in enumerate(processed.get("images", [])):
+                rows.append((seq, entry.get("filename"), entry.get("status"),
+                             json.dumps(entry, ensure_ascii=False)))
+                for recipe_id in entry.get("recipes_extracted") or []:
+                    links.add((entry.get("filename"), recipe_id, "processed_images"))
+            self.conn.executemany(
+                "INSERT INTO processed_images (seq, filename, status, data) VALUES (?, ?, ?, ?)", rows)
+
+            for recipe in iter_recipes():
+                for ref in recipe.get("image_refs") or []:
+                    if isinstance(ref, str):
+                        links.add((ref, recipe["id"], "image_refs"))
+            self.conn.executemany(
+                "INSERT INTO image_recipes (filename, recipe_id, source) VALUES (?, ?, ?)",
+                sorted(links))
+
+        return {"images": len(image_manifest[IMAGE_RECORDS]),
+                "pdfs": len(pdf_manifest[PDF_RECORDS]),
+                "processed_images": len(rows),
+                "image_recipes": len(links)}
+
+    def export_image_manifest(self) -> Dict:
+        manifest = dict(self.get_meta("image_manifest", {}))
+        images = dict(self.iter_images())
+        # Keep the original key order: header fields, images, then the rest
+        ordered = {}
+        for key in ("created", "last_updated", "max_dimension", "collections"):
+            if key in manifest:
+                ordered[key] = manifest.pop(key)
+        ordered[IMAGE_RECORDS] = images
+        ordered.update(manifest)
+        return ordered
+
+    def export_pdf_manifest(self) -> Dict:
+        manifest = dict(self.get_meta("pdf_manifest", {}))
+        ordered = {}
+        for key in ("created", "last_updated", "limits"):
+            if key in manifest:
+                ordered[key] = manifest.pop(key)
+        ordered[PDF_RECORDS] = self.load_pdfs()
+        ordered.update(manifest)
+        return ordered
+
+    def export_processed_images(self) -> Dict:
+        processed = dict(self.get_meta("processed_images", {}))
+        ordered = {}
+        if "meta" in processed:
+            ordered["meta"] = processed.pop("meta")
+        ordered["images"] = [json.loads(data) for (data,) in
+                             self.conn.execute("SELECT data FROM processed_images ORDER BY seq")]
+        ordered.update(processed)
+        return ordered
+
+    def export_json(self, data_dir: Path):
+        """Write the database back to the JSON manifests (replacing their journals)."""
+        ManifestJournal(data_dir / image_safeguards.MANIFEST_FILE, IMAGE_RECORDS).write_snapshot(
+            self.export_image_manifest())
+        ManifestJournal(data_dir / pdf_safeguards.MANIFEST_FILE, PDF_RECORDS).write_snapshot(
+            self.export_pdf_manifest())
+
+        if self.get_meta("processed_images") is not None:
+            path = data_dir / PROCESSED_IMAGES_FILE
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.export_processed_images(), f, indent=2)
+            tmp_path.replace(path)
+
+
+def iter_recipes() -> Iterator[Dict]:
+    """Every recipe in the shards (for image_refs links)."""
+    try:
+        from recipe_store import RecipeStore
+        yield from RecipeStore(check_duplicates=False).iter_recipes()
+    except FileNotFoundError:
+        return
+
+
+def open_db(data_dir: Path) -> ManifestDB:
+    """Open data/manifests.sqlite, importing the JSON manifests on first use."""
+    db = ManifestDB(data_dir / DB_FILE)
+    if db.is_empty():
+        counts = db.import_json(data_dir)
+        print(f"Imported manifests into {DB_FILE}: "
+              + ", ".join(f"{n} {name}" for name, n in counts.items()))
+    return db
+
+
+class SQLiteImageManifest(ImageManifest):
+    """ImageManifest whose records live in manifests.sqlite."""
+
+    def __init__(self, data_dir: Path, db: Optional[ManifestDB] = None):
+        self.data_dir = data_dir
+        self.manifest_path = data_dir / image_safeguards.MANIFEST_FILE
+        self.journal = None
+        self.db = db or open_db(data_dir)
+        # Header fields only; "images" holds records written by validate_all()
+        # until save() moves them into the database.
+        self.manifest = dict(self.db.get_meta("image_manifest", {}))
+        self.manifest[IMAGE_RECORDS] = {}
+        self._update_stats()
+
+    def save(self):
+        with self.db.conn:
+            self.db.upsert_images(self.manifest[IMAGE_RECORDS])
+            self.manifest[IMAGE_RECORDS] = {}
+            self.manifest["last_updated"] = datetime.now().isoformat()
+            self._update_stats()
+            self._save_header()
+
+    def compact(self):
+        """Nothing to compact: every change is already a committed transaction."""
+
+    def _update_stats(self):
+        stats = {"total": 0, "validated": 0, "broken": 0, "oversized": 0,
+                 "processed": 0, "skipped": 0}
+        for status, count in self.db.status_counts().items():
+            stats["total"] += count
+            for key in image_safeguards.stat_keys(status or STATUS_UNVALIDATED):
+                stats[key] += count
+        self.manifest["stats"] = stats
+
+    def _record(self, key: str, fields: Dict):
+        data = self.db.get_image(key)
+        data.update(fields)
+        with self.db.conn:
+            self.db.upsert_images({key: data})
+            self.manifest["last_updated"] = datetime.now().isoformat()
+            self._update_stats()
+            self._save_header()
+
+    def iter_images(self, statuses: Optional[List[str]] = None,
+                    collection_id: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        return self.db.iter_images(statuses, collection_id)
+
+    def get_next_unprocessed(self, collection_id: Optional[str] = None) -> Optional[Dict]:
+        for key, data in self.db.iter_images(NEXT_STATUSES, collection_id, limit=1):
+            return {"key": key, **data}
+        return None
+
+    def find_key(self, filename: str) -> Optional[str]:
+        return self.db.image_key_for(filename)
+
+    def set_session_position(self, collection_id: str, index: int, last_file: str):
+        self.manifest["session"] = {
+            "last_processed": last_file,
+            "processing_collection": collection_id,
+            "processing_index": index,
+            "saved_at": datetime.now().isoformat()
+        }
+        with self.db.conn:
+            self._save_header()
+
+    def _save_header(self):
+        self.db.set_meta("image_manifest", {k: v for k, v in self.manifest.items()
+                                            if k != IMAGE_RECORDS})
+
+    def images_for_recipe(self, recipe_id: str) -> List[Tuple[str, str]]:
+        return self.db.images_for_recipe(recipe_id)
+
+    def recipes_for_image(self, filename: str) -> List[Tuple[str, str]]:
+        return self.db.recipes_for_image(filename)
+
+
+class SQLitePDFManifest(PDFManifest):
+    """PDFManifest whose records live in manifests.sqlite (a handful of rows)."""
+
+    def __init__(self, data_dir: Path, db: Optional[ManifestDB] = None):
+        self.data_dir = data_dir
+        self.manifest_path = data_dir / pdf_safeguards.MANIFEST_FILE
+        self.journal = None
+        self.db = db or open_db(data_dir)
+        self.manifest = self.db.export_pdf_manifest()
+        self._update_stats()
+
+    def save(self):
+        self.manifest["last_updated"] = datetime.now().isoformat()
+        self._update_stats()
+        with self.db.conn:
+            self.db.replace_pdfs(self.manifest[PDF_RECORDS])
+            self.db.set_meta("pdf_manifest", {k: v for k, v in self.manifest.items()
+                                              if k != PDF_RECORDS})
+
+    def compact(self):
+        """Nothing to compact: every change is already a committed transaction."""
+
+    def _record(self, key: str, fields: Dict):
+        self.manifest[PDF_RECORDS][key].update(fields)
+        self.save()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    data_dir = Path(__file__).parent.parent / 'data'
+    if not data_dir.exists():
+        print(f"ERROR: Data directory not found: {data_dir}")
+        sys.exit(1)
+
+    if command == "import":
+        db = ManifestDB(data_dir / DB_FILE)
+        counts = db.import_json(data_dir)
+        print(f"Imported into {DB_FILE}: " + ", ".join(f"{n} {name}" for name, n in counts.items()))
+
+    elif command == "export":
+        db = ManifestDB(data_dir / DB_FILE)
+        if db.is_empty():
+            print(f"ERROR: {DB_FILE} is empty - nothing to export")
+            sys.exit(1)
+        db.export_json(data_dir)
+        print(f"Exported {DB_FILE} to {image_safeguards.MANIFEST_FILE}, "
+              f"{pdf_safeguards.MANIFEST_FILE} and {PROCESSED_IMAGES_FILE}")
+
+    elif command == "status":
+        db = open_db(data_dir)
+        print(f"\n{'Collection':<20} {'Status':<14} {'Images':>7}")
+        for collection, status, count in db.conn.execute(
+                "SELECT collection, status, COUNT(*) FROM images "
+                "GROUP BY collection, status ORDER BY collection, status"):
+            print(f"{collection or '-':<20} {status or '-':<14} {count:>7}")
+        print("\nPDFs: " + ", ".join(f"{n} {s}" for s, n in sorted(db.status_counts(PDF_RECORDS).items())))
+        links = db.conn.execute("SELECT COUNT(*), COUNT(DISTINCT recipe_id) FROM image_recipes").fetchone()
+        print(f"Image/recipe links: {links[0]} ({links[1]} recipes)")
+
+    elif command == "next":
+        manifest = SQLiteImageManifest(data_dir)
+        next_img = manifest.get_next_unprocessed(sys.argv[2] if len(sys.argv) > 2 else None)
+        if next_img:
+            print(f"{next_img['key']} [{next_img.get('status')}]")
+        else:
+            print("No unprocessed images found")
+
+    elif command == "recipe":
+        if len(sys.argv) < 3:
+            print("Usage: manifest_db.py recipe <recipe-id>")
+            sys.exit(1)
+        links = open_db(data_dir).images_for_recipe(sys.argv[2])
+        for filename, source in links:
+            print(f"  {filename}  ({source})")
+        if not links:
+            print(f"No images linked to {sys.argv[2]}")
+
+    elif command == "image":
+        if len(sys.argv) < 3:
+            print("Usage: manifest_db.py image <filename>")
+            sys.exit(1)
+        links = open_db(data_dir).recipes_for_image(sys.argv[2])
+        for recipe_id, source in links:
+            print(f"  {recipe_id}  ({source})")
+        if not links:
+            print(f"No recipes linked to {sys.argv[2]}")
+
+    else:
+        print(f"Unknown command: {command}")
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
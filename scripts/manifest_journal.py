@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Manifest Journal for MomMom's Kitchen (Standalone Collection)
+
+Write-ahead journal shared by ImageManifest (image_safeguards.py) and
+PDFManifest (pdf_safeguards.py). A status change used to recompute stats and
+rewrite the whole manifest (~500 KB for images) with indent=2; now it appends
+one fsync'd JSON line to a sidecar journal:
+
+    data/image_manifest.json                 # Snapshot (same format as before)
+    data/image_manifest.journal.jsonl        # Changes since the snapshot
+
+    {"op": "update", "key": "mommom/x.jpeg", "fields": {"status": "processed", ...}, "at": "..."}
+    {"op": "set", "field": "session", "value": {...}, "at": "..."}
+
+Loading replays the journal over the snapshot. Entries set absolute values,
+so replaying one twice is harmless: compaction writes the new snapshot
+(temp file + fsync + rename) before it removes the journal, and a crash in
+between just replays already-applied entries. A torn final line from a
+crash mid-append is ignored.
+
+The journal is compacted into the snapshot after COMPACT_EVERY entries,
+whenever the owning manifest does a full save(), or on demand with the
+`compact` command of either safeguards script.
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+COMPACT_EVERY = 256
+
+
+def move_stats(stats: Dict, old_keys: Iterable[str], new_keys: Iterable[str]):
+    """Incrementally move one record's contribution between stats counters."""
+    for key in old_keys:
+        stats[key] = stats.get(key, 0) - 1
+    for key in new_keys:
+        stats[key] = stats.get(key, 0) + 1
+
+
+class ManifestJournal:
+    """Append-only journal of updates to one manifest's records."""
+
+    def __init__(self, snapshot_path: Path, records_key: str, compact_every: int = COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path.with_name(snapshot_path.stem + JOURNAL_SUFFIX)
+        self.records_key = records_key
+        self.compact_every = compact_every
+        self.entries = 0
+
+    def replay(self, manifest: Dict) -> int:
+        """Apply journaled entries to a freshly loaded snapshot. Returns the count."""
+        if not self.path.exists():
+            return 0
+
+        applied = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Torn write from a crash mid-append
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self.apply(manifest, entry)
+                applied += 1
+        self.entries = applied
+        return applied
+
+    def apply(self, manifest: Dict, entry: Dict):
+        """Apply one entry in memory (also used for live updates)."""
+        if entry["op"] == "update":
+            record = manifest[self.records_key].get(entry["key"])
+            if record is not None:
+                record.update(entry["fields"])
+        elif entry["op"] == "set":
+            manifest[entry["field"]] = entry["value"]
+        manifest["last_updated"] = entry["at"]
+
+    def append(self, entry: Dict):
+        """Durably append one entry (flushed and fsync'd before returning)."""
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += 1
+
+    def needs_compaction(self) -> bool:
+        return self.entries >= self.compact_every
+
+    def write_snapshot(self, manifest: Dict):
+        """Atomically replace the snapshot, then drop the (now applied) journal."""
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        if self.path.exists():
+            self.path.unlink()
+        self.entries = 0
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detector for MomMom's Kitchen (Standalone Collection)
+
+The same BHG, Foxfire and family recipes arrive from several sources under
+different ids. This finds them without comparing every pair:
+
+1. Each recipe becomes a set of shingles: canonical ingredient names
+   (stored item_canonical, else add_nutrition.normalize_ingredient_cached)
+   and stemmed title tokens
+   (search_index.tokenize/stem).
+2. A MinHash signature (NUM_PERM hash functions) estimates Jaccard
+   similarity between those sets.
+3. LSH banding (BANDS bands of ROWS rows) buckets signatures so only
+   recipes agreeing on a whole band become candidate pairs - near-linear
+   instead of n^2/2 comparisons.
+4. Candidates are verified with exact Jaccard and grouped into star
+   clusters around their best-connected recipe. Pairs at or above DUPLICATE_THRESHOLD are reported as
+   likely duplicates, the rest as possible variants.
+
+RecipeStore runs the same check on new recipes before committing them, so
+add_* scripts warn about near-duplicates of what's already in the archive.
+It reads the committed recipes' shingles and signatures from
+data/near_duplicate_cache.json (SignatureCache; not committed), keyed like
+the shard ledger by each shard file's (mtime_ns, size), so only shards that
+changed since the last check are loaded and re-signed.
+
+Usage:
+    python scripts/near_duplicates.py                     # Cluster report
+    python scripts/near_duplicates.py --threshold 0.6     # Stricter variants
+    python scripts/near_duplicates.py --json clusters.json
+    python scripts/near_duplicates.py --check batch.json  # Check a {"recipes": [...]} file
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from ingredient_line import NORMALIZER_VERSION, is_normalized
+from search_index import stem, tokenize
+
+NUM_PERM = 128
+ROWS = 4
+BANDS = NUM_PERM // ROWS      # LSH catches pairs from ~(1/BANDS)^(1/ROWS) = 0.42 Jaccard up
+MINHASH_SEED = 1796
+MERSENNE = (1 << 31) - 1      # a*x + b stays below 2^63, so numpy uint64 matches Python ints
+
+VARIANT_THRESHOLD = 0.5       # Exact Jaccard to report a pair at all
+DUPLICATE_THRESHOLD = 0.8     # ...and to call it a likely duplicate
+MIN_INGREDIENTS = 2           # Recipes with fewer ingredient shingles are skipped
+
+SIGNATURE_CACHE_NAME = 'near_duplicate_cache.json'   # In data/, next to shard_ledger.json
+SIGNATURE_CACHE_VERSION = 1
+
+_rng = random.Random(MINHASH_SEED)
+PERM_A = [_rng.randrange(1, MERSENNE) for _ in range(NUM_PERM)]
+PERM_B = [_rng.randrange(0, MERSENNE) for _ in range(NUM_PERM)]
+if NUMPY_AVAILABLE:
+    _PERM_A = np.array(PERM_A, dtype=np.uint64)[:, None]
+    _PERM_B = np.array(PERM_B, dtype=np.uint64)[:, None]
+
+
+def recipe_shingles(recipe: Dict) -> Set[str]:
+    """Ingredient ('i:') and title-token ('t:') shingles for one recipe."""
+    ingredients = [ing for ing in recipe.get('ingredients') or [] if isinstance(ing, dict)]
+    if is_normalized(recipe):
+        names = (ing['item_canonical'] for ing in ingredients)
+    else:
+        from add_nutrition import normalize_ingredient_cached
+        names = (normalize_ingredient_cached(ing.get('item', '')) for ing in ingredients)
+    shingles = {'i:' + name for name in names if name}
+    if sum(1 for s in shingles if s.startswith('i:')) < MIN_INGREDIENTS:
+        return set()
+    shingles.update('t:' + stem(t) for t in tokenize(recipe.get('title') or ''))
+    return shingles
+
+
+def shingle_hash(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % MERSENNE
+
+
+def minhash(shingles: Set[str]) -> Tuple[int, ...]:
+    """MinHash signature: per hash function, the minimum of (a*x + b) mod p."""
+    hashes = [shingle_hash(s) for s in shingles]
+    if NUMPY_AVAILABLE:
+        values = np.array(hashes, dtype=np.uint64)[None, :]
+        return tuple(int(v) for v in ((_PERM_A * values + _PERM_B) % MERSENNE).min(axis=1))
+    return tuple(min((a * h + b) % MERSENNE for h in hashes) for a, b in zip(PERM_A, PERM_B))
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class NearDuplicateIndex:
+    """MinHash signatures + LSH band buckets over a set of recipes."""
+
+    def __init__(self):
+        self.ids = []
+        self.titles = []
+        self.shingles = []
+        self.buckets = {}     # (band, band values) -> [row]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, recipe: Dict) -> Optional[int]:
+        """Index a recipe; returns its row, or None if it has too few ingredients."""
+        shingles = recipe_shingles(recipe)
+        if not shingles:
+            return None
+        return self.add_signed(recipe.get('id'), recipe.get('title', ''), shingles, minhash(shingles))
+
+    def add_signed(self, recipe_id: str, title: str, shingles: Set[str],
+                   signature: Tuple[int, ...]) -> int:
+        """Index an already-signed recipe (e.g. from SignatureCache); returns its row."""
+        row = len(self.ids)
+        self.ids.append(recipe_id)
+        self.titles.append(title)
+        self.shingles.append(shingles)
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, []).append(row)
+        return row
+
+    @staticmethod
+    def _band_keys(signature):
+        return [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def candidate_pairs(self) -> Set[Tuple[int, int]]:
+        """Row pairs sharing at least one LSH bucket."""
+        pairs = set()
+        for rows in self.buckets.values():
+            for i in range(len(rows)):
+                for j in range(i + 1, len(rows)):
+                    pairs.add((rows[i], rows[j]))
+        return pairs
+
+    def query(self, recipe: Dict, threshold: float = VARIANT_THRESHOLD) -> List[Tuple[str, float]]:
+        """Indexed recipes similar to `recipe` (not indexed itself), best first."""
+        shingles = recipe_shingles(recipe)
+        if not shingles:
+            return []
+        rows = set()
+        for key in self._band_keys(minhash(shingles)):
+            rows.update(self.buckets.get(key, ()))
+        matches = [(self.ids[row], jaccard(shingles, self.shingles[row])) for row in rows]
+        return sorted(((i, s) for i, s in matches if s >= threshold and i != recipe.get('id')),
+                      key=lambda m: -m[1])
+
+    def clusters(self, threshold: float = VARIANT_THRESHOLD) -> Tuple[List[Dict], int]:
+        """
+        Verified near-duplicate clusters, most similar first, and the number
+        of LSH candidate pairs that were checked.
+
+        Star clustering rather than connected components: short ingredient
+        lists chain (frosting ~ butter frosting ~ butter cookies ~ ...) into
+        one giant component. Each cluster is a centre - the recipe with the
+        most verified neighbours - plus its unclaimed neighbours, so every
+        member is within the threshold of the centre. Duplicate-level
+        clusters are formed first, then variant clusters from what's left.
+        """
+        candidates = self.candidate_pairs()
+        scored = [(i, j, jaccard(self.shingles[i], self.shingles[j])) for i, j in candidates]
+
+        claimed = set()
+        clusters = []
+        for level in sorted({max(threshold, DUPLICATE_THRESHOLD), threshold}, reverse=True):
+            neighbours = {}
+            for i, j, score in scored:
+                if score >= level and i not in claimed and j not in claimed:
+                    neighbours.setdefault(i, {})[j] = score
+                    neighbours.setdefault(j, {})[i] = score
+
+            centres = sorted(neighbours, key=lambda r: (-len(neighbours[r]),
+                                                        -max(neighbours[r].values()), r))
+            for centre in centres:
+                if centre in claimed:
+                    continue
+                members = sorted(((r, s) for r, s in neighbours[centre].items()
+                                  if r not in claimed), key=lambda m: (-m[1], m[0]))
+                if not members:
+                    continue
+                claimed.add(centre)
+                claimed.update(r for r, _ in members)
+                best = members[0][1]
+                clusters.append({
+                    'kind': 'duplicate' if best >= DUPLICATE_THRESHOLD else 'variant',
+                    'similarity': round(best, 3),
+                    'recipes': [{'id': self.ids[centre], 'title': self.titles[centre]}] +
+                               [{'id': self.ids[r], 'title': self.titles[r],
+                                 'similarity': round(s, 3)} for r, s in members],
+                })
+
+        clusters.sort(key=lambda c: (-c['similarity'], -len(c['recipes'])))
+        return clusters, len(candidates)
+
+
+def build_index(recipes: Iterable[Dict]) -> NearDuplicateIndex:
+    index = NearDuplicateIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    return index
+
+
+def check_batch(new_recipes: List[Dict], existing: Iterable[Dict],
+                threshold: float = VARIANT_THRESHOLD) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Pre-ingest check: for each new recipe, the existing (or earlier in-batch)
+    recipes it nearly duplicates. Recipes that already declare variant_of or
+    canonical_id have been linked on purpose and are not reported.
+    """
+    return check_batch_against(build_index(existing), new_recipes, threshold)
+
+
+def check_batch_against(index: NearDuplicateIndex, new_recipes: List[Dict],
+                        threshold: float = VARIANT_THRESHOLD) -> Dict[str, List[Tuple[str, float]]]:
+    """check_batch() with the existing recipes already indexed (new ones are added to it)."""
+    report = {}
+    for recipe in new_recipes:
+        if not (recipe.get('variant_of') or recipe.get('canonical_id')):
+            matches = index.query(recipe, threshold)
+            if matches:
+                report[recipe['id']] = matches
+        index.add(recipe)
+    return report
+
+
+class SignatureCache:
+    """
+    Per-shard shingles and MinHash signatures, reused while the shard file's
+    (mtime_ns, size) is unchanged - the same prefilter as the shard ledger.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.changed = False
+        self.shards = {}
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('key') == self.key():
+                self.shards = data.get('shards', {})
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    @staticmethod
+    def key() -> List:
+        # Anything that changes shingles or signatures invalidates the whole cache
+        return [SIGNATURE_CACHE_VERSION, NUM_PERM, ROWS, MINHASH_SEED, MIN_INGREDIENTS,
+                NORMALIZER_VERSION]
+
+    def entries(self, shard_file: str, stat: List[int], load_recipes) -> List[List]:
+        """[id, title, shingles, signature] rows for a shard (re-signed if its stat changed)."""
+        cached = self.shards.get(shard_file)
+        if cached and cached['stat'] == stat:
+            return cached['recipes']
+        rows = []
+        for recipe in load_recipes():
+            shingles = recipe_shingles(recipe)
+            if shingles:
+                rows.append([recipe.get('id'), recipe.get('title', ''), sorted(shingles),
+                             list(minhash(shingles))])
+        self.shards[shard_file] = {'stat': stat, 'recipes': rows}
+        self.changed = True
+        return rows
+
+    def prune(self, shard_files: Iterable[str]):
+        """Drop shards no longer in the index."""
+        for shard_file in set(self.shards) - set(shard_files):
+            del self.shards[shard_file]
+            self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': self.key(), 'shards': self.shards}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+
+def print_batch_report(report: Dict[str, List[Tuple[str, float]]]):
+    if not report:
+        return
+    print(f"\n⚠ {len(report)} new recipe(s) look like near-duplicates of existing ones:")
+    for recipe_id, matches in report.items():
+        shown = ', '.join(f"{i} ({s:.2f})" for i, s in matches[:3])
+        print(f"  {recipe_id} ~ {shown}")
+    print("  Set variant_of/canonical_id if these are variants, or drop the duplicate.")
+
+
+def load_all_recipes() -> List[Dict]:
+    from recipe_store import RecipeStore
+    return list(RecipeStore().iter_recipes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate recipes (MinHash + LSH)")
+    parser.add_argument('--threshold', type=float, default=VARIANT_THRESHOLD,
+                        help=f"Minimum Jaccard similarity to report (default {VARIANT_THRESHOLD})")
+    parser.add_argument('--json', metavar='PATH', help="Also write clusters to a JSON file")
+    parser.add_argument('--check', metavar='BATCH',
+                        help='Check a {"recipes": [...]} JSON file against the archive instead')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    recipes = load_all_recipes()
+
+    if args.check:
+        with open(args.check, 'r', encoding='utf-8') as f:
+            batch = json.load(f).get('recipes', [])
+        batch_ids = {r.get('id') for r in batch}
+        report = check_batch(batch, (r for r in recipes if r.get('id') not in batch_ids),
+                             args.threshold)
+        print_batch_report(report)
+        if not report:
+            print(f"✓ No near-duplicates among {len(batch)} recipe(s)")
+        return
+
+    index = build_index(recipes)
+    built = time.perf_counter() - start
+    clusters, n_candidates = index.clusters(args.threshold)
+    elapsed = time.perf_counter() - start
+
+    linked = {}
+    for r in recipes:
+        for key in ('variant_of', 'canonical_id'):
+            if r.get(key):
+                linked[r['id']] = r[key]
+
+    for cluster in clusters:
+        print(f"\n[{cluster['kind']}] similarity {cluster['similarity']:.2f}")
+        for member in cluster['recipes']:
+            score = f" [{member['similarity']:.2f}]" if 'similarity' in member else ''
+            note = f"  (variant_of {linked[member['id']]})" if member['id'] in linked else ''
+            print(f"  {member['id']}: {member['title']}{score}{note}")
+
+    n = len(index)
+    print(f"\n{len(clusters)} cluster(s): "
+          f"{sum(c['kind'] == 'duplicate' for c in clusters)} likely duplicate, "
+          f"{sum(c['kind'] == 'variant' for c in clusters)} possible variant")
+    print(f"{n:,} recipes signed; {n_candidates:,} LSH candidate pairs checked "
+          f"(vs {n * (n - 1) // 2:,} pairwise); {built:.1f}s to sign, {elapsed:.1f}s total")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'threshold': args.threshold, 'clusters': clusters}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
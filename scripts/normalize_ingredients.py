@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Ingredient Normalization Stage for MomMom's Kitchen (Standalone Collection)
+
+Every tool used to re-derive the same normalized view of each ingredient line
+from the raw OCR text on every run - normalize_ingredient()'s OCR fixes,
+normalize_unit(), the quantity grammar and is_equipment(), ~18k lines each
+time. This stage computes it once (add_nutrition.canonical_fields, whose
+units and quantities come from ingredient_line.parse_ingredient, the same
+parse the readers fall back to) and stores it on the ingredient objects in
+the shards:
+
+    {"item": "c sugar", "quantity": "1-1/2", "unit": "", "prep_note": "",
+     "item_canonical": "sugar", "unit_canonical": "cup",
+     "qty_low": 1.5, "qty_high": 1.5, "is_equipment": false}
+
+and stamps the recipe with "normalizer_version" and "ingredients_hash" (a
+hash of the raw item/quantity/unit of every line). Readers (add_nutrition,
+estimate_nutrition, validate-recipes, ingredient_index, near_duplicates) use
+the stored fields only when the version matches ingredient_line.NORMALIZER_VERSION
+and the hash matches the lines as they are now (ingredient_line.is_normalized),
+and fall back to computing them otherwise - so a stale or missing stamp,
+including a line edited by hand without re-running this stage, is slower,
+never wrong. validate-recipes.py warns about such recipes.
+
+RecipeStore normalizes recipes as they are committed, so ingested recipes
+arrive normalized; run this stage after bumping NORMALIZER_VERSION or after
+editing shard JSON by hand. build_assets.py strips the fields from the
+website copies of the shards; the browser never reads them.
+
+Usage:
+    python scripts/normalize_ingredients.py            # Normalize stale recipes, rewrite their shards
+    python scripts/normalize_ingredients.py --check    # Report stale recipes; exit 1 if any
+    python scripts/normalize_ingredients.py --strip    # Remove the stored fields again
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import sys
+import time
+from fractions import Fraction
+from typing import Dict, Optional, Union
+
+from ingredient_line import NORMALIZER_VERSION, SOURCE_HASH_FIELD, ingredients_hash
+
+NORMALIZED_FIELDS = ('item_canonical', 'unit_canonical', 'qty_low', 'qty_high', 'is_equipment')
+VERSION_FIELD = 'normalizer_version'
+
+
+def json_number(value: Optional[Fraction]) -> Union[int, float, None]:
+    """Exact integers stay ints ("2", not 2.0); other amounts become floats."""
+    if value is None:
+        return None
+    if value.denominator == 1:
+        return int(value)
+    return float(value)
+
+
+def normalized_ingredient(ing: Dict) -> Dict:
+    """The ingredient with its canonical fields set (a new dict)."""
+    # Imported here so build_assets can use strip_recipe without loading the nutrition tables
+    from add_nutrition import canonical_fields
+
+    item, unit, low, high, equipment = canonical_fields(
+        ing.get('item', ''), ing.get('unit', ''), ing.get('quantity', ''))
+    return {
+        **ing,
+        'item_canonical': item,
+        'unit_canonical': unit,
+        'qty_low': json_number(low),
+        'qty_high': json_number(high),
+        'is_equipment': equipment,
+    }
+
+
+def normalize_recipe(recipe: Dict) -> Dict:
+    """
+    The recipe with current normalized ingredient fields. Returns the same
+    object if nothing changed, otherwise a copy (the input is not modified,
+    so shard contents already loaded by RecipeStore still compare as old).
+    """
+    ingredients = recipe.get('ingredients')
+    if not isinstance(ingredients, list):
+        return recipe
+    updated = [normalized_ingredient(ing) if isinstance(ing, dict) else ing for ing in ingredients]
+    source_hash = ingredients_hash(ingredients)
+    if (updated == ingredients and recipe.get(VERSION_FIELD) == NORMALIZER_VERSION
+            and recipe.get(SOURCE_HASH_FIELD) == source_hash):
+        return recipe
+    return {**recipe, 'ingredients': updated, VERSION_FIELD: NORMALIZER_VERSION,
+            SOURCE_HASH_FIELD: source_hash}
+
+
+def strip_recipe(recipe: Dict) -> Dict:
+    """The recipe without stored normalized fields (same object if it has none)."""
+    if VERSION_FIELD not in recipe and SOURCE_HASH_FIELD not in recipe and not any(
+            isinstance(ing, dict) and 'item_canonical' in ing for ing in recipe.get('ingredients') or []):
+        return recipe
+    stripped = {k: v for k, v in recipe.items() if k not in (VERSION_FIELD, SOURCE_HASH_FIELD)}
+    if isinstance(recipe.get('ingredients'), list):
+        stripped['ingredients'] = [
+            {k: v for k, v in ing.items() if k not in NORMALIZED_FIELDS} if isinstance(ing, dict) else ing
+            for ing in recipe['ingredients']
+        ]
+    return stripped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store normalized ingredient fields in the shards")
+    parser.add_argument('--check', action='store_true',
+                        help="Only report recipes whose stored fields are missing or stale")
+    parser.add_argument('--strip', action='store_true', help="Remove the stored fields")
+    args = parser.parse_args()
+
+    from recipe_store import RecipeStore
+
+    start = time.perf_counter()
+    store = RecipeStore(check_duplicates=False, normalize=False)
+    transform = strip_recipe if args.strip else normalize_recipe
+
+    total = 0
+    lines = 0
+    stale = []
+    for recipe in store.iter_recipes():
+        total += 1
+        lines += len(recipe.get('ingredients') or [])
+        updated = transform(recipe)
+        if updated is not recipe:
+            stale.append(recipe.get('id'))
+            if not args.check:
+                store.upsert(updated)
+    elapsed = time.perf_counter() - start
+
+    verb = "to strip" if args.strip else "stale"
+    print(f"{total} recipes, {lines} ingredient lines; {len(stale)} {verb} "
+          f"(normalizer version {NORMALIZER_VERSION}, {elapsed:.1f}s)")
+
+    if args.check:
+        for recipe_id in stale[:20]:
+            print(f"  {recipe_id}")
+        if len(stale) > 20:
+            print(f"  ... and {len(stale) - 20} more")
+        if stale:
+            print("Run: python scripts/normalize_ingredients.py")
+            sys.exit(1)
+        print("✓ Stored ingredient fields are current")
+        return
+
+    written = store.commit()
+    for shard_file in written:
+        print(f"Updated data/{shard_file}")
+    print(f"✓ {len(stale)} recipe(s) {'stripped' if args.strip else 'normalized'}; "
+          f"rewrote {len(written)} shard(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ Usage:
     python scripts/optimize_images.py                    # Optimize all images
     python scripts/optimize_images.py --quality 80       # Custom quality (default: 85)
     python scripts/optimize_images.py --backup           # Keep .original files
+    python scripts/optimize_images.py --jobs 8           # Encode on 8 worker processes
 
 Key features:
 - Preserves dimensions (no resizing)
@@ -18,6 +19,8 @@ Key features:
 - Creates backup on first run (can be disabled)
 - Skips already-optimized images
 - Tracks optimization in manifest
+- Single encode per image: the size-estimate buffer is what gets written
+  (temp file + rename, EXIF preserved)
 
 Part of the Family Recipe Archive - Standalone Collection Repository
 """
@@ -29,6 +32,7 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 
 try:
@@ -55,11 +59,12 @@ class ImageOptimizer:
     """Optimizes JPEG images for repository storage."""
 
     def __init__(self, data_dir: Path, quality: int = DEFAULT_QUALITY,
-                 dry_run: bool = False, keep_backup: bool = False):
+                 dry_run: bool = False, keep_backup: bool = False, jobs: int = 1):
         self.data_dir = data_dir
         self.quality = quality
         self.dry_run = dry_run
         self.keep_backup = keep_backup
+        self.jobs = jobs
         self.manifest_path = data_dir / "optimization_manifest.json"
         self.manifest = self._load_manifest()
 
@@ -102,33 +107,89 @@ class ImageOptimizer:
                 return True
         return False
 
-    def estimate_savings(self, filepath: Path) -> Dict:
-        """Estimate savings without modifying the file."""
-        original_size = filepath.stat().st_size
-
+    def encode(self, filepath: Path) -> bytes:
+        """Encode an image at the configured quality (EXIF carried across)."""
         with Image.open(filepath) as img:
+            # Preserve EXIF if possible
+            exif = img.info.get('exif')
+
             # Convert to RGB if needed
             if img.mode in ('RGBA', 'P'):
                 img = img.convert('RGB')
 
+            save_kwargs = {
+                'quality': self.quality,
+                'optimize': True
+            }
+            if exif:
+                save_kwargs['exif'] = exif
+
             # Compress to buffer
             buffer = io.BytesIO()
-            img.save(buffer, 'JPEG', quality=self.quality, optimize=True)
-            optimized_size = buffer.tell()
+            img.save(buffer, 'JPEG', **save_kwargs)
+
+        return buffer.getvalue()
+
+    def estimate_savings(self, filepath: Path, keep_buffer: bool = False) -> Dict:
+        """
+        Estimate savings without modifying the file.
+
+        With keep_buffer, the encoded bytes are returned under "data" so the
+        caller can write them instead of encoding a second time.
+        """
+        original_size = filepath.stat().st_size
+
+        data = self.encode(filepath)
+        optimized_size = len(data)
 
         savings_bytes = original_size - optimized_size
         savings_percent = (savings_bytes / original_size) * 100 if original_size > 0 else 0
 
-        return {
+        estimate = {
             "original_size": original_size,
             "optimized_size": optimized_size,
             "savings_bytes": savings_bytes,
             "savings_percent": savings_percent,
             "worth_optimizing": savings_percent >= MIN_SAVINGS_PERCENT
         }
+        if keep_buffer:
+            estimate["data"] = data
+        return estimate
+
+    def write_atomic(self, filepath: Path, data: bytes):
+        """Replace filepath with data via a temp file + rename."""
+        tmp_path = filepath.with_name(f".{filepath.name}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(filepath, tmp_path)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
 
     def optimize_image(self, filepath: Path) -> Dict:
         """Optimize a single image file."""
+        # Check if already optimized
+        if self.is_already_optimized(filepath):
+            return {
+                "success": True,
+                "action": "skipped_already_optimized",
+                "original_size": 0,
+                "new_size": 0,
+                "savings_percent": 0,
+                "error": None
+            }
+
+        result = self._optimize_file(filepath)
+        self.record(filepath, result)
+        return result
+
+    def _optimize_file(self, filepath: Path) -> Dict:
+        """Estimate, and if worthwhile write, one image. Does not touch the manifest."""
         result = {
             "success": False,
             "action": None,
@@ -139,14 +200,8 @@ class ImageOptimizer:
         }
 
         try:
-            # Check if already optimized
-            if self.is_already_optimized(filepath):
-                result["action"] = "skipped_already_optimized"
-                result["success"] = True
-                return result
-
-            # Estimate savings first
-            estimate = self.estimate_savings(filepath)
+            # Encode once; the estimate buffer is the optimized file
+            estimate = self.estimate_savings(filepath, keep_buffer=True)
             result["original_size"] = estimate["original_size"]
 
             if not estimate["worth_optimizing"]:
@@ -169,34 +224,10 @@ class ImageOptimizer:
                 if not backup_path.exists():
                     shutil.copy2(filepath, backup_path)
 
-            # Optimize the image
-            with Image.open(filepath) as img:
-                # Preserve EXIF if possible
-                exif = img.info.get('exif')
-
-                if img.mode in ('RGBA', 'P'):
-                    img = img.convert('RGB')
-
-                # Save optimized version
-                save_kwargs = {
-                    'quality': self.quality,
-                    'optimize': True
-                }
-                if exif:
-                    save_kwargs['exif'] = exif
-
-                img.save(filepath, 'JPEG', **save_kwargs)
-
-            # Record in manifest
-            new_size = filepath.stat().st_size
-            key = str(filepath.relative_to(self.data_dir))
-            self.manifest["optimized_images"][key] = {
-                "original_size": estimate["original_size"],
-                "optimized_size": new_size,
-                "quality": self.quality,
-                "optimized_at": datetime.now().isoformat()
-            }
+            # Save optimized version
+            self.write_atomic(filepath, estimate["data"])
 
+            new_size = estimate["optimized_size"]
             result["action"] = "optimized"
             result["new_size"] = new_size
             result["savings_percent"] = ((estimate["original_size"] - new_size) /
@@ -209,6 +240,18 @@ class ImageOptimizer:
 
         return result
 
+    def record(self, filepath: Path, result: Dict):
+        """Record an optimized image in the manifest."""
+        if result["action"] != "optimized":
+            return
+        key = str(filepath.relative_to(self.data_dir))
+        self.manifest["optimized_images"][key] = {
+            "original_size": result["original_size"],
+            "optimized_size": result["new_size"],
+            "quality": self.quality,
+            "optimized_at": datetime.now().isoformat()
+        }
+
     def optimize_collection(self, collection_id: str) -> Dict:
         """Optimize all images in a collection."""
         if collection_id not in COLLECTIONS:
@@ -245,27 +288,53 @@ class ImageOptimizer:
             "new_bytes": 0
         }
 
-        for i, img_path in enumerate(sorted(images), 1):
-            print(f"[{i}/{len(images)}] {img_path.name}...", end=" ")
-
-            result = self.optimize_image(img_path)
-            stats["original_bytes"] += result.get("original_size", 0)
-
-            if result["action"] == "optimized":
-                stats["optimized"] += 1
-                stats["new_bytes"] += result["new_size"]
-                print(f"OK ({result['savings_percent']:.1f}% smaller)")
-            elif result["action"] == "would_optimize":
-                stats["optimized"] += 1
-                stats["new_bytes"] += result["new_size"]
-                print(f"WOULD SAVE {result['savings_percent']:.1f}%")
-            elif result["action"] in ["skipped_already_optimized", "skipped_minimal_savings"]:
-                stats["skipped"] += 1
-                stats["new_bytes"] += result.get("original_size", 0)
-                print("SKIP (already optimized or minimal savings)")
-            elif result["action"] == "error":
-                stats["errors"] += 1
-                print(f"ERROR: {result['error']}")
+        images = sorted(images)
+
+        # Manifest check in this process; only real work goes to the pool
+        already = {p for p in images if self.is_already_optimized(p)}
+        pending = [p for p in images if p not in already]
+
+        if self.jobs > 1 and len(pending) > 1:
+            # map() yields results in input order
+            pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_worker,
+                initargs=(self.data_dir, self.quality, self.dry_run, self.keep_backup)
+            )
+            fresh = pool.map(_optimize_worker, pending)
+        else:
+            pool = None
+            fresh = (self._optimize_file(p) for p in pending)
+
+        try:
+            for i, img_path in enumerate(images, 1):
+                if img_path in already:
+                    result = {"action": "skipped_already_optimized", "original_size": 0}
+                else:
+                    result = next(fresh)
+                    self.record(img_path, result)
+
+                print(f"[{i}/{len(images)}] {img_path.name}...", end=" ")
+                stats["original_bytes"] += result.get("original_size", 0)
+
+                if result["action"] == "optimized":
+                    stats["optimized"] += 1
+                    stats["new_bytes"] += result["new_size"]
+                    print(f"OK ({result['savings_percent']:.1f}% smaller)")
+                elif result["action"] == "would_optimize":
+                    stats["optimized"] += 1
+                    stats["new_bytes"] += result["new_size"]
+                    print(f"WOULD SAVE {result['savings_percent']:.1f}%")
+                elif result["action"] in ["skipped_already_optimized", "skipped_minimal_savings"]:
+                    stats["skipped"] += 1
+                    stats["new_bytes"] += result.get("original_size", 0)
+                    print("SKIP (already optimized or minimal savings)")
+                elif result["action"] == "error":
+                    stats["errors"] += 1
+                    print(f"ERROR: {result['error']}")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
 
         return stats
 
@@ -281,6 +350,21 @@ class ImageOptimizer:
         return all_stats
 
 
+# Per-process optimizer for --jobs workers (built once by the pool initializer)
+_worker_optimizer = None
+
+
+def _init_worker(data_dir: Path, quality: int, dry_run: bool, keep_backup: bool):
+    global _worker_optimizer
+    _worker_optimizer = ImageOptimizer(data_dir, quality=quality, dry_run=dry_run,
+                                       keep_backup=keep_backup)
+
+
+def _optimize_worker(filepath: Path) -> Dict:
+    """Process-pool entry point: estimate + write one image."""
+    return _worker_optimizer._optimize_file(filepath)
+
+
 def format_size(bytes_val: int) -> str:
     """Format bytes as human-readable size."""
     if bytes_val < 1024:
@@ -349,6 +433,12 @@ def main():
         action='store_true',
         help="Keep .original.jpeg backup files"
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help="Worker processes for encoding (0 = one per CPU)"
+    )
 
     args = parser.parse_args()
 
@@ -369,7 +459,8 @@ def main():
         data_dir,
         quality=args.quality,
         dry_run=args.dry_run,
-        keep_backup=args.backup
+        keep_backup=args.backup,
+        jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     )
 
     if args.dry_run:
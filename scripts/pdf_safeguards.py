@@ -16,6 +16,13 @@ Usage:
     python scripts/pdf_safeguards.py status            # Show PDF status
     python scripts/pdf_safeguards.py info <file>       # Get detailed PDF info
     python scripts/pdf_safeguards.py extract <file>    # Extract text from PDF
+    python scripts/pdf_safeguards.py extract <file> --jobs 4 --pages 1-100
+    python scripts/pdf_safeguards.py compact           # Fold journal into manifest
+    python scripts/pdf_safeguards.py --sqlite <command>     # Use data/manifests.sqlite (manifest_db.py)
+
+Status changes are appended to pdf_manifest.journal.jsonl (see
+manifest_journal.py) and compacted into pdf_manifest.json periodically and
+after every validate.
 
 The manifest file (pdf_manifest.json) helps AI assistants:
 - Skip known problematic PDFs
@@ -49,6 +56,7 @@ except ImportError:
     except ImportError:
         PYPDF_AVAILABLE = False
 
+from manifest_journal import ManifestJournal, move_stats
 
 # Configuration - Size limits
 MAX_FILE_SIZE_MB = 10           # Warn above this
@@ -68,6 +76,14 @@ STATUS_BROKEN = "broken"            # Cannot be read
 STATUS_EXTRACTED = "extracted"      # Text version available
 STATUS_PROCESSED = "processed"      # Recipe extraction complete
 
+COUNTED_STATUSES = [STATUS_VALID, STATUS_LARGE, STATUS_OVERSIZED, STATUS_BROKEN,
+                    STATUS_EXTRACTED, STATUS_PROCESSED]
+
+
+def stat_keys(status: str) -> List[str]:
+    """Stats counters (besides total) that a PDF with `status` counts towards."""
+    return [status] if status in COUNTED_STATUSES else []
+
 
 def bytes_to_mb(size_bytes: int) -> float:
     """Convert bytes to megabytes."""
@@ -82,13 +98,142 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes / 1024:.1f} KB"
 
 
+EXTRACT_CHUNK_PAGES = 8          # Pages per extraction work unit
+PAGE_RULE = "=" * 60
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def parse_page_range(spec: Optional[str], page_count: int) -> Tuple[int, int]:
+    """'A-B', 'A-', '-B' or 'N' -> inclusive 1-based (first, last) within the document."""
+    if not spec:
+        return 1, page_count
+    try:
+        if "-" in spec:
+            a, b = spec.split("-", 1)
+            first = int(a) if a.strip() else 1
+            last = int(b) if b.strip() else page_count
+        else:
+            first = last = int(spec)
+    except ValueError:
+        raise ValueError(f"Invalid page range '{spec}' (expected A-B)")
+    if not 1 <= first <= last <= page_count:
+        raise ValueError(f"Page range {spec} is outside 1-{page_count}")
+    return first, last
+
+
+def count_pages(pdf_path: Path, backend: str) -> int:
+    if backend == "pymupdf":
+        with fitz.open(str(pdf_path)) as doc:
+            return len(doc)
+    return len(PdfReader(str(pdf_path)).pages)
+
+
+def _extract_page_chunk(args) -> List[Tuple[int, str]]:
+    """Worker: open the PDF independently and return [(page_number, text)]."""
+    pdf_file, backend, first, last = args
+    if backend == "pymupdf":
+        with fitz.open(pdf_file) as doc:
+            return [(n, doc[n - 1].get_text()) for n in range(first, last + 1)]
+    reader = PdfReader(pdf_file)
+    return [(n, reader.pages[n - 1].extract_text() or "[No text on this page]")
+            for n in range(first, last + 1)]
+
+
+class ExtractionWriter:
+    """
+    Streams pages to <output>.partial in order, checkpointing after each page.
+
+    The checkpoint (<output>.checkpoint.json) records the last page written
+    and the partial file's size at that point; anything past it is truncated
+    on resume. It is tied to the PDF's size/mtime and the page range, so a
+    changed PDF or a different range starts over.
+    """
+
+    def __init__(self, pdf_path: Path, output_path: Path, page_count: int,
+                 first: int, last: int):
+        self.pdf_path = pdf_path
+        self.output_path = output_path
+        self.partial_path = output_path.with_name(output_path.name + ".partial")
+        self.checkpoint_path = output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+        self.page_count = page_count
+        self.first = first
+        self.last = last
+        self.done = 0
+        self.file = None
+        stat = pdf_path.stat()
+        self.source = {"pdf": pdf_path.name, "size": stat.st_size, "mtime": stat.st_mtime,
+                       "pages": [first, last]}
+
+    def resume(self) -> int:
+        """Open the partial file (resuming if a matching checkpoint exists); returns the next page."""
+        checkpoint = None
+        if self.checkpoint_path.exists() and self.partial_path.exists():
+            try:
+                with open(self.checkpoint_path, 'r') as f:
+                    checkpoint = json.load(f)
+            except json.JSONDecodeError:
+                checkpoint = None
+        if checkpoint and checkpoint.get("source") == self.source:
+            self.done = checkpoint["done"]
+            self.file = open(self.partial_path, 'r+', encoding='utf-8', newline='')
+            self.file.seek(checkpoint["bytes"])
+            self.file.truncate()
+            return self.done + 1
+
+        self.file = open(self.partial_path, 'w', encoding='utf-8', newline='')
+        self.file.write(f"# Text extracted from: {self.pdf_path.name}\n")
+        self.file.write(f"# Extracted: {datetime.now().isoformat()}\n")
+        self.file.write(f"# Pages: {self.page_count}\n")
+        if (self.first, self.last) != (1, self.page_count):
+            self.file.write(f"# Page range: {self.first}-{self.last}\n")
+        self.file.write("\n")
+        self._checkpoint(self.first - 1)
+        return self.first
+
+    def write_pages(self, pages: List[Tuple[int, str]]):
+        for number, text in pages:
+            if number <= self.done:
+                continue
+            self.file.write(f"\n{PAGE_RULE}\n")
+            self.file.write(f"PAGE {number}\n")
+            self.file.write(f"{PAGE_RULE}\n\n")
+            self.file.write(text)
+            self._checkpoint(number)
+
+    def _checkpoint(self, page: int):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done = page
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"source": self.source, "done": page, "bytes": self.file.tell()}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        """Publish the completed text file, drop the checkpoint and index its pages."""
+        self.close()
+        os.replace(self.partial_path, self.output_path)
+        self.checkpoint_path.unlink()
+
+        from text_pages import build_page_index
+        build_page_index(self.output_path)
+
+
 class PDFManifest:
     """Manages the PDF processing manifest for session resilience."""
 
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
         self.manifest_path = data_dir / MANIFEST_FILE
+        self.journal = ManifestJournal(self.manifest_path, "pdfs")
         self.manifest = self._load_manifest()
+        self.journal.replay(self.manifest)
+        self._update_stats()
 
     def _load_manifest(self) -> Dict:
         """Load existing manifest or create new one."""
@@ -124,15 +269,30 @@ class PDFManifest:
         }
 
     def save(self):
-        """Save manifest to disk."""
+        """Save the full manifest to disk (compacts the journal)."""
         self.manifest["last_updated"] = datetime.now().isoformat()
         self._update_stats()
+        self.journal.write_snapshot(self.manifest)
 
-        with open(self.manifest_path, 'w') as f:
-            json.dump(self.manifest, f, indent=2)
+    def compact(self):
+        """Fold journaled changes into pdf_manifest.json."""
+        self._update_stats()
+        self.journal.write_snapshot(self.manifest)
+
+    def _record(self, key: str, fields: Dict):
+        """Journal an update to one PDF and apply it, keeping stats current."""
+        old_status = self.manifest["pdfs"][key].get("status", STATUS_UNVALIDATED)
+        entry = {"op": "update", "key": key, "fields": fields, "at": datetime.now().isoformat()}
+        self.journal.append(entry)
+        self.journal.apply(self.manifest, entry)
+
+        new_status = self.manifest["pdfs"][key].get("status", STATUS_UNVALIDATED)
+        move_stats(self.manifest["stats"], stat_keys(old_status), stat_keys(new_status))
+        if self.journal.needs_compaction():
+            self.compact()
 
     def _update_stats(self):
-        """Update summary statistics."""
+        """Recompute summary statistics from scratch."""
         stats = {
             "total": 0,
             "valid": 0,
@@ -145,20 +305,8 @@ class PDFManifest:
 
         for pdf_data in self.manifest["pdfs"].values():
             stats["total"] += 1
-            status = pdf_data.get("status", STATUS_UNVALIDATED)
-
-            if status == STATUS_VALID:
-                stats["valid"] += 1
-            elif status == STATUS_LARGE:
-                stats["large"] += 1
-            elif status == STATUS_OVERSIZED:
-                stats["oversized"] += 1
-            elif status == STATUS_BROKEN:
-                stats["broken"] += 1
-            elif status == STATUS_EXTRACTED:
-                stats["extracted"] += 1
-            elif status == STATUS_PROCESSED:
-                stats["processed"] += 1
+            for key in stat_keys(pdf_data.get("status", STATUS_UNVALIDATED)):
+                stats[key] += 1
 
         self.manifest["stats"] = stats
 
@@ -374,6 +522,8 @@ class PDFManifest:
         print("\nPDF MANIFEST STATUS")
         print("=" * 40)
         print(f"Last updated: {self.manifest.get('last_updated', 'Never')}")
+        if self.journal and self.journal.entries:
+            print(f"Journal: {self.journal.entries} change(s) not yet compacted")
         print(f"\nPDF Files:")
         print(f"  Total:      {stats.get('total', 0)}")
         print(f"  Valid:      {stats.get('valid', 0)} (can read directly)")
@@ -395,88 +545,32 @@ class PDFManifest:
                 pages = pdf.get("page_count", "?")
                 print(f"  - {pdf['filename']}: [{pdf['status']}] {size}, {pages} pages")
 
-    def extract_text(self, filename: str) -> bool:
-        """Extract text from a PDF file."""
-        # Find the PDF
-        pdf_path = None
+    def find_pdf(self, filename: str) -> Optional[Path]:
+        """Locate a PDF by name (or path suffix) under the data directory."""
         for pdf in self.scan_pdfs():
             if pdf.name == filename or str(pdf).endswith(filename):
-                pdf_path = pdf
-                break
+                return pdf
+        return None
+
+    def extract_text(self, filename: str, jobs: int = 1,
+                     pages: Optional[str] = None) -> bool:
+        """
+        Extract text from a PDF file, optionally in parallel and/or for a page range.
 
+        Pages are split into EXTRACT_CHUNK_PAGES-page chunks handled by a
+        process pool (each worker opens its own PDF handle) and written in
+        page order as they arrive. Progress is checkpointed after every page,
+        so rerunning an interrupted extraction resumes where it stopped.
+        """
+        pdf_path = self.find_pdf(filename)
         if not pdf_path:
             print(f"PDF not found: {filename}")
             return False
 
-        output_path = pdf_path.with_suffix('.txt')
-
         if PYMUPDF_AVAILABLE:
-            try:
-                doc = fitz.open(str(pdf_path))
-                print(f"Extracting text from {pdf_path.name} ({len(doc)} pages)...")
-
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# Text extracted from: {pdf_path.name}\n")
-                    f.write(f"# Extracted: {datetime.now().isoformat()}\n")
-                    f.write(f"# Pages: {len(doc)}\n\n")
-
-                    for i, page in enumerate(doc):
-                        f.write(f"\n{'='*60}\n")
-                        f.write(f"PAGE {i + 1}\n")
-                        f.write(f"{'='*60}\n\n")
-                        f.write(page.get_text())
-
-                doc.close()
-                print(f"Saved to: {output_path}")
-
-                # Update manifest
-                key = str(pdf_path.relative_to(self.data_dir))
-                if key in self.manifest["pdfs"]:
-                    self.manifest["pdfs"][key]["status"] = STATUS_EXTRACTED
-                    self.manifest["pdfs"][key]["text_file"] = str(
-                        output_path.relative_to(self.data_dir)
-                    )
-                    self.save()
-
-                return True
-
-            except Exception as e:
-                print(f"Error extracting text: {e}")
-                return False
-
+            backend = "pymupdf"
         elif PYPDF_AVAILABLE:
-            try:
-                reader = PdfReader(str(pdf_path))
-                print(f"Extracting text from {pdf_path.name} ({len(reader.pages)} pages)...")
-
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# Text extracted from: {pdf_path.name}\n")
-                    f.write(f"# Extracted: {datetime.now().isoformat()}\n")
-                    f.write(f"# Pages: {len(reader.pages)}\n\n")
-
-                    for i, page in enumerate(reader.pages):
-                        f.write(f"\n{'='*60}\n")
-                        f.write(f"PAGE {i + 1}\n")
-                        f.write(f"{'='*60}\n\n")
-                        f.write(page.extract_text() or "[No text on this page]")
-
-                print(f"Saved to: {output_path}")
-
-                # Update manifest
-                key = str(pdf_path.relative_to(self.data_dir))
-                if key in self.manifest["pdfs"]:
-                    self.manifest["pdfs"][key]["status"] = STATUS_EXTRACTED
-                    self.manifest["pdfs"][key]["text_file"] = str(
-                        output_path.relative_to(self.data_dir)
-                    )
-                    self.save()
-
-                return True
-
-            except Exception as e:
-                print(f"Error extracting text: {e}")
-                return False
-
+            backend = "pypdf"
         else:
             print("No PDF library available. Install pymupdf or pypdf:")
             print("  pip install pymupdf")
@@ -484,15 +578,69 @@ class PDFManifest:
             print("  pip install pypdf")
             return False
 
+        try:
+            page_count = count_pages(pdf_path, backend)
+            first, last = parse_page_range(pages, page_count)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        except Exception as e:
+            print(f"Error extracting text: {e}")
+            return False
+
+        full = (first, last) == (1, page_count)
+        if full:
+            output_path = pdf_path.with_suffix('.txt')
+        else:
+            output_path = pdf_path.with_name(f"{pdf_path.stem}.pages-{first}-{last}.txt")
+
+        writer = ExtractionWriter(pdf_path, output_path, page_count, first, last)
+        todo = writer.resume()
+        if todo > first:
+            print(f"Resuming {pdf_path.name}: pages {first}-{writer.done} already extracted")
+        range_note = "" if full else f", pages {first}-{last}"
+        print(f"Extracting text from {pdf_path.name} ({page_count} pages{range_note}, "
+              f"{max(1, jobs)} job(s))...")
+
+        chunks = [(str(pdf_path), backend, start, min(start + EXTRACT_CHUNK_PAGES - 1, last))
+                  for start in range(todo, last + 1, EXTRACT_CHUNK_PAGES)]
+        try:
+            if jobs > 1 and len(chunks) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    # map() yields in submission order, so output stays in page order
+                    for chunk in pool.map(_extract_page_chunk, chunks):
+                        writer.write_pages(chunk)
+            else:
+                for args in chunks:
+                    writer.write_pages(_extract_page_chunk(args))
+            writer.finish()
+        except Exception as e:
+            writer.close()
+            print(f"Error extracting text: {e}")
+            print("Progress is checkpointed; run the same command again to resume.")
+            return False
+
+        print(f"Saved to: {output_path}")
+
+        # Update manifest (only a whole-document extraction counts as extracted)
+        key = str(pdf_path.relative_to(self.data_dir))
+        if full and key in self.manifest["pdfs"]:
+            self._record(key, {
+                "status": STATUS_EXTRACTED,
+                "text_file": str(output_path.relative_to(self.data_dir))
+            })
+
+        return True
+
     def mark_status(self, filename: str, status: str, notes: str = ""):
         """Mark a PDF with a specific status."""
         for key, data in self.manifest["pdfs"].items():
             if data.get("filename") == filename or key.endswith(filename):
-                data["status"] = status
-                data["status_updated"] = datetime.now().isoformat()
+                fields = {"status": status, "status_updated": datetime.now().isoformat()}
                 if notes:
-                    data["notes"] = notes
-                self.save()
+                    fields["notes"] = notes
+                self._record(key, fields)
                 print(f"Marked {filename} as {status}")
                 return True
 
@@ -501,6 +649,10 @@ class PDFManifest:
 
 
 def main():
+    use_sqlite = "--sqlite" in sys.argv
+    if use_sqlite:
+        sys.argv.remove("--sqlite")
+
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
@@ -515,7 +667,11 @@ def main():
         print(f"ERROR: Data directory not found: {data_dir}")
         sys.exit(1)
 
-    manifest = PDFManifest(data_dir)
+    if use_sqlite:
+        from manifest_db import SQLitePDFManifest
+        manifest = SQLitePDFManifest(data_dir)
+    else:
+        manifest = PDFManifest(data_dir)
 
     if command == "validate":
         manifest.validate_all()
@@ -556,10 +712,20 @@ def main():
         print(f"PDF not found: {filename}")
 
     elif command == "extract":
-        if len(sys.argv) < 3:
-            print("Usage: pdf_safeguards.py extract <filename>")
+        import argparse
+        parser = argparse.ArgumentParser(prog="pdf_safeguards.py extract")
+        parser.add_argument("filename")
+        parser.add_argument("--jobs", "-j", type=int, default=1,
+                            help="Worker processes (default 1)")
+        parser.add_argument("--pages", metavar="A-B", help="Only extract this page range")
+        args = parser.parse_args(sys.argv[2:])
+        if not manifest.extract_text(args.filename, jobs=args.jobs, pages=args.pages):
             sys.exit(1)
-        manifest.extract_text(sys.argv[2])
+
+    elif command == "compact":
+        pending = manifest.journal.entries if manifest.journal else 0
+        manifest.compact()
+        print(f"Compacted {pending} journaled change(s) into {manifest.manifest_path.name}")
 
     elif command == "mark":
         if len(sys.argv) < 4:
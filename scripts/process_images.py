@@ -12,6 +12,8 @@ Usage:
     python scripts/process_images.py                    # Process all images
     python scripts/process_images.py --dry-run          # Preview without changes
     python scripts/process_images.py --fix-broken       # Attempt recovery of broken images
+    python scripts/process_images.py --jobs 8           # Validate/resize/hash on 8 processes
+    python scripts/process_images.py --no-cache         # Reprocess even unchanged images
 
 Part of the Family Recipe Archive - Standalone Collection Repository
 """
@@ -20,9 +22,11 @@ import json
 import sys
 import os
 import hashlib
+import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 
 try:
@@ -33,11 +37,15 @@ except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
+from image_safeguards import check_image_integrity
+
 
 # Configuration
 MAX_DIMENSION = 2000  # Maximum pixels in any dimension
 JPEG_QUALITY = 92     # Quality for resized images (high quality for OCR)
 PROCESSED_FOLDER = "processed"  # Subfolder for resized images
+CACHE_FILE = "image_cache.json"  # Content-addressed processing cache (in data/)
+CACHE_VERSION = 1
 
 # Standalone collection configuration
 COLLECTION_ID = "mommom"
@@ -50,9 +58,13 @@ COLLECTIONS = {
 class ImageProcessor:
     """Handles image validation, resizing, and error recovery."""
 
-    def __init__(self, data_dir: Path, dry_run: bool = False):
+    def __init__(self, data_dir: Path, dry_run: bool = False, fix_broken: bool = False,
+                 jobs: int = 1, use_cache: bool = False):
         self.data_dir = data_dir
         self.dry_run = dry_run
+        self.fix_broken = fix_broken
+        self.jobs = jobs
+        self.cache = ProcessingCache(data_dir / CACHE_FILE, data_dir) if use_cache else None
         self.results = {
             "processed": [],
             "skipped": [],
@@ -99,8 +111,9 @@ class ImageProcessor:
 
         try:
             with Image.open(image_path) as img:
-                # Try to load the image data (catches truncated files)
-                img.load()
+                # Dimensions come from the header; only decode if the file
+                # lacks its end marker (catches truncated files)
+                check_image_integrity(img, image_path)
 
                 result["width"] = img.width
                 result["height"] = img.height
@@ -171,27 +184,40 @@ class ImageProcessor:
             with Image.open(image_path) as img:
                 result["original_size"] = (img.width, img.height)
 
-                # Handle EXIF orientation
+                # EXIF orientation (read from the header, applied after decode)
+                orientation = None
                 try:
                     exif = img._getexif()
                     if exif:
                         for tag, value in exif.items():
                             if ExifTags.TAGS.get(tag) == 'Orientation':
-                                if value == 3:
-                                    img = img.rotate(180, expand=True)
-                                elif value == 6:
-                                    img = img.rotate(270, expand=True)
-                                elif value == 8:
-                                    img = img.rotate(90, expand=True)
+                                orientation = value
                                 break
                 except Exception:
                     pass  # EXIF handling failed, continue with original orientation
 
-                # Calculate new dimensions
-                ratio = min(MAX_DIMENSION / img.width, MAX_DIMENSION / img.height)
+                # Calculate new dimensions (in the upright orientation)
+                width, height = img.width, img.height
+                if orientation in (6, 8):
+                    width, height = height, width
+                ratio = min(MAX_DIMENSION / width, MAX_DIMENSION / height)
+
+                if ratio < 1:
+                    # JPEG draft mode: let the decoder downscale by 1/2, 1/4 or 1/8
+                    # (never below the target), so the full 12 MP frame is never
+                    # materialized; LANCZOS does the final, exact resize.
+                    img.draft(img.mode, (int(img.width * ratio), int(img.height * ratio)))
+
+                if orientation == 3:
+                    img = img.rotate(180, expand=True)
+                elif orientation == 6:
+                    img = img.rotate(270, expand=True)
+                elif orientation == 8:
+                    img = img.rotate(90, expand=True)
+
                 if ratio < 1:
-                    new_width = int(img.width * ratio)
-                    new_height = int(img.height * ratio)
+                    new_width = int(width * ratio)
+                    new_height = int(height * ratio)
 
                     # High-quality downscaling for OCR readability
                     img_resized = img.resize(
@@ -273,6 +299,44 @@ class ImageProcessor:
         except Exception:
             return ""
 
+    def process_file(self, image_file: Path, processed_path: Path,
+                     file_hash: Optional[str] = None) -> Dict:
+        """
+        Validate, resize (if needed) and hash one image.
+
+        Returns the processing-log entry. Self-contained so it can run in a
+        worker process.
+        """
+        validation = self.validate_image(image_file)
+
+        detail = {
+            "filename": image_file.name,
+            "file_hash": file_hash or self.get_file_hash(image_file),
+            "validation": validation,
+            "action": None,
+            "result": None
+        }
+
+        if not validation["valid"]:
+            detail["action"] = "error"
+
+            if self.fix_broken and validation["recoverable"]:
+                recovery = self.attempt_recovery(image_file, processed_path / image_file.name)
+                detail["result"] = recovery
+                if recovery["success"]:
+                    detail["action"] = "recovered"
+
+        elif validation["needs_resize"]:
+            output_file = processed_path / image_file.name
+            resize_result = self.resize_image(image_file, output_file)
+            detail["result"] = resize_result
+            detail["action"] = "resized" if resize_result["success"] else "resize_failed"
+
+        else:
+            detail["action"] = "skipped"
+
+        return detail
+
     def process_collection(self, collection_id: str) -> Dict:
         """Process all images in a collection."""
         if collection_id not in COLLECTIONS:
@@ -307,58 +371,84 @@ class ImageProcessor:
             "details": []
         }
 
-        for i, image_file in enumerate(sorted(image_files), 1):
-            print(f"[{i}/{len(image_files)}] {image_file.name}...", end=" ")
-
-            # Validate
-            validation = self.validate_image(image_file)
+        image_files = sorted(image_files)
+
+        # Cache pass: stat prefilter, then source hash + parameters lookup.
+        # Unchanged images are answered without reading any pixels.
+        cached = {}
+        hashes = {}
+        if self.cache is not None:
+            for image_file in image_files:
+                file_hash = self.cache.source_hash(image_file, self.get_file_hash)
+                hashes[image_file] = file_hash
+                detail = self.cache.lookup(image_file, file_hash, processed_path,
+                                           self.fix_broken, self.dry_run)
+                if detail is not None:
+                    cached[image_file] = detail
+        pending = [f for f in image_files if f not in cached]
+        if cached:
+            print(f"Cache: {len(cached)} unchanged, {len(pending)} to process\n")
+
+        if self.jobs > 1 and len(pending) > 1:
+            # Fan out across processes; map() yields results in input order
+            pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_worker,
+                initargs=(self.data_dir, self.dry_run, self.fix_broken)
+            )
+            fresh = pool.map(_process_file_worker, pending, [processed_path] * len(pending),
+                             [hashes.get(f) for f in pending])
+        else:
+            pool = None
+            fresh = (self.process_file(f, processed_path, hashes.get(f)) for f in pending)
 
-            detail = {
-                "filename": image_file.name,
-                "validation": validation,
-                "action": None,
-                "result": None
-            }
-
-            if not validation["valid"]:
-                print(f"ERROR: {validation['error']}")
-                results["errors"].append({
-                    "file": image_file.name,
-                    "error": validation["error"],
-                    "recoverable": validation["recoverable"]
-                })
-                detail["action"] = "error"
-
-            elif validation["needs_resize"]:
-                print(f"RESIZING ({validation['width']}x{validation['height']})...", end=" ")
-
-                output_file = processed_path / image_file.name
-                resize_result = self.resize_image(image_file, output_file)
-
-                if resize_result["success"]:
-                    results["resized"] += 1
-                    results["valid"] += 1
-                    print(f"OK -> {resize_result['new_size'][0]}x{resize_result['new_size'][1]}")
-                    detail["action"] = "resized"
-                    detail["result"] = resize_result
+        try:
+            for i, image_file in enumerate(image_files, 1):
+                if image_file in cached:
+                    detail = cached[image_file]
+                    suffix = " [cached]"
                 else:
-                    print(f"FAILED: {resize_result['error']}")
-                    results["errors"].append({
-                        "file": image_file.name,
-                        "error": f"Resize failed: {resize_result['error']}"
-                    })
-                    detail["action"] = "resize_failed"
-                    detail["result"] = resize_result
-            else:
-                results["valid"] += 1
-                results["skipped"] += 1
-                print(f"OK ({validation['width']}x{validation['height']}, no resize needed)")
-                detail["action"] = "skipped"
-
-            results["details"].append(detail)
-
+                    detail = next(fresh)
+                    suffix = ""
+                    if self.cache is not None and not self.dry_run:
+                        self.cache.store(image_file, detail, processed_path)
+                print(f"[{i}/{len(image_files)}] {image_file.name}... {describe_detail(detail)}{suffix}")
+                self._tally(results, detail)
+                results["details"].append(detail)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if self.cache is not None and not self.dry_run:
+                self.cache.save()
         return results
 
+    @staticmethod
+    def _tally(results: Dict, detail: Dict):
+        """Fold one image's processing-log entry into the collection results."""
+        action = detail["action"]
+        validation = detail["validation"]
+
+        if action in ("error", "recovered"):
+            error = {
+                "file": detail["filename"],
+                "error": validation["error"],
+                "recoverable": validation["recoverable"]
+            }
+            if action == "recovered":
+                error["recovered"] = True
+            results["errors"].append(error)
+        elif action == "resized":
+            results["resized"] += 1
+            results["valid"] += 1
+        elif action == "resize_failed":
+            results["errors"].append({
+                "file": detail["filename"],
+                "error": f"Resize failed: {detail['result']['error']}"
+            })
+        else:
+            results["valid"] += 1
+            results["skipped"] += 1
+
     def process_all_collections(self) -> Dict:
         """Process all configured collections."""
         all_results = {}
@@ -371,8 +461,167 @@ class ImageProcessor:
         return all_results
 
 
-def generate_processing_log(results: Dict, output_path: Path):
-    """Generate a JSON log of processing results."""
+# Per-process processor for --jobs workers (built once by the pool initializer)
+_worker_processor = None
+
+
+def _init_worker(data_dir: Path, dry_run: bool, fix_broken: bool):
+    global _worker_processor
+    _worker_processor = ImageProcessor(data_dir, dry_run=dry_run, fix_broken=fix_broken)
+
+
+def _process_file_worker(image_file: Path, processed_path: Path,
+                         file_hash: Optional[str]) -> Dict:
+    """Process-pool entry point for ImageProcessor.process_file."""
+    return _worker_processor.process_file(image_file, processed_path, file_hash)
+
+
+def describe_detail(detail: Dict) -> str:
+    """Console status text for a processing-log entry."""
+    validation = detail["validation"]
+    result = detail["result"]
+    action = detail["action"]
+
+    if action in ("error", "recovered"):
+        message = f"ERROR: {validation['error']}"
+        if action == "recovered":
+            size = result["recovered_size"]
+            message += f" -> RECOVERED ({size[0]}x{size[1]})"
+        elif result:
+            message += f" -> recovery failed: {result['error']}"
+        return message
+
+    if action in ("resized", "resize_failed"):
+        message = f"RESIZING ({validation['width']}x{validation['height']})... "
+        if action == "resized":
+            return message + f"OK -> {result['new_size'][0]}x{result['new_size'][1]}"
+        return message + f"FAILED: {result['error']}"
+
+    return f"OK ({validation['width']}x{validation['height']}, no resize needed)"
+
+
+class ProcessingCache:
+    """
+    Content-addressed processing cache (data/image_cache.json).
+
+    Maps source MD5 + processing parameters to the validation result, action
+    and output, so unchanged photos are never re-decoded. A (mtime, size)
+    prefilter per file avoids even re-hashing files that have not been touched.
+    """
+
+    def __init__(self, path: Path, data_dir: Path):
+        self.path = path
+        self.data_dir = data_dir
+        self.files = {}      # relative path -> {"mtime_ns", "size", "hash"}
+        self.entries = {}    # "<md5>:<params>" -> {"validation", "action", "result", "output"}
+        self.dirty = False
+
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.files = data.get("files", {})
+                    self.entries = data.get("entries", {})
+            except (json.JSONDecodeError, OSError):
+                pass  # Unreadable cache - start over
+
+    @staticmethod
+    def params_key() -> str:
+        """Processing parameters that affect the output."""
+        return f"max{MAX_DIMENSION}-q{JPEG_QUALITY}"
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.data_dir).as_posix()
+
+    def source_hash(self, image_file: Path, hasher) -> str:
+        """MD5 of the source, reused from the cache when mtime and size are unchanged."""
+        rel = self._rel(image_file)
+        st = image_file.stat()
+        known = self.files.get(rel)
+        if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+            return known["hash"]
+
+        file_hash = hasher(image_file)
+        self.files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": file_hash}
+        self.dirty = True
+        return file_hash
+
+    def lookup(self, image_file: Path, file_hash: str, processed_path: Path,
+               fix_broken: bool = False, dry_run: bool = False) -> Optional[Dict]:
+        """Return a cached processing-log entry, or None if the image must be processed."""
+        entry = self.entries.get(f"{file_hash}:{self.params_key()}")
+        if not file_hash or entry is None:
+            return None
+
+        action, result = entry["action"], entry["result"]
+        if action == "error" and fix_broken and entry["validation"]["recoverable"]:
+            return None  # Recovery not attempted last time
+        if action == "recovered" and not fix_broken:
+            # Recovered on a --fix-broken run; without the flag it's just the error
+            action, result = "error", None
+
+        if action in ("resized", "recovered"):
+            # The processed copy must still exist; identical content under
+            # another name is copied instead of re-encoded.
+            output_file = processed_path / image_file.name
+            if not output_file.exists():
+                source = self.data_dir / entry["output"]
+                if dry_run or not source.exists():
+                    return None
+                shutil.copyfile(source, output_file)
+
+        return {
+            "filename": image_file.name,
+            "file_hash": file_hash,
+            "validation": entry["validation"],
+            "action": action,
+            "result": result
+        }
+
+    def store(self, image_file: Path, detail: Dict, processed_path: Path):
+        """Record a freshly processed image."""
+        if not detail.get("file_hash") or detail["action"] == "resize_failed":
+            return
+        self.entries[f"{detail['file_hash']}:{self.params_key()}"] = {
+            "validation": detail["validation"],
+            "action": detail["action"],
+            "result": detail["result"],
+            "output": self._rel(processed_path / image_file.name)
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed."""
+        if not self.dirty:
+            return
+        data = {"version": CACHE_VERSION, "files": self.files, "entries": self.entries}
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def latest_processing_log(data_dir: Path) -> Optional[Dict]:
+    """Load the most recent processing_log_*.json, if any."""
+    logs = sorted(data_dir.glob("processing_log_*.json"))
+    if not logs:
+        return None
+    try:
+        with open(logs[-1], 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def generate_processing_log(results: Dict, output_path: Path) -> bool:
+    """
+    Generate a JSON log of processing results.
+
+    Skipped (returns False) when the results are identical to the most recent
+    log, so no-change runs don't accumulate duplicate logs.
+    """
     log = {
         "processing_date": datetime.now().isoformat(),
         "max_dimension": MAX_DIMENSION,
@@ -397,10 +646,19 @@ def generate_processing_log(results: Dict, output_path: Path):
         "total_errors": total_errors
     }
 
+    previous = latest_processing_log(output_path.parent)
+    if previous is not None:
+        previous.pop("processing_date", None)
+        current = json.loads(json.dumps({k: v for k, v in log.items() if k != "processing_date"}))
+        if previous == current:
+            print("\nNo changes since the last processing log - not writing a new one")
+            return False
+
     with open(output_path, 'w') as f:
         json.dump(log, f, indent=2)
 
     print(f"\nProcessing log saved to: {output_path}")
+    return True
 
 
 def print_summary(results: Dict):
@@ -440,6 +698,17 @@ def main():
         action='store_true',
         help="Attempt to recover broken/corrupted images"
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help="Worker processes for validate/resize/hash (0 = one per CPU)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f"Ignore data/{CACHE_FILE} and reprocess every image"
+    )
 
     args = parser.parse_args()
 
@@ -451,7 +720,9 @@ def main():
         print(f"ERROR: Data directory not found: {data_dir}")
         sys.exit(1)
 
-    processor = ImageProcessor(data_dir, dry_run=args.dry_run)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    processor = ImageProcessor(data_dir, dry_run=args.dry_run, fix_broken=args.fix_broken,
+                               jobs=jobs, use_cache=not args.no_cache)
 
     if args.dry_run:
         print("\n*** DRY RUN MODE - No files will be modified ***\n")
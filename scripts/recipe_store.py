@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Recipe Store for MomMom's Kitchen (Standalone Collection)
+
+Shared read/write access to the sharded recipe collection. The website runs
+from data/recipes-index.json plus one data/recipes-{category}.json shard per
+category; the monolithic recipes.json no longer exists.
+
+RecipeStore keeps an id -> shard index (from recipes-index.json), buffers
+upserts, and on commit() rewrites only the shards whose members changed,
+patching the index in place. Every file is written atomically (temp file +
+rename), so an ingest batch costs O(changed shards) instead of a full rewrite.
+
+Before writing, commit() runs a near-duplicate check (near_duplicates.py,
+MinHash + LSH) on recipes with new ids and prints any likely duplicates or
+variants of existing recipes. It only warns; pass check_duplicates=False to
+skip it. The committed recipes' signatures come from
+data/near_duplicate_cache.json, so the check also only reads and re-signs
+shards changed since the last check (the first check signs everything once).
+
+commit() also stores normalized ingredient fields (item_canonical,
+unit_canonical, qty_low/qty_high, is_equipment; see normalize_ingredients.py)
+on every upserted recipe, so ingested recipes never need re-normalizing.
+Pass normalize=False to write recipes exactly as given.
+
+Usage (from an add_* script):
+    from recipe_store import RecipeStore
+
+    store = RecipeStore()
+    for recipe in NEW_RECIPES:
+        if recipe['id'] not in store:
+            store.add(recipe)
+    store.commit()
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import copy
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Set
+
+import create_shards
+from create_shards import LEDGER_VERSION, shard_file_for
+
+
+class RecipeStore:
+    """Batched, shard-aware recipe upserts with an id -> shard index."""
+
+    def __init__(self, check_duplicates: bool = True, normalize: bool = True):
+        self.check_duplicates = check_duplicates
+        self.normalize = normalize
+        self.data_dir = create_shards.DATA_DIR
+        self.index_data = create_shards.load_index()
+        if self.index_data is None:
+            raise FileNotFoundError(
+                f"{create_shards.INDEX_FILE} not found - run scripts/create_shards.py first"
+            )
+
+        # The ledger is optional; without it, changes are detected by comparing
+        # against the shard contents and no ledger is written back.
+        self.ledger = create_shards.load_ledger()
+        self._has_ledger = self.ledger is not None
+        if not self._has_ledger:
+            self.ledger = {'version': LEDGER_VERSION, 'recipes': {}, 'shards': {}}
+
+        self._saved_meta = copy.deepcopy(self.index_data['meta'])
+        self.plan = self.index_data['meta'].get('shard_plan')
+        self.shard_of = {e['id']: shard_file_for(e, self.plan) for e in self.index_data['recipes']}
+        self._shards = {}     # shard file -> loaded shard data
+        self._upserts = {}    # recipe id -> recipe
+        self._removals = set()
+
+    # -- Reading -----------------------------------------------------------
+
+    def __contains__(self, recipe_id: str) -> bool:
+        if recipe_id in self._upserts:
+            return True
+        return recipe_id in self.shard_of and recipe_id not in self._removals
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def ids(self) -> Set[str]:
+        """All recipe ids, including pending (uncommitted) changes."""
+        return (set(self.shard_of) - self._removals) | set(self._upserts)
+
+    @property
+    def meta(self) -> Dict:
+        """Collection metadata from recipes-index.json (editable before commit)."""
+        return self.index_data['meta']
+
+    def shard_files(self) -> List[str]:
+        """Shard filenames (relative to data/) listed in the index manifest."""
+        return [s['file'] for s in self.index_data.get('shards', [])]
+
+    def load_shard(self, shard_file: str) -> Dict:
+        """Load (and cache) a shard file."""
+        if shard_file not in self._shards:
+            path = os.path.join(self.data_dir, shard_file)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    self._shards[shard_file] = json.load(f)
+            else:
+                self._shards[shard_file] = {'meta': {}, 'recipes': []}
+        return self._shards[shard_file]
+
+    def get(self, recipe_id: str) -> Optional[Dict]:
+        """Return the full recipe (pending changes win), or None."""
+        if recipe_id in self._upserts:
+            return self._upserts[recipe_id]
+        if recipe_id in self._removals or recipe_id not in self.shard_of:
+            return None
+        for r in self.load_shard(self.shard_of[recipe_id]).get('recipes', []):
+            if r.get('id') == recipe_id:
+                return r
+        return None
+
+    def iter_recipes(self) -> Iterator[Dict]:
+        """Yield every committed recipe, shard by shard."""
+        for shard_file in self.shard_files():
+            yield from self.load_shard(shard_file).get('recipes', [])
+
+    # -- Writing -----------------------------------------------------------
+
+    def upsert(self, recipe: Dict):
+        """Insert or replace a recipe (buffered until commit)."""
+        recipe_id = recipe['id']
+        self._removals.discard(recipe_id)
+        self._upserts[recipe_id] = recipe
+
+    def add(self, recipe: Dict) -> bool:
+        """Insert a recipe only if its id is new. Returns True if queued."""
+        if recipe['id'] in self:
+            return False
+        self.upsert(recipe)
+        return True
+
+    def near_duplicates(self) -> Dict[str, list]:
+        """
+        Pending recipes with new ids that look like near-duplicates of
+        committed (or earlier pending) recipes: {new id: [(id, similarity)]}.
+        """
+        new = [r for recipe_id, r in self._upserts.items() if recipe_id not in self.shard_of]
+        if not new:
+            return {}
+        from near_duplicates import (SIGNATURE_CACHE_NAME, NearDuplicateIndex, SignatureCache,
+                                     check_batch_against)
+        replaced = self._removals | set(self._upserts)
+        index = NearDuplicateIndex()
+        cache = SignatureCache(os.path.join(self.data_dir, SIGNATURE_CACHE_NAME))
+        for shard_file in self.shard_files():
+            path = os.path.join(self.data_dir, shard_file)
+            if not os.path.exists(path):
+                continue
+            rows = cache.entries(shard_file, create_shards.file_stat(path),
+                                 lambda: self.load_shard(shard_file).get('recipes', []))
+            for recipe_id, title, shingles, signature in rows:
+                if recipe_id not in replaced:
+                    index.add_signed(recipe_id, title, set(shingles), tuple(signature))
+        cache.prune(self.shard_files())
+        cache.save()
+        for recipe_id, r in self._upserts.items():
+            if recipe_id in self.shard_of:
+                index.add(r)
+        return check_batch_against(index, new)
+
+    def remove(self, recipe_id: str):
+        """Remove a recipe (buffered until commit)."""
+        self._upserts.pop(recipe_id, None)
+        if recipe_id in self.shard_of:
+            self._removals.add(recipe_id)
+
+    def commit(self) -> List[str]:
+        """
+        Write all pending changes. Returns the shard files rewritten.
+
+        Shards are written before the index, so an interrupted commit leaves
+        the shards authoritative; `create_shards.py --incremental` reconciles.
+        Edits to `meta` are written with the index, even if no recipe changed.
+        """
+        if not self._upserts and not self._removals:
+            self._save_meta()
+            return []
+
+        if self.check_duplicates:
+            from near_duplicates import print_batch_report
+            print_batch_report(self.near_duplicates())
+
+        if self.normalize and self._upserts:
+            from normalize_ingredients import normalize_recipe
+            self._upserts = {rid: normalize_recipe(r) for rid, r in self._upserts.items()}
+
+        written, changed = create_shards.patch_shards(
+            self._upserts, self._removals, self.index_data, self.ledger, self._shards
+        )
+        if changed:
+            self._saved_meta = copy.deepcopy(self.index_data['meta'])
+        else:
+            self._save_meta()
+        if self._has_ledger:
+            create_shards.save_ledger(self.ledger)
+
+        for recipe_id, recipe in self._upserts.items():
+            self.shard_of[recipe_id] = shard_file_for(recipe, self.plan)
+        for recipe_id in self._removals:
+            self.shard_of.pop(recipe_id, None)
+        for shard_file in written:
+            self._shards.pop(shard_file, None)
+        self._upserts.clear()
+        self._removals.clear()
+
+        return written
+
+    def _save_meta(self):
+        """Write the index if `meta` was edited since it was last written."""
+        if self.index_data['meta'] != self._saved_meta:
+            create_shards.write_index(self.index_data)
+            self._saved_meta = copy.deepcopy(self.index_data['meta'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Search Index for MomMom's Kitchen (Standalone Collection)
+
+Builds and queries data/search-index.json, a compact inverted index over the
+browse fields of data/recipes-index.json (title, description, attribution,
+tags). create_shards.py regenerates it whenever it writes the index, and
+script.js uses it so a keystroke in the search box intersects a few postings
+lists instead of scanning every recipe.
+
+Format:
+    {
+      "version": 1,
+      "doc_count": 2553,              # rows in recipes-index.json
+      "fields": [...],
+      "terms": ["apple", ...],        # sorted stemmed terms
+      "df": [42, ...],                # document frequency per term
+      "postings": [[3, 1, 17], ...]   # index rows, gap-encoded
+    }
+
+Postings are row numbers into recipes-index.json's "recipes" array, so the
+two files must be written together (create_shards.write_index does this).
+
+Tokenizing and stemming are mirrored in script.js (tokenizeSearch,
+stemSearchToken) - keep the two in sync and bump SEARCH_INDEX_VERSION when
+either changes.
+
+Usage:
+    python scripts/search_index.py "chocolate cake"   # Query (ids + titles)
+    python scripts/search_index.py --build            # Rebuild from the index
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_FIELDS = ['title', 'description', 'attribution', 'tags']
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(['a', 'an', 'and', 'the', 'of', 'with', 'in', 'for', 'to', 'or', 'on', 's'])
+
+# Light plural-folding stemmer: (suffix, replacement), first match wins.
+# Deliberately conservative ("cakes" -> "cake", "berries" -> "berry",
+# "tomatoes" -> "tomato") so stems stay readable prefixes for live search.
+STEM_RULES = [
+    ('ies', 'y'),
+    ('oes', 'o'),
+    ('sses', 'ss'),
+    ('ss', 'ss'),
+    ('us', 'us'),
+    ('is', 'is'),
+    ('s', ''),
+]
+MIN_STEM_LENGTH = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-folded alphanumeric tokens (stopwords dropped)."""
+    if not text:
+        return []
+    if text.isascii():
+        folded = text.lower()
+    else:
+        folded = unicodedata.normalize('NFKD', text)
+        folded = ''.join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return [t for t in TOKEN_PATTERN.findall(folded) if t not in STOPWORDS]
+
+
+@lru_cache(maxsize=None)
+def stem(token: str) -> str:
+    """Fold simple English plurals; leaves short tokens and numbers alone."""
+    for suffix, replacement in STEM_RULES:
+        if token.endswith(suffix):
+            base = token[:-len(suffix)]
+            if len(base) + len(replacement) < MIN_STEM_LENGTH or base.isdigit():
+                continue  # too short to fold this way ("pies" falls through to "pie")
+            return base + replacement
+    return token
+
+
+def entry_terms(entry: Dict) -> Set[str]:
+    """Distinct stemmed terms for one recipes-index.json entry."""
+    parts = [entry.get('title'), entry.get('description'), entry.get('attribution')]
+    parts.extend(entry.get('tags') or [])
+    return {stem(t) for part in parts if isinstance(part, str) for t in tokenize(part)}
+
+
+def build_search_index(index_entries: List[Dict]) -> Dict:
+    """Build the search-index.json structure from recipes-index.json entries."""
+    postings = {}
+    for row, entry in enumerate(index_entries):
+        for term in entry_terms(entry):
+            postings.setdefault(term, []).append(row)
+
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        rows = postings[term]
+        encoded.append([rows[0]] + [b - a for a, b in zip(rows, rows[1:])])
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'doc_count': len(index_entries),
+        'fields': SEARCH_FIELDS,
+        'terms': terms,
+        'df': [len(postings[t]) for t in terms],
+        'postings': encoded,
+    }
+
+
+class SearchIndex:
+    """Query API over search-index.json (rows map to recipes-index.json)."""
+
+    def __init__(self, search_data: Dict, index_entries: Optional[List[Dict]] = None):
+        if search_data.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {search_data.get('version')}")
+        if index_entries is not None and search_data['doc_count'] != len(index_entries):
+            raise ValueError("search-index.json is out of date with recipes-index.json "
+                             "(run scripts/create_shards.py)")
+        self.terms = search_data['terms']
+        self.df = search_data['df']
+        self._encoded = search_data['postings']
+        self._decoded = {}
+        self.doc_count = search_data['doc_count']
+        self.entries = index_entries
+
+    @classmethod
+    def load(cls, data_dir: Optional[str] = None) -> 'SearchIndex':
+        """Load search-index.json together with recipes-index.json."""
+        data_dir = data_dir or _default_data_dir()
+        with open(os.path.join(data_dir, 'search-index.json'), 'r') as f:
+            search_data = json.load(f)
+        with open(os.path.join(data_dir, 'recipes-index.json'), 'r') as f:
+            index_data = json.load(f)
+        if 'columnar' in index_data:
+            from create_shards import decode_columnar_index
+            index_data = decode_columnar_index(index_data)
+        return cls(search_data, index_data['recipes'])
+
+    def postings(self, term: str) -> List[int]:
+        """Rows containing an exact (already stemmed) term."""
+        i = bisect.bisect_left(self.terms, term)
+        if i == len(self.terms) or self.terms[i] != term:
+            return []
+        return self._postings_at(i)
+
+    def prefix_rows(self, prefix: str) -> Set[int]:
+        """Rows containing any term that starts with `prefix`."""
+        rows = set()
+        i = bisect.bisect_left(self.terms, prefix)
+        while i < len(self.terms) and self.terms[i].startswith(prefix):
+            rows.update(self._postings_at(i))
+            i += 1
+        return rows
+
+    def _postings_at(self, i: int) -> List[int]:
+        rows = self._decoded.get(i)
+        if rows is None:
+            rows, row = [], 0
+            for gap in self._encoded[i]:
+                row += gap
+                rows.append(row)
+            self._decoded[i] = rows
+        return rows
+
+    def search(self, query: str, prefix_last: bool = True) -> Optional[List[int]]:
+        """
+        Rows matching every query term (AND), in row order.
+
+        The last term is matched as a prefix when `prefix_last` is set, as the
+        site does while typing. Returns None if the query has no indexable
+        terms (only stopwords/punctuation) - callers fall back to a scan.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+
+        sets = []
+        for pos, token in enumerate(tokens):
+            if prefix_last and pos == len(tokens) - 1:
+                sets.append(self.prefix_rows(token) | self.prefix_rows(stem(token)))
+            else:
+                sets.append(set(self.postings(stem(token))))
+
+        # Intersect smallest first
+        sets.sort(key=len)
+        result = sets[0]
+        for s in sets[1:]:
+            if not result:
+                break
+            result = result & s
+        return sorted(result)
+
+    def search_ids(self, query: str, prefix_last: bool = True) -> Optional[List[str]]:
+        """Like search(), but returns recipe ids (needs the index entries)."""
+        rows = self.search(query, prefix_last)
+        if rows is None:
+            return None
+        return [self.entries[row]['id'] for row in rows]
+
+
+def _default_data_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild data/search-index.json")
+    parser.add_argument('query', nargs='?', help="Search text")
+    parser.add_argument('--build', action='store_true', help="Rebuild from recipes-index.json")
+    args = parser.parse_args()
+
+    if args.build:
+        import create_shards
+        index_data = create_shards.load_index()
+        if index_data is None:
+            print(f"ERROR: Cannot find {create_shards.INDEX_FILE}")
+            sys.exit(1)
+        search_data = build_search_index(index_data['recipes'])
+        create_shards.write_json(create_shards.SEARCH_INDEX_FILE, search_data, compact=True)
+        print(f"Wrote {create_shards.SEARCH_INDEX_FILE} "
+              f"({len(search_data['terms'])} terms, {search_data['doc_count']} recipes)")
+        return
+
+    if not args.query:
+        parser.print_help()
+        return
+
+    index = SearchIndex.load()
+    rows = index.search(args.query)
+    if rows is None:
+        print("No searchable terms in query")
+        return
+    for row in rows:
+        entry = index.entries[row]
+        print(f"  {entry['id']}: {entry['title']}")
+    print(f"\n{len(rows)} match(es)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Page Index for the Extracted Book Texts - MomMom's Kitchen (Standalone Collection)
+
+pdf_safeguards.py extract writes book text with a marker before every page:
+
+    ============================================================
+    PAGE 12
+    ============================================================
+
+This builds a small sidecar per text file (Foxfire-Book-2.txt ->
+Foxfire-Book-2.txt.pages.json) holding the byte range of every page, and
+reads pages through mmap, so "page 212 of Foxfire 4" or "every page that
+mentions sorghum" is a seek instead of reading and splitting megabytes.
+
+Files without page markers (FoxfireVol1.txt.html, an archive.org full-text
+page) are indexed as a single page covering the text body.
+
+Sidecars record the text file's size and mtime and are rebuilt
+automatically when stale; pdf_safeguards.py writes one after each
+extraction. They are not committed.
+
+Usage:
+    python scripts/text_pages.py build                          # Index every book text
+    python scripts/text_pages.py page Foxfire-Book-4.txt 212    # Print a page
+    python scripts/text_pages.py page Foxfire-Book-4.txt 210-214
+    python scripts/text_pages.py grep "sorghum|molasses"        # Hits with page numbers
+    python scripts/text_pages.py grep -i "persimmon" foxfire-three.txt
+
+    from text_pages import PageText
+    with PageText.open("data/Foxfire-Book-2.txt") as book:
+        text = book.page(212)
+        for hit in book.search(r"pawpaw"):
+            print(hit.page, hit.line)
+
+Part of the Family Recipe Archive - Standalone Collection Repository
+"""
+
+import argparse
+import bisect
+import html
+import json
+import mmap
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PAGE_INDEX_VERSION = 1
+PAGE_INDEX_SUFFIX = ".pages.json"
+BOOK_PATTERNS = ("*.txt", "*.txt.html")
+
+# "\n" + 60 "=" + "\nPAGE N\n" + 60 "=" + "\n\n", as written by pdf_safeguards.ExtractionWriter
+PAGE_MARKER = re.compile(rb'\n={60}\nPAGE (\d+)\n={60}\n\n')
+HTML_BODY = (re.compile(rb'<pre[^>]*>'), re.compile(rb'</pre>'))
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class Hit(NamedTuple):
+    page: int
+    offset: int          # Byte offset of the match in the file
+    match: str
+    line: str            # Whole line containing the match
+
+
+def index_path_for(text_path: Path) -> Path:
+    return text_path.with_name(text_path.name + PAGE_INDEX_SUFFIX)
+
+
+def scan_pages(buf) -> Tuple[List[int], List[int], List[int]]:
+    """(page numbers, text start offsets, text end offsets) for a text buffer."""
+    numbers, starts, ends = [], [], []
+    for m in PAGE_MARKER.finditer(buf):
+        if starts:
+            ends.append(m.start())
+        numbers.append(int(m.group(1)))
+        starts.append(m.end())
+    if starts:
+        ends.append(len(buf))
+        return numbers, starts, ends
+
+    # No markers: one page spanning the body (<pre>...</pre> for archive.org HTML)
+    start, end = 0, len(buf)
+    opening = HTML_BODY[0].search(buf)
+    if opening:
+        start = opening.end()
+        closing = HTML_BODY[1].search(buf, start)
+        if closing:
+            end = closing.start()
+    return [1], [start], [end]
+
+
+def build_page_index(text_path: Path) -> Dict:
+    """Scan a text file and write its .pages.json sidecar."""
+    stat = text_path.stat()
+    with open(text_path, 'rb') as f:
+        if stat.st_size == 0:
+            numbers, starts, ends = [1], [0], [0]
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                numbers, starts, ends = scan_pages(buf)
+
+    index = {
+        "version": PAGE_INDEX_VERSION,
+        "source": text_path.name,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "html": text_path.name.endswith(".html"),
+        "pages": numbers,
+        "starts": starts,
+        "ends": ends,
+    }
+    out = index_path_for(text_path)
+    tmp_path = out.with_name(out.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, out)
+    return index
+
+
+def load_page_index(text_path: Path) -> Dict:
+    """The sidecar for a text file, rebuilt if missing or stale."""
+    path = index_path_for(text_path)
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                index = json.load(f)
+            stat = text_path.stat()
+            if (index.get("version") == PAGE_INDEX_VERSION and index["size"] == stat.st_size
+                    and index["mtime"] == stat.st_mtime):
+                return index
+        except (json.JSONDecodeError, KeyError):
+            pass
+    return build_page_index(text_path)
+
+
+class PageText:
+    """mmap-backed page access to one extracted book text."""
+
+    def __init__(self, text_path: Path, index: Dict):
+        self.path = text_path
+        self.index = index
+        self.numbers = index["pages"]
+        self.starts = index["starts"]
+        self.ends = index["ends"]
+        self._row = {n: i for i, n in enumerate(self.numbers)}
+        self._sorted = all(a < b for a, b in zip(self.numbers, self.numbers[1:]))
+        self._file = open(text_path, 'rb')
+        if index["size"]:
+            self.buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buf = b""
+
+    @classmethod
+    def open(cls, text_path) -> 'PageText':
+        text_path = Path(text_path)
+        return cls(text_path, load_page_index(text_path))
+
+    def close(self):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def _decode(self, raw: bytes) -> str:
+        text = raw.decode('utf-8', errors='replace')
+        return html.unescape(text) if self.index.get("html") else text
+
+    def page(self, number: int) -> Optional[str]:
+        """Text of page `number` (as numbered in the file), or None."""
+        row = self._row.get(number)
+        if row is None:
+            return None
+        return self._decode(self.buf[self.starts[row]:self.ends[row]])
+
+    def pages(self, first: int, last: int) -> Iterator[Tuple[int, str]]:
+        """(number, text) for every page in first..last that exists."""
+        lo = bisect.bisect_left(self.numbers, first) if self._sorted else 0
+        for row in range(lo, len(self.numbers)):
+            number = self.numbers[row]
+            if self._sorted and number > last:
+                break
+            if first <= number <= last:
+                yield number, self._decode(self.buf[self.starts[row]:self.ends[row]])
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page number containing a byte offset (None for header/marker bytes)."""
+        row = bisect.bisect_right(self.starts, offset) - 1
+        if row >= 0 and offset < self.ends[row]:
+            return self.numbers[row]
+        return None
+
+    def search(self, pattern: str, ignore_case: bool = False) -> Iterator[Hit]:
+        """Regex hits over the whole file, each with its page number."""
+        regex = re.compile(pattern.encode('utf-8'), re.IGNORECASE if ignore_case else 0)
+        for m in regex.finditer(self.buf):
+            page = self.page_at(m.start())
+            if page is None:
+                continue
+            line_start = self.buf.rfind(b'\n', 0, m.start()) + 1
+            line_end = self.buf.find(b'\n', m.end())
+            if line_end == -1:
+                line_end = len(self.buf)
+            yield Hit(page, m.start(), self._decode(m.group(0)),
+                      self._decode(self.buf[line_start:line_end]).strip())
+
+
+def book_files(data_dir: Path = DATA_DIR) -> List[Path]:
+    """Extracted book texts in data/ (not the sidecars)."""
+    files = set()
+    for pattern in BOOK_PATTERNS:
+        files.update(data_dir.glob(pattern))
+    return sorted(files)
+
+
+def resolve(name: str) -> Path:
+    path = Path(name)
+    if path.exists():
+        return path
+    path = DATA_DIR / name
+    if path.exists():
+        return path
+    print(f"ERROR: Text file not found: {name}")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page index and page/regex lookup for book texts")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="Build (or refresh) .pages.json sidecars")
+    p.add_argument("files", nargs="*")
+
+    p = sub.add_parser("page", help="Print a page or page range")
+    p.add_argument("file")
+    p.add_argument("pages", help="N or A-B")
+
+    p = sub.add_parser("grep", help="Regex hits with page numbers")
+    p.add_argument("pattern")
+    p.add_argument("files", nargs="*")
+    p.add_argument("-i", "--ignore-case", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        files = [resolve(f) for f in args.files] or book_files()
+        for path in files:
+            index = build_page_index(path)
+            print(f"  {path.name}: {len(index['pages'])} page(s) -> {index_path_for(path).name}")
+
+    elif args.command == "page":
+        first, _, last = args.pages.partition("-")
+        first = int(first)
+        last = int(last) if last else first
+        with PageText.open(resolve(args.file)) as book:
+            found = False
+            for number, text in book.pages(first, last):
+                found = True
+                print(f"--- {book.path.name} page {number} ---")
+                print(text.rstrip())
+            if not found:
+                print(f"No page {args.pages} in {book.path.name}")
+
+    elif args.command == "grep":
+        files = [resolve(f) for f in args.files] or book_files()
+        total = 0
+        for path in files:
+            with PageText.open(path) as book:
+                for hit in book.search(args.pattern, args.ignore_case):
+                    print(f"{path.name}:p{hit.page}: {hit.line[:120]}")
+                    total += 1
+        print(f"\n{total} hit(s)")
+
+
+if __name__ == '__main__':
+    main()
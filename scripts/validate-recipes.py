@@ -1,27 +1,39 @@
 #!/usr/bin/env python3
 """
 Recipe Validation Script for MomMom's Kitchen (Standalone Collection)
-Validates recipes.json for schema compliance and common issues.
+Validates the sharded collection (data/recipes-index.json plus every
+data/recipes-{category}.json shard) for schema compliance, common issues,
+and index/shard consistency.
 
 Usage:
     python scripts/validate-recipes.py
-    python scripts/validate-recipes.py --strict  # Fail on warnings too
+    python scripts/validate-recipes.py --strict      # Fail on warnings too
+    python scripts/validate-recipes.py --jobs 4      # One process per shard
+    python scripts/validate-recipes.py --file batch.json  # A single {"recipes": [...]} file
 
 Part of the Family Recipe Archive - Standalone Collection Repository
 """
 
+import argparse
 import json
-import sys
+import os
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 
+from create_shards import (DATA_DIR, INDEX_FILE, SEARCH_INDEX_FILE, decode_columnar_index,
+                           index_entry_for, shard_file_for)
+from ingredient_line import is_normalized, parse_ingredient
+from search_index import build_search_index
+
 # Configuration
 REQUIRED_FIELDS = ['id', 'title', 'ingredients', 'instructions', 'category']
 OPTIONAL_FIELDS = ['attribution', 'source_note', 'description', 'servings_yield',
                    'prep_time', 'cook_time', 'total_time', 'temperature', 'pan_size',
                    'notes', 'tags', 'confidence', 'image_refs', 'page_continuation',
                    'conversions', 'nutrition', 'variant_of', 'variant_notes', 'canonical_id',
-                   'frosting', 'oven_directions']
+                   'frosting', 'oven_directions', 'normalizer_version', 'ingredients_hash']
 
 VALID_CATEGORIES = [
     # Core recipe categories
@@ -55,16 +67,62 @@ SANITY_LIMITS = {
     'baking powder': {'max_tbsp': 4},
 }
 
+# SANITY_LIMITS key -> unit substring checked against the ingredient's unit
+SANITY_UNITS = [('max_cups', 'cup', 'cups'), ('max_tbsp', 'tbsp', 'tbsp'), ('max_tsp', 'tsp', 'tsp')]
+
+
+def compile_sanity_limits(limits):
+    """
+    Precompile SANITY_LIMITS into one alternation regex (a fast reject for the
+    ~99% of ingredients that mention none of the items) plus, per item, its
+    (unit substring, max, label) rules in the order they were checked before.
+    """
+    pattern = re.compile('|'.join(re.escape(item) for item in limits))
+    rules = {
+        item: tuple((unit, item_limits[key], label)
+                    for key, unit, label in SANITY_UNITS if key in item_limits)
+        for item, item_limits in limits.items()
+    }
+    return pattern, rules
+
+
+SANITY_PATTERN, SANITY_RULES = compile_sanity_limits(SANITY_LIMITS)
+
+
+@lru_cache(maxsize=None)
+def sanity_rules_for(item):
+    """Rules for every SANITY_LIMITS entry contained in `item`, in table order."""
+    if not SANITY_PATTERN.search(item):
+        return ()
+    return tuple(rule for check_item, rules in SANITY_RULES.items()
+                 if check_item in item for rule in rules)
+
+
 # Temperature sanity (Fahrenheit)
 TEMP_MIN = 200
 TEMP_MAX = 550
 
 
+def is_non_recipe(recipe):
+    """
+    Guide/reference entries: a non-recipe category, or an entry with neither
+    ingredients nor instructions whose text lives in notes/content (e.g. a
+    page of short topping variations kept under its food category).
+    """
+    if recipe.get('category', '') in NON_RECIPE_CATEGORIES:
+        return True
+    return (not recipe.get('ingredients') and not recipe.get('instructions')
+            and bool(recipe.get('notes') or recipe.get('content')))
+
+
 class RecipeValidator:
-    def __init__(self, strict=False):
+    def __init__(self, strict=False, data_dir=DATA_DIR, shard_plan=None):
         self.strict = strict
+        self.data_dir = Path(data_dir)
+        self.shard_plan = shard_plan  # by_size plan from the index meta, if any
         self.errors = []
         self.warnings = []
+        self._listings = {}  # directory (relative to data/) -> set of entry names
 
     def error(self, recipe_id, message):
         self.errors.append(f"ERROR [{recipe_id}]: {message}")
@@ -75,13 +133,12 @@ class RecipeValidator:
     def validate_recipe(self, recipe):
         """Validate a single recipe."""
         recipe_id = recipe.get('id', 'UNKNOWN')
-        category = recipe.get('category', '')
-        is_non_recipe = category in NON_RECIPE_CATEGORIES
+        non_recipe = is_non_recipe(recipe)
 
         # Check required fields
         for field in REQUIRED_FIELDS:
             # Skip ingredients/instructions requirement for non-recipe categories
-            if is_non_recipe and field in ('ingredients', 'instructions'):
+            if non_recipe and field in ('ingredients', 'instructions'):
                 continue
             if field not in recipe or not recipe[field]:
                 self.error(recipe_id, f"Missing required field: {field}")
@@ -104,11 +161,15 @@ class RecipeValidator:
 
         # Validate ingredients
         if 'ingredients' in recipe:
-            self.validate_ingredients(recipe_id, recipe['ingredients'])
+            normalized = is_normalized(recipe)
+            if not normalized and 'normalizer_version' in recipe:
+                self.warn(recipe_id, "Stored normalized ingredient fields are stale "
+                                     "(run scripts/normalize_ingredients.py)")
+            self.validate_ingredients(recipe_id, recipe['ingredients'], normalized)
 
         # Validate instructions
         if 'instructions' in recipe:
-            self.validate_instructions(recipe_id, recipe['instructions'])
+            self.validate_instructions(recipe_id, recipe['instructions'], allow_empty=non_recipe)
 
         # Validate temperature
         if 'temperature' in recipe and recipe['temperature']:
@@ -126,8 +187,8 @@ class RecipeValidator:
         if 'conversions' in recipe and recipe['conversions']:
             self.validate_conversions(recipe_id, recipe['conversions'])
 
-    def validate_ingredients(self, recipe_id, ingredients):
-        """Validate ingredients list."""
+    def validate_ingredients(self, recipe_id, ingredients, normalized=False):
+        """Validate ingredients list (normalized: read the stored qty_high/unit_canonical)."""
         if not isinstance(ingredients, list):
             self.error(recipe_id, "Ingredients must be a list")
             return
@@ -145,49 +206,37 @@ class RecipeValidator:
             qty = ing.get('quantity', '')
             unit = ing.get('unit', '').lower()
 
-            self.check_quantity_sanity(recipe_id, item, qty, unit)
+            self.check_quantity_sanity(recipe_id, item, qty, unit, ing if normalized else None)
 
-    def check_quantity_sanity(self, recipe_id, item, qty, unit):
+    def check_quantity_sanity(self, recipe_id, item, qty, unit, stored=None):
         """Check if quantity seems reasonable."""
+        rules = sanity_rules_for(item)
+        if not rules:
+            return
         if not qty or qty == '' or '[UNCLEAR]' in str(qty):
             return
 
-        try:
-            # Handle fractions
-            if '/' in str(qty):
-                parts = str(qty).split()
-                if len(parts) == 2:  # e.g., "2 3/4"
-                    whole = float(parts[0])
-                    frac_parts = parts[1].split('/')
-                    qty_float = whole + float(frac_parts[0]) / float(frac_parts[1])
-                else:  # e.g., "3/4"
-                    frac_parts = str(qty).split('/')
-                    qty_float = float(frac_parts[0]) / float(frac_parts[1])
-            else:
-                qty_float = float(qty.replace('-', '.').split()[0])
-        except (ValueError, IndexError):
+        if stored is not None:
+            high, canonical_unit = stored['qty_high'], stored['unit_canonical']
+        else:
+            line = parse_ingredient(qty, unit, item)
+            high, canonical_unit = line.high, line.unit
+        if high is None:
             return  # Can't parse, skip check
 
-        for check_item, limits in SANITY_LIMITS.items():
-            if check_item in item:
-                if 'cup' in unit and 'max_cups' in limits:
-                    if qty_float > limits['max_cups']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_cups']} cups)")
-                if 'tbsp' in unit and 'max_tbsp' in limits:
-                    if qty_float > limits['max_tbsp']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tbsp']} tbsp)")
-                if 'tsp' in unit and 'max_tsp' in limits:
-                    if qty_float > limits['max_tsp']:
-                        self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limits['max_tsp']} tsp)")
-
-    def validate_instructions(self, recipe_id, instructions):
-        """Validate instructions list."""
+        for unit_part, limit, label in rules:
+            if unit_part in canonical_unit and high > limit:
+                self.warn(recipe_id, f"Suspicious: {qty} {unit} {item} (max expected: {limit} {label})")
+
+    def validate_instructions(self, recipe_id, instructions, allow_empty=False):
+        """Validate instructions list (allow_empty: guide/reference entries)."""
         if not isinstance(instructions, list):
             self.error(recipe_id, "Instructions must be a list")
             return
 
         if len(instructions) == 0:
-            self.error(recipe_id, "Instructions list is empty")
+            if not allow_empty:
+                self.error(recipe_id, "Instructions list is empty")
             return
 
         for i, inst in enumerate(instructions):
@@ -213,12 +262,32 @@ class RecipeValidator:
             self.error(recipe_id, "image_refs must be a list")
             return
 
-        data_dir = Path(__file__).parent.parent / 'data'
         for ref in image_refs:
-            img_path = data_dir / ref
-            if not img_path.exists():
+            if not self.data_file_exists(ref):
                 self.warn(recipe_id, f"Referenced image not found: {ref}")
 
+    def data_file_exists(self, ref):
+        """
+        Whether data/<ref> exists. Each directory under data/ is listed once
+        into a set, so ~2,000 refs cost a handful of listdir() calls, not stats.
+        """
+        rel = os.path.normpath(ref)
+        if os.path.isabs(rel) or rel == '.' or rel.startswith('..'):
+            return (self.data_dir / ref).exists()
+        parent, name = os.path.split(rel)
+        return name in self.listing(parent)
+
+    def listing(self, subdir=''):
+        """Entry names in data/<subdir>, read once and cached."""
+        names = self._listings.get(subdir)
+        if names is None:
+            try:
+                names = set(os.listdir(self.data_dir / subdir))
+            except OSError:
+                names = set()
+            self._listings[subdir] = names
+        return names
+
     def validate_nutrition(self, recipe_id, nutrition):
         """Validate nutrition data consistency."""
         status = nutrition.get('status')
@@ -257,9 +326,158 @@ class RecipeValidator:
 
         # Check variant references
         for recipe in recipes:
-            variant_of = recipe.get('variant_of')
-            if variant_of and variant_of not in ids_seen:
-                self.error(recipe.get('id'), f"variant_of references non-existent recipe: {variant_of}")
+            self.validate_variant_of(recipe.get('id'), recipe.get('variant_of'), ids_seen)
+
+    def validate_variant_of(self, recipe_id, variant_of, ids_seen):
+        """
+        variant_of may name a recipe in another Family Recipe Archive collection
+        (e.g. the same clipping in GrandmasRecipes), so a target that isn't in
+        this repository is only a warning.
+        """
+        if variant_of and variant_of not in ids_seen:
+            self.warn(recipe_id, f"variant_of target not in this collection "
+                                 f"(another family collection?): {variant_of}")
+
+    def validate_shard(self, shard_file):
+        """
+        Validate every recipe in one shard and check each belongs there.
+        Returns (recipe_id, variant_of, index_entry) rows for the cross-shard
+        checks, or None if the shard can't be read.
+        """
+        path = self.data_dir / shard_file
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.error(shard_file, "Shard listed in recipes-index.json does not exist")
+            return None
+        except json.JSONDecodeError as e:
+            self.error(shard_file, f"Invalid JSON - {e}")
+            return None
+
+        if not isinstance(data.get('recipes'), list):
+            self.error(shard_file, "Missing 'recipes' array in JSON")
+            return None
+
+        rows = []
+        for recipe in data['recipes']:
+            recipe_id = recipe.get('id', 'UNKNOWN')
+            self.validate_recipe(recipe)
+            expected_shard = shard_file_for(recipe, self.shard_plan)
+            if expected_shard != shard_file:
+                self.error(recipe_id, f"Recipe is in {shard_file} but belongs in {expected_shard}")
+            rows.append((recipe_id, recipe.get('variant_of'), index_entry_for(recipe, self.shard_plan)))
+
+        count = data.get('meta', {}).get('count')
+        if count is not None and count != len(rows):
+            self.error(shard_file, f"Shard meta count {count} != {len(rows)} recipes")
+        return rows
+
+    def validate_collection(self, index_data, jobs=1):
+        """
+        Validate all shards listed in recipes-index.json, then the cross-shard
+        rules (duplicate IDs, variant_of targets) and index/shard consistency.
+        Returns the number of recipes found in the shards.
+        """
+        shards = index_data.get('shards', [])
+        shard_files = [s['file'] for s in shards]
+        self.shard_plan = index_data.get('meta', {}).get('shard_plan')
+
+        if jobs > 1 and len(shard_files) > 1:
+            # Imported here: it's the slowest import and the serial run doesn't need it
+            from concurrent.futures import ProcessPoolExecutor
+            args = [(f, str(self.data_dir), self.shard_plan) for f in shard_files]
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_validate_shard_worker, args))
+        else:
+            results = [self._validate_shard_local(f) for f in shard_files]
+
+        shard_rows = {}
+        for shard_file, (errors, warnings, rows) in zip(shard_files, results):
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
+            shard_rows[shard_file] = rows
+
+        # Cross-shard checks
+        ids_seen = set()
+        entries = {}
+        for shard_file, rows in shard_rows.items():
+            for recipe_id, _, entry in rows or ():
+                if recipe_id in ids_seen:
+                    self.error(recipe_id, "Duplicate recipe ID")
+                ids_seen.add(recipe_id)
+                entries.setdefault(recipe_id, entry)
+        for rows in shard_rows.values():
+            for recipe_id, variant_of, _ in rows or ():
+                self.validate_variant_of(recipe_id, variant_of, ids_seen)
+
+        self.validate_index(index_data, shard_rows, entries)
+        self.validate_search_index(index_data)
+        return sum(len(rows or ()) for rows in shard_rows.values())
+
+    def _validate_shard_local(self, shard_file):
+        errors_before, warnings_before = len(self.errors), len(self.warnings)
+        rows = self.validate_shard(shard_file)
+        errors, warnings = self.errors[errors_before:], self.warnings[warnings_before:]
+        del self.errors[errors_before:], self.warnings[warnings_before:]
+        return errors, warnings, rows
+
+    def validate_index(self, index_data, shard_rows, entries):
+        """Check recipes-index.json agrees with the shards it describes."""
+        for shard in index_data.get('shards', []):
+            rows = shard_rows.get(shard['file'])
+            if rows is not None and shard.get('count') != len(rows):
+                self.error('INDEX', f"{shard['file']} listed with count {shard.get('count')}, shard has {len(rows)}")
+
+        # by_size plans are only refreshed by full rebuilds; flag drift
+        if self.shard_plan:
+            budget = self.shard_plan['budget']
+            for shard_file, rows in shard_rows.items():
+                if rows is None or len(rows) < 2:
+                    continue
+                size = os.path.getsize(self.data_dir / shard_file)
+                if size > budget * 1.5:
+                    self.warn('INDEX', f"{shard_file} is {size:,} bytes, over 1.5x the "
+                                       f"{budget:,} byte budget (run scripts/create_shards.py)")
+
+        listed = set(shard_rows)
+        for name in sorted(self.listing()):
+            if (name.startswith('recipes-') and name.endswith('.json')
+                    and name != os.path.basename(INDEX_FILE) and name not in listed):
+                self.warn('INDEX', f"Shard file not listed in recipes-index.json: {name}")
+
+        indexed = set()
+        for entry in index_data.get('recipes', []):
+            recipe_id = entry.get('id')
+            if recipe_id in indexed:
+                self.error(recipe_id, "Duplicate entry in recipes-index.json")
+            indexed.add(recipe_id)
+            if recipe_id not in entries:
+                self.error(recipe_id, "Indexed recipe not found in any shard")
+            elif entry != entries[recipe_id]:
+                self.error(recipe_id, "Index entry is out of date (run scripts/create_shards.py)")
+        for recipe_id in entries:
+            if recipe_id not in indexed:
+                self.error(recipe_id, "Recipe missing from recipes-index.json")
+
+        total = index_data.get('meta', {}).get('total_recipes')
+        if total is not None and total != len(entries):
+            self.warn('INDEX', f"meta.total_recipes is {total}, shards hold {len(entries)} recipes")
+
+    def validate_search_index(self, index_data):
+        """search-index.json postings point at index rows, so it must match exactly."""
+        name = os.path.basename(SEARCH_INDEX_FILE)
+        if name not in self.listing():
+            self.warn('INDEX', f"{name} is missing (run scripts/create_shards.py)")
+            return
+        try:
+            with open(self.data_dir / name, 'r', encoding='utf-8') as f:
+                search_data = json.load(f)
+        except json.JSONDecodeError as e:
+            self.error('INDEX', f"{name}: Invalid JSON - {e}")
+            return
+        if search_data != build_search_index(index_data.get('recipes', [])):
+            self.error('INDEX', f"{name} is out of date (run scripts/create_shards.py)")
 
     def report(self):
         """Print validation report."""
@@ -290,32 +508,62 @@ class RecipeValidator:
         return 0
 
 
-def main():
-    strict = '--strict' in sys.argv
+def _validate_shard_worker(args):
+    """Process-pool entry point: validate one shard in a fresh validator."""
+    shard_file, data_dir, shard_plan = args
+    validator = RecipeValidator(data_dir=data_dir, shard_plan=shard_plan)
+    rows = validator.validate_shard(shard_file)
+    return validator.errors, validator.warnings, rows
 
-    # Find recipes file
-    script_dir = Path(__file__).parent
-    recipes_file = script_dir.parent / 'data' / 'recipes.json'
 
-    if not recipes_file.exists():
-        print(f"ERROR: Cannot find {recipes_file}")
+def load_json(path):
+    """Load a JSON file, exiting with an error message if missing or invalid."""
+    if not os.path.exists(path):
+        print(f"ERROR: Cannot find {path}")
         sys.exit(1)
-
-    # Load and validate
-    print(f"Validating: {recipes_file}")
-
     try:
-        with open(recipes_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except json.JSONDecodeError as e:
         print(f"ERROR: Invalid JSON - {e}")
         sys.exit(1)
 
-    validator = RecipeValidator(strict=strict)
-    validator.validate_all(data)
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate recipe shards and index')
+    parser.add_argument('--strict', action='store_true', help='Fail on warnings too')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Validate shards in N processes (0 = one per CPU)')
+    parser.add_argument('--file', help='Validate a single {"recipes": [...]} JSON file instead')
+    args = parser.parse_args()
+
+    validator = RecipeValidator(strict=args.strict)
+
+    if args.file:
+        print(f"Validating: {args.file}")
+        data = load_json(args.file)
+        validator.validate_all(data)
+        total = len(data.get('recipes', []))
+        shard_count = None
+    else:
+        print(f"Validating: {INDEX_FILE} + shards")
+        index_data = load_json(INDEX_FILE)
+        if 'columnar' in index_data:
+            try:
+                index_data = decode_columnar_index(index_data)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"ERROR: Invalid columnar index - {e!r}")
+                sys.exit(1)
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        total = validator.validate_collection(index_data, jobs=jobs)
+        shard_count = len(index_data.get('shards', []))
+
     exit_code = validator.report()
 
-    print(f"\nTotal recipes: {len(data.get('recipes', []))}")
+    if shard_count is None:
+        print(f"\nTotal recipes: {total}")
+    else:
+        print(f"\nTotal recipes: {total} (in {shard_count} shards)")
     sys.exit(exit_code)
 
 